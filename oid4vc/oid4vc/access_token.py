@@ -0,0 +1,127 @@
+"""Symmetric access tokens for the OID4VCI token endpoint."""
+
+import hashlib
+import hmac
+import secrets
+import time
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from acapy_agent.core.profile import Profile
+from acapy_agent.wallet.jwt import b64_to_dict, dict_to_b64
+from acapy_agent.wallet.util import b64_to_bytes, bytes_to_b64
+
+from .config import Config
+from .jwt import JWTVerifyResult
+
+ACCESS_TOKEN_ALG = "HS256"
+
+# Seconds a generated key signs tokens before it is rotated
+ACCESS_TOKEN_KEY_LIFETIME = 86400
+
+
+class AccessTokenKeys:
+    """HMAC keys for access tokens, held in memory by the issuer server.
+
+    The newest key signs tokens; older keys still verify the tokens they signed
+    until they are rotated out. Configured keys are used as given; generated
+    keys are rotated once they have signed tokens for their lifetime.
+    """
+
+    def __init__(
+        self,
+        configured: Optional[List[bytes]] = None,
+        lifetime: float = ACCESS_TOKEN_KEY_LIFETIME,
+        max_keys: int = 2,
+    ):
+        """Initialize the access token keys."""
+        self.lifetime = lifetime
+        self.max_keys = max(max_keys, len(configured or ()))
+        self.configured = bool(configured)
+        # (kid, secret), newest first
+        self._keys: List[Tuple[str, bytes]] = [
+            (self.key_id(secret), secret) for secret in configured or ()
+        ]
+        self._rotated_at = time.monotonic()
+        if not self._keys:
+            self.rotate()
+
+    @staticmethod
+    def key_id(secret: bytes) -> str:
+        """Return the identifier of a key."""
+        return hashlib.sha256(secret).hexdigest()[:16]
+
+    def rotate(self, secret: Optional[bytes] = None) -> str:
+        """Sign new tokens with a new key and return its identifier."""
+        secret = secret or secrets.token_bytes(32)
+        kid = self.key_id(secret)
+        self._keys.insert(0, (kid, secret))
+        del self._keys[self.max_keys :]
+        self._rotated_at = time.monotonic()
+        return kid
+
+    def _tenant_key(self, profile: Profile, secret: bytes) -> bytes:
+        """Derive the key of a tenant, so tokens are bound to their wallet."""
+        wallet_id = profile.settings.get("wallet.id") or "base"
+        return hmac.new(secret, wallet_id.encode(), hashlib.sha256).digest()
+
+    def sign(self, profile: Profile, payload: Mapping[str, Any]) -> str:
+        """Mint an access token with the current key."""
+        if not self.configured and time.monotonic() - self._rotated_at >= self.lifetime:
+            self.rotate()
+
+        kid, secret = self._keys[0]
+        headers = {"typ": "JWT", "alg": ACCESS_TOKEN_ALG, "kid": kid}
+        signing_input = f"{dict_to_b64(headers)}.{dict_to_b64(payload)}"
+        sig = hmac.new(
+            self._tenant_key(profile, secret), signing_input.encode(), hashlib.sha256
+        ).digest()
+        return f"{signing_input}.{bytes_to_b64(sig, urlsafe=True, pad=False)}"
+
+    def verify(self, profile: Profile, token: str) -> JWTVerifyResult:
+        """Verify an access token minted with any of the held keys.
+
+        Malformed tokens are reported as not verified.
+        """
+        try:
+            encoded_headers, encoded_payload, encoded_signature = token.split(".")
+            headers = b64_to_dict(encoded_headers)
+            payload = b64_to_dict(encoded_payload)
+            signature = b64_to_bytes(encoded_signature, urlsafe=True)
+        except Exception:
+            return JWTVerifyResult({}, {}, False)
+        if not isinstance(headers, dict) or not isinstance(payload, dict):
+            return JWTVerifyResult({}, {}, False)
+
+        secret = dict(self._keys).get(headers.get("kid"))
+        verified = False
+        if headers.get("alg") == ACCESS_TOKEN_ALG and secret:
+            expected = hmac.new(
+                self._tenant_key(profile, secret),
+                f"{encoded_headers}.{encoded_payload}".encode(),
+                hashlib.sha256,
+            ).digest()
+            verified = hmac.compare_digest(expected, signature)
+
+        return JWTVerifyResult(headers, payload, verified)
+
+
+# configured keys -> access token keys
+ACCESS_TOKEN_KEYS: Dict[Optional[str], AccessTokenKeys] = {}
+
+
+def access_token_keys(config: Config) -> Optional[AccessTokenKeys]:
+    """Return the access token keys, when access tokens are HMAC signed."""
+
+    if config.access_token_mode != "hmac":
+        return None
+
+    keys = ACCESS_TOKEN_KEYS.get(config.access_token_keys)
+    if keys is None:
+        configured = [
+            b64_to_bytes(secret.strip(), urlsafe=True)
+            for secret in (config.access_token_keys or "").split(",")
+            if secret.strip()
+        ]
+        keys = AccessTokenKeys(configured)
+        ACCESS_TOKEN_KEYS[config.access_token_keys] = keys
+    return keys
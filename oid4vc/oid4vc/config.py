@@ -2,6 +2,7 @@
 
 from dataclasses import dataclass
 from os import getenv
+from typing import Optional
 
 from acapy_agent.config.base import BaseSettings
 from acapy_agent.config.settings import Settings
@@ -26,6 +27,8 @@ class Config:
     port: int
     endpoint: str
     status_handler: str
+    access_token_mode: str = "jwt"
+    access_token_keys: Optional[str] = None
 
     @classmethod
     def from_settings(cls, settings: BaseSettings) -> "Config":
@@ -38,6 +41,14 @@ class Config:
         status_handler = plugin_settings.get("status_handler") or getenv(
             "OID4VCI_STATUS_HANDLER"
         )
+        access_token_mode = (
+            plugin_settings.get("access_token_mode")
+            or getenv("OID4VCI_ACCESS_TOKEN_MODE")
+            or "jwt"
+        )
+        access_token_keys = plugin_settings.get("access_token_keys") or getenv(
+            "OID4VCI_ACCESS_TOKEN_KEYS"
+        )
 
         if not host:
             raise ConfigError("host", "OID4VCI_HOST")
@@ -45,5 +56,14 @@ class Config:
             raise ConfigError("port", "OID4VCI_PORT")
         if not endpoint:
             raise ConfigError("endpoint", "OID4VCI_ENDPOINT")
+        if access_token_mode not in ("jwt", "hmac"):
+            raise ConfigError("access_token_mode", "OID4VCI_ACCESS_TOKEN_MODE")
 
-        return cls(host, port, endpoint, status_handler)
+        return cls(
+            host,
+            port,
+            endpoint,
+            status_handler,
+            access_token_mode,
+            access_token_keys,
+        )
@@ -0,0 +1,52 @@
+"""Cache of compiled presentation evaluators."""
+
+from collections import OrderedDict
+from typing import Generic, Optional, Tuple, TypeVar
+
+from .dcql import DCQLQueryEvaluator
+from .pex import PresentationExchangeEvaluator
+
+Evaluator = TypeVar("Evaluator")
+
+
+class EvaluatorCache(Generic[Evaluator]):
+    """LRU cache of compiled evaluators, keyed by record id and record version.
+
+    Compiling parses every JSONPath and checks every JSON Schema filter of a
+    definition; reusing the compiled evaluator skips that on each response.
+    """
+
+    def __init__(self, max_size: int = 256):
+        """Initialize the cache."""
+        self.max_size = max_size
+        self._entries: OrderedDict[str, Tuple[Optional[str], Evaluator]] = OrderedDict()
+
+    def get(self, record_id: str, version: Optional[str]) -> Optional[Evaluator]:
+        """Return the evaluator compiled for a record version."""
+        entry = self._entries.get(record_id)
+        if entry is None or entry[0] != version:
+            return None
+        self._entries.move_to_end(record_id)
+        return entry[1]
+
+    def put(
+        self, record_id: str, version: Optional[str], evaluator: Evaluator
+    ) -> Evaluator:
+        """Store the evaluator compiled for a record version."""
+        self._entries[record_id] = (version, evaluator)
+        self._entries.move_to_end(record_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return evaluator
+
+    def invalidate(self, record_id: str):
+        """Drop the evaluator of a record."""
+        self._entries.pop(record_id, None)
+
+    def clear(self):
+        """Drop all evaluators."""
+        self._entries.clear()
+
+
+PRES_DEF_EVALUATORS: EvaluatorCache[PresentationExchangeEvaluator] = EvaluatorCache()
+DCQL_EVALUATORS: EvaluatorCache[DCQLQueryEvaluator] = EvaluatorCache()
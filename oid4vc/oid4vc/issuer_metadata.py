@@ -0,0 +1,75 @@
+"""Cache of rendered credential issuer metadata."""
+
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from acapy_agent.core.profile import Profile
+
+# Seconds rendered metadata is reused; bounds staleness across agent instances
+ISSUER_METADATA_TTL = 300
+
+
+@dataclass
+class CachedIssuerMetadata:
+    """Rendered credential issuer metadata with its HTTP caching metadata."""
+
+    body: bytes
+    etag: str
+    expires_at: float
+
+
+class IssuerMetadataCache:
+    """Rendered credential issuer metadata documents, per tenant."""
+
+    def __init__(self, ttl: float = ISSUER_METADATA_TTL):
+        """Initialize the cache."""
+        self.ttl = ttl
+        self._entries: Dict[str, CachedIssuerMetadata] = {}
+        # bumped on invalidation so that renders started before it are not cached
+        self._generations: Dict[str, int] = {}
+
+    @staticmethod
+    def key(profile: Profile) -> str:
+        """Return the tenant key of a profile."""
+        return profile.settings.get("wallet.id") or "base"
+
+    def get(self, profile: Profile) -> Optional[CachedIssuerMetadata]:
+        """Return the cached metadata of a tenant, if still fresh."""
+        entry = self._entries.get(self.key(profile))
+        if entry and entry.expires_at > time.monotonic():
+            return entry
+        return None
+
+    def generation(self, profile: Profile) -> int:
+        """Return the current generation of a tenant's metadata."""
+        return self._generations.get(self.key(profile), 0)
+
+    def put(
+        self, profile: Profile, metadata: dict, generation: int
+    ) -> CachedIssuerMetadata:
+        """Render metadata, caching it unless invalidated since generation."""
+        body = json.dumps(metadata).encode()
+        entry = CachedIssuerMetadata(
+            body=body,
+            etag=hashlib.sha256(body).hexdigest()[:32],
+            expires_at=time.monotonic() + self.ttl,
+        )
+        if generation == self.generation(profile):
+            self._entries[self.key(profile)] = entry
+        return entry
+
+    def invalidate(self, profile: Profile):
+        """Drop the cached metadata of a tenant."""
+        key = self.key(profile)
+        self._entries.pop(key, None)
+        self._generations[key] = self._generations.get(key, 0) + 1
+
+    def clear(self):
+        """Drop all cached metadata."""
+        self._entries.clear()
+
+
+ISSUER_METADATA_CACHE = IssuerMetadataCache()
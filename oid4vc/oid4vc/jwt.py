@@ -1,7 +1,9 @@
 """JWT Methods."""
 
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Any, Dict, Mapping, Optional
+from typing import Any, Dict, Mapping, Optional, Tuple, Union
 
 from acapy_agent.core.profile import Profile
 from acapy_agent.resolver.did_resolver import DIDResolver, DIDUrl
@@ -37,10 +39,103 @@ class JWTVerifyResult:
         self.verified = verified
 
 
-async def key_material_for_kid(profile: Profile, kid: str):
-    """Resolve key material for a kid."""
-    DIDUrl(kid)
+# Seconds resolved key material is reused, and a failed resolution remembered
+KEY_MATERIAL_TTL = 300
+KEY_MATERIAL_NEGATIVE_TTL = 30
+
+# Multicodec prefixes of the did:key public key types
+DID_KEY_CODECS = {
+    b"\xed\x01": KeyAlg.ED25519,
+    b"\x80\x24": KeyAlg.P256,
+    b"\xe7\x01": KeyAlg.K256,
+}
+
+
+@dataclass(frozen=True)
+class KeyResolutionFailure:
+    """A failed key resolution, remembered without the exception instance."""
+
+    error_type: type
+    args: tuple
+
+    @classmethod
+    def from_error(cls, err: Exception) -> "KeyResolutionFailure":
+        """Remember the type and arguments of a resolution error."""
+        return cls(type(err), err.args)
+
+    def error(self) -> Exception:
+        """Return a new exception for the failed resolution."""
+        try:
+            return self.error_type(*self.args)
+        except Exception:
+            return BadJWSHeaderError(*self.args)
+
+
+class KeyMaterialCache:
+    """Bounded cache of key material by kid, including failed resolutions."""
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl: float = KEY_MATERIAL_TTL,
+        negative_ttl: float = KEY_MATERIAL_NEGATIVE_TTL,
+    ):
+        """Initialize the cache."""
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        # kid -> (expires at, key or resolution failure)
+        self._entries: OrderedDict[
+            str, Tuple[float, Union[Key, KeyResolutionFailure]]
+        ] = OrderedDict()
+
+    def get(self, kid: str) -> Optional[Union[Key, KeyResolutionFailure]]:
+        """Return the cached key or resolution failure of a kid."""
+        entry = self._entries.get(kid)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[kid]
+            return None
+        self._entries.move_to_end(kid)
+        return entry[1]
+
+    def put(self, kid: str, value: Union[Key, KeyResolutionFailure]):
+        """Cache the key, or the resolution failure, of a kid."""
+        ttl = self.negative_ttl if isinstance(value, KeyResolutionFailure) else self.ttl
+        self._entries[kid] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(kid)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
 
+    def clear(self):
+        """Drop all cached key material."""
+        self._entries.clear()
+
+
+KEY_MATERIAL_CACHE = KeyMaterialCache()
+
+
+def key_material_from_did(kid: str) -> Optional[Key]:
+    """Decode the key of a did:jwk or did:key kid, without resolving the DID."""
+    did, _, fragment = kid.partition("#")
+    if did.startswith("did:jwk:") and fragment in ("", "0"):
+        return Key.from_jwk(b64_to_dict(did[len("did:jwk:") :]))
+
+    if did.startswith("did:key:z"):
+        multibase = did[len("did:key:") :]
+        if fragment not in ("", multibase):
+            return None
+        key_bytes = b58_to_bytes(multibase[1:])
+        alg = DID_KEY_CODECS.get(key_bytes[:2])
+        if alg:
+            return Key.from_public_bytes(alg, key_bytes[2:])
+
+    return None
+
+
+async def resolve_key_material(profile: Profile, kid: str) -> Key:
+    """Dereference the verification method of a kid and return its key."""
     resolver = profile.inject(DIDResolver)
     vm = await resolver.dereference_verification_method(profile, kid)
     if vm.type == "JsonWebKey2020" and vm.public_key_jwk:
@@ -60,6 +155,33 @@ async def key_material_for_kid(profile: Profile, kid: str):
     raise ValueError("Unsupported verification method type")
 
 
+async def key_material_for_kid(profile: Profile, kid: str):
+    """Resolve key material for a kid.
+
+    did:jwk and did:key kids are decoded directly; other kids are resolved
+    once and cached, as are resolution failures for a shorter time.
+    """
+    DIDUrl(kid)
+
+    key = key_material_from_did(kid)
+    if key:
+        return key
+
+    cached = KEY_MATERIAL_CACHE.get(kid)
+    if isinstance(cached, KeyResolutionFailure):
+        raise cached.error()
+    if cached:
+        return cached
+
+    try:
+        key = await resolve_key_material(profile, kid)
+    except Exception as err:
+        KEY_MATERIAL_CACHE.put(kid, KeyResolutionFailure.from_error(err))
+        raise
+    KEY_MATERIAL_CACHE.put(kid, key)
+    return key
+
+
 async def jwt_sign(
     profile: Profile,
     headers: Dict[str, Any],
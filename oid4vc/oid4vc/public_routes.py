@@ -1,5 +1,6 @@
 """Public routes for OID4VC."""
 
+import asyncio
 import datetime
 import json
 import logging
@@ -7,7 +8,7 @@ import time
 import uuid
 from secrets import token_urlsafe
 from urllib.parse import quote
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from acapy_agent.config.injection_context import InjectionContext
 from acapy_agent.admin.request_context import AdminRequestContext
@@ -51,18 +52,23 @@ from oid4vc.pex import (
     PresentationSubmission,
 )
 
+from .access_token import ACCESS_TOKEN_ALG, access_token_keys
 from .config import Config
 from .cred_processor import CredProcessorError, CredProcessors
+from .evaluator_cache import DCQL_EVALUATORS, PRES_DEF_EVALUATORS
+from .issuer_metadata import ISSUER_METADATA_CACHE
 from .models.exchange import OID4VCIExchangeRecord
 from .models.supported_cred import SupportedCredential
 from .pop_result import PopResult
 from .routes import _parse_cred_offer, CredOfferQuerySchema, CredOfferResponseSchemaVal
-from .status_handler import StatusHandler
+from .status_handler import STATUS_BINDING, StatusBinding, StatusHandler
 
 LOGGER = logging.getLogger(__name__)
 PRE_AUTHORIZED_CODE_GRANT_TYPE = "urn:ietf:params:oauth:grant-type:pre-authorized_code"
 NONCE_BYTES = 16
 EXPIRES_IN = 86400
+MAX_BATCH_SIZE = 32
+BATCH_ISSUE_CONCURRENCY = 4
 
 
 @docs(tags=["oid4vci"], summary="Dereference a credential offer.")
@@ -107,7 +113,7 @@ class CredentialIssuerMetadataSchema(OpenAPISchema):
     )
     batch_credential_endpoint = fields.Str(
         required=False,
-        metadata={"description": "The batch credential endpoint. Currently ignored."},
+        metadata={"description": "The batch credential endpoint."},
     )
 
 
@@ -116,26 +122,40 @@ class CredentialIssuerMetadataSchema(OpenAPISchema):
 async def credential_issuer_metadata(request: web.Request):
     """Credential issuer metadata endpoint."""
     context: AdminRequestContext = request["context"]
-    config = Config.from_settings(context.settings)
-    public_url = config.endpoint
 
-    async with context.session() as session:
-        # TODO If there's a lot, this will be a problem
-        credentials_supported = await SupportedCredential.query(session)
+    cached = ISSUER_METADATA_CACHE.get(context.profile)
+    if cached is None:
+        config = Config.from_settings(context.settings)
+        public_url = config.endpoint
+        generation = ISSUER_METADATA_CACHE.generation(context.profile)
+
+        async with context.session() as session:
+            credentials_supported = await SupportedCredential.query(session)
 
         wallet_id = request.match_info.get("wallet_id")
         subpath = f"/tenant/{wallet_id}" if wallet_id else ""
         metadata = {
             "credential_issuer": f"{public_url}{subpath}",
             "credential_endpoint": f"{public_url}{subpath}/credential",
+            "batch_credential_endpoint": f"{public_url}{subpath}/batch_credential",
             "credentials_supported": [
                 supported.to_issuer_metadata() for supported in credentials_supported
             ],
         }
+        LOGGER.debug("METADATA: %s", metadata)
 
-    LOGGER.debug("METADATA: %s", metadata)
+        cached = ISSUER_METADATA_CACHE.put(context.profile, metadata, generation)
 
-    return web.json_response(metadata)
+    headers = {"Cache-Control": "no-cache"}
+    if_none_match = request.if_none_match or ()
+    if any(etag.value in (cached.etag, "*") for etag in if_none_match):
+        response = web.Response(status=304, headers=headers)
+    else:
+        response = web.Response(
+            body=cached.body, content_type="application/json", headers=headers
+        )
+    response.etag = cached.etag
+    return response
 
 
 class GetTokenSchema(OpenAPISchema):
@@ -184,16 +204,20 @@ async def token(request: web.Request):
         "id": record.exchange_id,
         "exp": int(time.time()) + EXPIRES_IN,
     }
+    keys = access_token_keys(Config.from_settings(context.settings))
     async with context.profile.session() as session:
-        try:
-            token = await jwt_sign(
-                context.profile,
-                headers={},
-                payload=payload,
-                verification_method=record.verification_method,
-            )
-        except (WalletNotFoundError, WalletError, ValueError) as err:
-            raise web.HTTPBadRequest(reason="Bad did or verification method") from err
+        if keys:
+            token = keys.sign(context.profile, payload)
+        else:
+            try:
+                token = await jwt_sign(
+                    context.profile,
+                    headers={},
+                    payload=payload,
+                    verification_method=record.verification_method,
+                )
+            except (WalletNotFoundError, WalletError, ValueError) as err:
+                raise web.HTTPBadRequest(reason="Bad did or verification method") from err
 
         record.token = token
         record.nonce = token_urlsafe(NONCE_BYTES)
@@ -227,7 +251,16 @@ async def check_token(
     if scheme.lower() != "bearer":
         raise web.HTTPUnauthorized()  # Invalid authentication credentials
 
-    result = await jwt_verify(profile, cred)
+    keys = access_token_keys(Config.from_settings(profile.settings))
+    if keys:
+        try:
+            alg = b64_to_dict(cred.split(".", 1)[0]).get("alg")
+        except Exception as err:
+            raise web.HTTPUnauthorized() from err  # Malformed token
+    if keys and alg == ACCESS_TOKEN_ALG:
+        result = keys.verify(profile, cred)
+    else:
+        result = await jwt_verify(profile, cred)
     if not result.verified:
         raise web.HTTPUnauthorized()  # Invalid credentials
 
@@ -302,20 +335,10 @@ class IssueCredentialRequestSchema(OpenAPISchema):
     proof = fields.Dict(metadata={"description": ""})
 
 
-@docs(tags=["oid4vc"], summary="Issue a credential")
-@request_schema(IssueCredentialRequestSchema())
-async def issue_cred(request: web.Request):
-    """The Credential Endpoint issues a Credential.
-
-    As validated upon presentation of a valid Access Token.
-    """
-    context: AdminRequestContext = request["context"]
-    token_result = await check_token(
-        context.profile, request.headers.get("Authorization")
-    )
-    exchange_id = token_result.payload["id"]
-    body = await request.json()
-    LOGGER.info(f"request: {body}")
+async def load_exchange(
+    context: AdminRequestContext, exchange_id: str
+) -> Tuple[OID4VCIExchangeRecord, SupportedCredential]:
+    """Load the exchange of an access token and its supported credential."""
     try:
         async with context.profile.session() as session:
             ex_record = await OID4VCIExchangeRecord.retrieve_by_id(session, exchange_id)
@@ -325,9 +348,6 @@ async def issue_cred(request: web.Request):
     except (StorageError, BaseModelError, StorageNotFoundError) as err:
         raise web.HTTPBadRequest(reason=err.roll_up) from err
 
-    if supported.format != body.get("format"):
-        raise web.HTTPBadRequest(reason="Requested format does not match offer.")
-
     if not supported.format:
         raise web.HTTPBadRequest(reason="SupportedCredential missing format identifier")
 
@@ -340,9 +360,48 @@ async def issue_cred(request: web.Request):
         LOGGER.error(f"No format_data for supported credential {supported.format}.")
         raise web.HTTPInternalServerError()
 
+    return ex_record, supported
+
+
+def check_credential_request(supported: SupportedCredential, body: Dict[str, Any]):
+    """Check a credential request against the offered credential."""
+    if supported.format != body.get("format"):
+        raise web.HTTPBadRequest(reason="Requested format does not match offer.")
+
     if "proof" not in body:
         raise web.HTTPBadRequest(reason=f"proof is required for {supported.format}")
 
+
+async def mark_exchange_issued(
+    context: AdminRequestContext, ex_record: OID4VCIExchangeRecord
+):
+    """Mark the exchange as issued."""
+    async with context.session() as session:
+        ex_record.state = OID4VCIExchangeRecord.STATE_ISSUED
+        # Cause webhook to be emitted
+        await ex_record.save(session, reason="Credential issued")
+        # Exchange is completed, record can be cleaned up
+        # But we'll leave it to the controller
+        # await ex_record.delete_record(session)
+
+
+@docs(tags=["oid4vc"], summary="Issue a credential")
+@request_schema(IssueCredentialRequestSchema())
+async def issue_cred(request: web.Request):
+    """The Credential Endpoint issues a Credential.
+
+    As validated upon presentation of a valid Access Token.
+    """
+    context: AdminRequestContext = request["context"]
+    token_result = await check_token(
+        context.profile, request.headers.get("Authorization")
+    )
+    exchange_id = token_result.payload["id"]
+    body = await request.json()
+    LOGGER.info(f"request: {body}")
+    ex_record, supported = await load_exchange(context, exchange_id)
+    check_credential_request(supported, body)
+
     pop = await handle_proof_of_posession(context.profile, body["proof"], ex_record.nonce)
     if not pop.verified:
         raise web.HTTPBadRequest(reason="Invalid proof")
@@ -355,13 +414,7 @@ async def issue_cred(request: web.Request):
     except CredProcessorError as e:
         raise web.HTTPBadRequest(reason=e.message)
 
-    async with context.session() as session:
-        ex_record.state = OID4VCIExchangeRecord.STATE_ISSUED
-        # Cause webhook to be emitted
-        await ex_record.save(session, reason="Credential issued")
-        # Exchange is completed, record can be cleaned up
-        # But we'll leave it to the controller
-        # await ex_record.delete_record(session)
+    await mark_exchange_issued(context, ex_record)
 
     return web.json_response(
         {
@@ -371,6 +424,107 @@ async def issue_cred(request: web.Request):
     )
 
 
+class BatchCredentialRequestSchema(OpenAPISchema):
+    """Request schema for the /batch_credential endpoint."""
+
+    credential_requests = fields.List(
+        fields.Nested(IssueCredentialRequestSchema()),
+        required=True,
+        metadata={"description": "Credential requests, as sent to /credential"},
+    )
+
+
+@docs(tags=["oid4vc"], summary="Issue a batch of credentials")
+@request_schema(BatchCredentialRequestSchema())
+async def issue_batch_cred(request: web.Request):
+    """The Batch Credential Endpoint issues several Credentials at once.
+
+    The access token is checked and the exchange loaded once for all requests;
+    credentials are issued concurrently, at most BATCH_ISSUE_CONCURRENCY at a time.
+    The status entries of each credential are bound to "{exchange_id}:{index}",
+    so an exchange can be issued by batch only once.
+    """
+    context: AdminRequestContext = request["context"]
+    token_result = await check_token(
+        context.profile, request.headers.get("Authorization")
+    )
+    exchange_id = token_result.payload["id"]
+    body = await request.json()
+    LOGGER.info(f"request: {body}")
+
+    cred_requests = body.get("credential_requests")
+    if not cred_requests or not isinstance(cred_requests, list):
+        raise web.HTTPBadRequest(reason="credential_requests is required")
+    if len(cred_requests) > MAX_BATCH_SIZE:
+        raise web.HTTPBadRequest(
+            reason=f"At most {MAX_BATCH_SIZE} credentials can be requested at once"
+        )
+
+    ex_record, supported = await load_exchange(context, exchange_id)
+    if ex_record.state == OID4VCIExchangeRecord.STATE_ISSUED:
+        raise web.HTTPBadRequest(reason="Credentials were already issued")
+    for cred_request in cred_requests:
+        check_credential_request(supported, cred_request)
+
+    pops = await asyncio.gather(
+        *(
+            handle_proof_of_posession(
+                context.profile, cred_request["proof"], ex_record.nonce
+            )
+            for cred_request in cred_requests
+        )
+    )
+    if not all(pop.verified for pop in pops):
+        raise web.HTTPBadRequest(reason="Invalid proof")
+
+    processors = context.inject(CredProcessors)
+    try:
+        processor = processors.issuer_for_format(supported.format)
+    except CredProcessorError as e:
+        raise web.HTTPBadRequest(reason=e.message)
+
+    semaphore = asyncio.Semaphore(BATCH_ISSUE_CONCURRENCY)
+    bindings = [
+        StatusBinding(f"{ex_record.exchange_id}:{index}")
+        for index in range(len(cred_requests))
+    ]
+
+    async def issue(cred_request: Dict[str, Any], pop: PopResult, binding: StatusBinding):
+        # each gathered coroutine runs in its own task and context
+        STATUS_BINDING.set(binding)
+        async with semaphore:
+            return await processor.issue(cred_request, supported, ex_record, pop, context)
+
+    try:
+        credentials = await asyncio.gather(
+            *(
+                issue(cred_request, pop, binding)
+                for cred_request, pop, binding in zip(cred_requests, pops, bindings)
+            )
+        )
+    except CredProcessorError as e:
+        raise web.HTTPBadRequest(reason=e.message)
+
+    await mark_exchange_issued(context, ex_record)
+
+    return web.json_response(
+        {
+            "credential_responses": [
+                {
+                    "format": supported.format,
+                    "credential": credential,
+                    **(
+                        {"status_credential_id": binding.credential_id}
+                        if binding.assigned
+                        else {}
+                    ),
+                }
+                for credential, binding in zip(credentials, bindings)
+            ],
+        }
+    )
+
+
 class OID4VPRequestIDMatchSchema(OpenAPISchema):
     """Path parameters and validators for request taking request id."""
 
@@ -582,9 +736,14 @@ async def verify_dcql_presentation(
             dcql_query_id,
         )
 
+    evaluator = DCQL_EVALUATORS.get(dcql_query_id, pres_def_entry.updated_at)
+    if evaluator is None:
         dcql_query = DCQLQuery.deserialize(pres_def_entry)
-
-    evaluator = DCQLQueryEvaluator.compile(dcql_query)
+        evaluator = DCQL_EVALUATORS.put(
+            dcql_query_id,
+            pres_def_entry.updated_at,
+            DCQLQueryEvaluator.compile(dcql_query),
+        )
     result = await evaluator.verify(profile, vp_token, presentation)
     return result
 
@@ -625,9 +784,14 @@ async def verify_pres_def_presentation(
             pres_def_id,
         )
 
+    evaluator = PRES_DEF_EVALUATORS.get(pres_def_id, pres_def_entry.updated_at)
+    if evaluator is None:
         pres_def = PresentationDefinition.deserialize(pres_def_entry.pres_def)
-
-    evaluator = PresentationExchangeEvaluator.compile(pres_def)
+        evaluator = PRES_DEF_EVALUATORS.put(
+            pres_def_id,
+            pres_def_entry.updated_at,
+            PresentationExchangeEvaluator.compile(pres_def),
+        )
     result = await evaluator.verify(profile, submission, vp_result.payload)
     return result
 
@@ -727,6 +891,28 @@ async def get_status_list(request: web.Request):
 
     status_handler = context.inject_or(StatusHandler)
     if status_handler:
+        # serve the published file without touching the wallet
+        path = await status_handler.get_status_list_file(context, list_number)
+        if path:
+            return web.FileResponse(
+                path,
+                headers={
+                    "Cache-Control": "public, no-cache",
+                    "Content-Type": "text/plain; charset=utf-8",
+                },
+            )
+
+        cached = await status_handler.get_cached_status_list(context, list_number)
+        if cached:
+            headers = {"Cache-Control": f"public, max-age={cached.max_age}"}
+            if_none_match = request.if_none_match or ()
+            if any(etag.value in (cached.etag, "*") for etag in if_none_match):
+                response = web.Response(status=304, headers=headers)
+            else:
+                response = web.Response(text=cached.token, headers=headers)
+            response.etag = cached.etag
+            return response
+
         status_list = await status_handler.get_status_list(context, list_number)
         return web.Response(text=status_list)
 
@@ -752,6 +938,7 @@ async def register(app: web.Application, multitenant: bool, context: InjectionCo
         # Spec: https://identity.foundation/.well-known/resources/did-configuration/
         web.post(f"{subpath}/token", token),
         web.post(f"{subpath}/credential", issue_cred),
+        web.post(f"{subpath}/batch_credential", issue_batch_cred),
         web.get(f"{subpath}/oid4vp/request/{{request_id}}", get_request),
         web.post(f"{subpath}/oid4vp/response/{{presentation_id}}", post_response),
     ]
@@ -52,6 +52,8 @@ from oid4vc.models.presentation_definition import OID4VPPresDef, OID4VPPresDefSc
 from oid4vc.models.request import OID4VPRequest, OID4VPRequestSchema
 
 from .config import Config
+from .evaluator_cache import DCQL_EVALUATORS, PRES_DEF_EVALUATORS
+from .issuer_metadata import ISSUER_METADATA_CACHE
 from .models.exchange import OID4VCIExchangeRecord, OID4VCIExchangeRecordSchema
 from .models.supported_cred import SupportedCredential, SupportedCredentialSchema
 
@@ -594,6 +596,7 @@ async def supported_credential_create(request: web.Request):
 
     async with profile.session() as session:
         await record.save(session, reason="Save credential supported record.")
+    ISSUER_METADATA_CACHE.invalidate(profile)
 
     return web.json_response(record.serialize())
 
@@ -727,6 +730,7 @@ async def supported_credential_create_jwt(request: web.Request):
 
     async with profile.session() as session:
         await record.save(session, reason="Save credential supported record.")
+    ISSUER_METADATA_CACHE.invalidate(profile)
 
     return web.json_response(record.serialize())
 
@@ -907,6 +911,7 @@ async def update_supported_credential_jwt_vc(request: web.Request):
         raise web.HTTPNotFound(reason=err.roll_up) from err
     except (StorageError, BaseModelError) as err:
         raise web.HTTPBadRequest(reason=err.roll_up) from err
+    ISSUER_METADATA_CACHE.invalidate(context.profile)
 
     registered_processors = context.inject(CredProcessors)
     if record.format not in registered_processors.issuers:
@@ -945,6 +950,7 @@ async def supported_credential_remove(request: web.Request):
         raise web.HTTPNotFound(reason=err.roll_up) from err
     except (StorageError, BaseModelError) as err:
         raise web.HTTPBadRequest(reason=err.roll_up) from err
+    ISSUER_METADATA_CACHE.invalidate(context.profile)
 
     return web.json_response(record.serialize())
 
@@ -1291,6 +1297,7 @@ async def dcql_query_remove(request: web.Request):
         raise web.HTTPNotFound(reason=err.roll_up) from err
     except (StorageError, BaseModelError) as err:
         raise web.HTTPBadRequest(reason=err.roll_up) from err
+    DCQL_EVALUATORS.invalidate(dcql_query_id)
 
     return web.json_response(record.serialize())
 
@@ -1410,6 +1417,7 @@ async def update_oid4vp_pres_def(request: web.Request):
         raise web.HTTPNotFound(reason=err.roll_up) from err
     except (StorageError, BaseModelError) as err:
         raise web.HTTPBadRequest(reason=err.roll_up) from err
+    PRES_DEF_EVALUATORS.invalidate(pres_def_id)
 
     return web.json_response(
         {
@@ -1603,6 +1611,7 @@ async def oid4vp_pres_def_remove(request: web.Request):
         raise web.HTTPNotFound(reason=err.roll_up) from err
     except (StorageError, BaseModelError) as err:
         raise web.HTTPBadRequest(reason=err.roll_up) from err
+    PRES_DEF_EVALUATORS.invalidate(pres_def_id)
 
     return web.json_response(record.serialize())
 
@@ -1,6 +1,9 @@
 """Status handler module."""
 
 import logging
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
 
 from acapy_agent.core.plugin_registry import PluginRegistry
 from acapy_agent.admin.request_context import AdminRequestContext
@@ -9,6 +12,21 @@ from .config import Config
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class StatusBinding:
+    """Identifier the status entries of one credential of a batch are bound to."""
+
+    credential_id: str
+    assigned: bool = False
+
+
+# Set while issuing one credential of a batch; every other credential is bound
+# by the id of its exchange
+STATUS_BINDING: ContextVar[Optional[StatusBinding]] = ContextVar(
+    "status_binding", default=None
+)
+
+
 class StatusHandler:
     """Status handler class."""
 
@@ -50,12 +68,30 @@ class StatusHandler:
         """Assign status entries."""
 
         if self.handler:
-            return await self.handler.assign_status_entries(
-                context, supported_cred_id, exchange_id
+            binding = STATUS_BINDING.get()
+            status = await self.handler.assign_status_entries(
+                context,
+                supported_cred_id,
+                binding.credential_id if binding else exchange_id,
             )
+            if binding and status:
+                binding.assigned = True
+            return status
 
     async def get_status_list(self, context, list_number):
         """Get status list."""
 
         if self.handler:
             return await self.handler.get_status_list_token(context, list_number)
+
+    async def get_cached_status_list(self, context, list_number):
+        """Get status list token with its HTTP caching metadata, if supported."""
+
+        if self.handler and hasattr(self.handler, "get_cached_status_list_token"):
+            return await self.handler.get_cached_status_list_token(context, list_number)
+
+    async def get_status_list_file(self, context, list_number):
+        """Get the path of the published status list file, if it is served."""
+
+        if self.handler and hasattr(self.handler, "get_status_list_file_path"):
+            return self.handler.get_status_list_file_path(context, list_number)
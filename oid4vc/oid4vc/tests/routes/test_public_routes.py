@@ -1,11 +1,15 @@
-from unittest.mock import patch
+import json
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from acapy_agent.admin.request_context import AdminRequestContext
 from acapy_agent.core.profile import Profile
 from aiohttp import web
+from aiohttp.helpers import ETag
 
 from oid4vc import public_routes as test_module
+from oid4vc.access_token import AccessTokenKeys
 
 
 @pytest.mark.asyncio
@@ -22,21 +26,43 @@ async def test_issuer_metadata(context: AdminRequestContext, req: web.Request):
     async with context.session() as session:
         await supported.save(session)
 
+    test_module.ISSUER_METADATA_CACHE.clear()
     with patch.object(test_module, "web", autospec=True) as mock_web:
         await test_module.credential_issuer_metadata(req)
-        mock_web.json_response.assert_called_once_with(
-            {
-                "credential_issuer": f"http://localhost:8020/tenant/{req.match_info.get()}",
-                "credential_endpoint": f"http://localhost:8020/tenant/{req.match_info.get()}/credential",
-                "credentials_supported": [
-                    {
-                        "format": "jwt_vc_json",
-                        "id": "MyCredential",
-                        "credentialSubject": {"name": "alice"},
-                    }
-                ],
-            }
-        )
+        body = mock_web.Response.call_args.kwargs["body"]
+        assert json.loads(body) == {
+            "credential_issuer": f"http://localhost:8020/tenant/{req.match_info.get()}",
+            "credential_endpoint": f"http://localhost:8020/tenant/{req.match_info.get()}/credential",
+            "batch_credential_endpoint": f"http://localhost:8020/tenant/{req.match_info.get()}/batch_credential",
+            "credentials_supported": [
+                {
+                    "format": "jwt_vc_json",
+                    "id": "MyCredential",
+                    "credentialSubject": {"name": "alice"},
+                }
+            ],
+        }
+
+
+@pytest.mark.asyncio
+async def test_issuer_metadata_cached(context: AdminRequestContext, req: web.Request):
+    """Test issuer metadata is rendered once until invalidated."""
+    test_module.ISSUER_METADATA_CACHE.clear()
+    with patch.object(
+        test_module.SupportedCredential, "query", AsyncMock(return_value=[])
+    ) as mock_query:
+        first = await test_module.credential_issuer_metadata(req)
+        req.if_none_match = (ETag(first.etag),)
+        second = await test_module.credential_issuer_metadata(req)
+        assert second.status == 304
+        assert mock_query.await_count == 1
+
+        test_module.ISSUER_METADATA_CACHE.invalidate(context.profile)
+        req.if_none_match = ()
+        third = await test_module.credential_issuer_metadata(req)
+        assert third.status == 200
+        assert third.body == first.body
+        assert mock_query.await_count == 2
 
 
 @pytest.mark.asyncio
@@ -44,6 +70,170 @@ async def test_get_token(context: AdminRequestContext, req: web.Request):
     """Test token issuance endpoint."""
 
 
+@pytest.mark.asyncio
+async def test_get_token_hmac(
+    context: AdminRequestContext, req: web.Request, monkeypatch
+):
+    """Test access tokens issued by the token endpoint in HMAC mode."""
+    keys = AccessTokenKeys()
+    monkeypatch.setattr(test_module, "access_token_keys", lambda _: keys)
+
+    record = test_module.OID4VCIExchangeRecord(
+        state=test_module.OID4VCIExchangeRecord.STATE_OFFER_CREATED,
+        verification_method="did:example:123#key-1",
+        issuer_id="did:example:123",
+        supported_cred_id="456",
+        credential_subject={"name": "alice"},
+        code="pre-authorized-code",
+    )
+    async with context.session() as session:
+        await record.save(session)
+
+    req.post = AsyncMock(
+        return_value={
+            "grant_type": test_module.PRE_AUTHORIZED_CODE_GRANT_TYPE,
+            "pre-authorized_code": "pre-authorized-code",
+        }
+    )
+    req.query = {}
+    response = await test_module.token(req)
+    body = json.loads(response.body)
+    assert body["token_type"] == "Bearer"
+
+    result = await test_module.check_token(
+        context.profile, f"Bearer {body['access_token']}"
+    )
+    assert result.headers["alg"] == test_module.ACCESS_TOKEN_ALG
+    assert result.payload["id"] == record.exchange_id
+
+
+@pytest.mark.asyncio
+async def test_check_token_hmac(profile: Profile, monkeypatch):
+    """Test access tokens minted with an HMAC key."""
+    keys = AccessTokenKeys()
+    monkeypatch.setattr(test_module, "access_token_keys", lambda _: keys)
+
+    token = keys.sign(profile, {"id": "exchange_id", "exp": int(time.time()) + 60})
+    result = await test_module.check_token(profile, f"Bearer {token}")
+    assert result.payload["id"] == "exchange_id"
+
+    expired = keys.sign(profile, {"id": "exchange_id", "exp": int(time.time()) - 60})
+    with pytest.raises(web.HTTPUnauthorized):
+        await test_module.check_token(profile, f"Bearer {expired}")
+
+    # malformed tokens are unauthorized
+    for malformed in ("abc", "a.b", "a.b.c.d", f"{token}.extra"):
+        with pytest.raises(web.HTTPUnauthorized):
+            await test_module.check_token(profile, f"Bearer {malformed}")
+
+    # rotated out keys no longer verify
+    keys.rotate()
+    keys.rotate()
+    with pytest.raises(web.HTTPUnauthorized):
+        await test_module.check_token(profile, f"Bearer {token}")
+
+
+@pytest.mark.asyncio
+async def test_issue_batch_cred(context: AdminRequestContext, req: web.Request):
+    """Test batch credential endpoint."""
+    ex_record = MagicMock(
+        exchange_id="exchange_id", nonce="nonce", state="offer", save=AsyncMock()
+    )
+    supported = MagicMock(format="jwt_vc_json", format_data={})
+    status_handler = test_module.StatusHandler(context)
+    status_handler.handler = MagicMock(
+        assign_status_entries=AsyncMock(side_effect=lambda _, __, cred_id: cred_id)
+    )
+
+    async def issue(body, supported, ex_record, pop, context):
+        status = await status_handler.assign_status_entries(
+            context, "supported_cred_id", ex_record.exchange_id
+        )
+        return f"cred-{body['proof']['jwt']}-{status}"
+
+    processor = MagicMock(issue=AsyncMock(side_effect=issue))
+    processors = MagicMock(issuer_for_format=MagicMock(return_value=processor))
+    cred_requests = [
+        {"format": "jwt_vc_json", "proof": {"proof_type": "jwt", "jwt": str(i)}}
+        for i in range(3)
+    ]
+    req.json = AsyncMock(return_value={"credential_requests": cred_requests})
+
+    with (
+        patch.object(
+            test_module,
+            "check_token",
+            AsyncMock(return_value=MagicMock(payload={"id": "exchange_id"})),
+        ),
+        patch.object(
+            test_module, "load_exchange", AsyncMock(return_value=(ex_record, supported))
+        ),
+        patch.object(
+            test_module,
+            "handle_proof_of_posession",
+            AsyncMock(return_value=MagicMock(verified=True)),
+        ) as mock_pop,
+        patch.object(context, "inject", return_value=processors),
+        patch.object(context, "inject_or", return_value=status_handler),
+    ):
+        response = await test_module.issue_batch_cred(req)
+        # each credential has its own status entries
+        assert json.loads(response.body) == {
+            "credential_responses": [
+                {
+                    "format": "jwt_vc_json",
+                    "credential": f"cred-{i}-exchange_id:{i}",
+                    "status_credential_id": f"exchange_id:{i}",
+                }
+                for i in range(3)
+            ]
+        }
+        assert mock_pop.await_count == 3
+        ex_record.save.assert_awaited_once()
+
+        # an issued exchange is not issued again
+        assert ex_record.state == test_module.OID4VCIExchangeRecord.STATE_ISSUED
+        processor.issue.reset_mock()
+        with pytest.raises(web.HTTPBadRequest):
+            await test_module.issue_batch_cred(req)
+        processor.issue.assert_not_awaited()
+
+        # no binding is reported for credentials without status entries
+        ex_record.state = "offer"
+        status_handler.handler.assign_status_entries.side_effect = None
+        status_handler.handler.assign_status_entries.return_value = None
+        response = await test_module.issue_batch_cred(req)
+        assert json.loads(response.body) == {
+            "credential_responses": [
+                {"format": "jwt_vc_json", "credential": f"cred-{i}-None"}
+                for i in range(3)
+            ]
+        }
+
+        # one invalid proof fails the whole batch
+        ex_record.state = "offer"
+        mock_pop.side_effect = [MagicMock(verified=True), MagicMock(verified=False)] * 2
+        processor.issue.reset_mock()
+        with pytest.raises(web.HTTPBadRequest):
+            await test_module.issue_batch_cred(req)
+        processor.issue.assert_not_awaited()
+
+        req.json.return_value = {
+            "credential_requests": [{"format": "ldp_vc", "proof": {}}]
+        }
+        with pytest.raises(web.HTTPBadRequest):
+            await test_module.issue_batch_cred(req)
+
+    # credentials issued one at a time are still bound to their exchange
+    status_handler.handler.assign_status_entries.return_value = "exchange_id"
+    assert (
+        await status_handler.assign_status_entries(
+            context, "supported_cred_id", "exchange_id"
+        )
+        == "exchange_id"
+    )
+
+
 @pytest.mark.asyncio
 async def test_handle_proof_of_posession(profile: Profile):
     """Test handling of proof of posession."""
@@ -54,3 +244,52 @@ async def test_handle_proof_of_posession(profile: Profile):
     nonce = "2I1w-E_6E-s07vAIo3q98g"
     result = await test_module.handle_proof_of_posession(profile, proof, nonce)
     assert isinstance(result.verified, bool)
+
+
+@pytest.mark.asyncio
+async def test_get_status_list_cached(context: AdminRequestContext, req: web.Request):
+    """Test status list endpoint with cached tokens."""
+    cached = MagicMock(token="token", etag="etag", max_age=60)
+    status_handler = MagicMock(
+        get_cached_status_list=AsyncMock(return_value=cached),
+        get_status_list_file=AsyncMock(return_value=None),
+    )
+    req.match_info = {"list_number": "1"}
+    req.if_none_match = None
+
+    with patch.object(context, "inject_or", return_value=status_handler):
+        response = await test_module.get_status_list(req)
+        assert response.status == 200
+        assert response.text == "token"
+        assert response.etag.value == "etag"
+        assert response.headers["Cache-Control"] == "public, max-age=60"
+
+        req.if_none_match = (ETag(value="etag"),)
+        response = await test_module.get_status_list(req)
+        assert response.status == 304
+        assert response.etag.value == "etag"
+
+        status_handler.get_cached_status_list.return_value = None
+        status_handler.get_status_list = AsyncMock(return_value="uncached")
+        response = await test_module.get_status_list(req)
+        assert response.text == "uncached"
+
+
+@pytest.mark.asyncio
+async def test_get_status_list_file(
+    context: AdminRequestContext, req: web.Request, tmp_path
+):
+    """Test status list endpoint serving published files."""
+    path = tmp_path / "1"
+    path.write_text("published")
+    status_handler = MagicMock(
+        get_status_list_file=AsyncMock(return_value=path),
+        get_cached_status_list=AsyncMock(),
+    )
+    req.match_info = {"list_number": "1"}
+
+    with patch.object(context, "inject_or", return_value=status_handler):
+        response = await test_module.get_status_list(req)
+        assert isinstance(response, web.FileResponse)
+        assert response.headers["Cache-Control"] == "public, no-cache"
+        status_handler.get_cached_status_list.assert_not_awaited()
@@ -0,0 +1,73 @@
+import time
+from unittest.mock import MagicMock
+
+from acapy_agent.wallet.util import bytes_to_b64
+
+from oid4vc.access_token import AccessTokenKeys, access_token_keys
+from oid4vc.config import Config
+
+
+def mock_profile(wallet_id=None) -> MagicMock:
+    return MagicMock(settings={"wallet.id": wallet_id} if wallet_id else {})
+
+
+def test_sign_verify():
+    keys = AccessTokenKeys()
+    profile = mock_profile()
+    payload = {"id": "exchange_id", "exp": int(time.time()) + 60}
+
+    token = keys.sign(profile, payload)
+    result = keys.verify(profile, token)
+    assert result.verified
+    assert result.payload == payload
+    assert result.headers["alg"] == "HS256"
+
+    # bound to the tenant the token was issued for
+    assert not keys.verify(mock_profile("other"), token).verified
+
+    # tampered payloads are rejected
+    headers, _, signature = token.split(".")
+    forged = keys.sign(profile, {**payload, "id": "other_exchange_id"}).split(".")[1]
+    assert not keys.verify(profile, f"{headers}.{forged}.{signature}").verified
+
+    # malformed tokens are not verified
+    for malformed in ("", "abc", f"{headers}.{forged}", f"{token}.extra", "a.b.c"):
+        assert not keys.verify(profile, malformed).verified
+
+
+def test_rotation():
+    keys = AccessTokenKeys(max_keys=2)
+    profile = mock_profile()
+    first = keys.sign(profile, {"id": "1"})
+
+    keys.rotate()
+    second = keys.sign(profile, {"id": "2"})
+    assert keys.verify(profile, first).verified
+    assert keys.verify(profile, second).verified
+
+    keys.rotate()
+    assert not keys.verify(profile, first).verified
+    assert keys.verify(profile, second).verified
+
+    # generated keys rotate once their lifetime has elapsed
+    keys.lifetime = 0
+    third = keys.sign(profile, {"id": "3"})
+    assert keys.verify(profile, third).verified
+    assert not keys.verify(profile, second).verified
+
+
+def test_access_token_keys():
+    config = Config("0.0.0.0", 8020, "http://localhost:8020", None)
+    assert access_token_keys(config) is None
+
+    secrets = [bytes_to_b64(bytes([n]) * 32, urlsafe=True, pad=False) for n in (1, 2)]
+    config.access_token_mode = "hmac"
+    config.access_token_keys = ",".join(secrets)
+    keys = access_token_keys(config)
+    assert keys is access_token_keys(config)
+    assert keys.configured
+
+    # tokens signed with the second configured key still verify
+    older = AccessTokenKeys([bytes([2]) * 32])
+    profile = mock_profile()
+    assert keys.verify(profile, older.sign(profile, {"id": "1"})).verified
@@ -0,0 +1,39 @@
+from oid4vc.evaluator_cache import EvaluatorCache
+from oid4vc.pex import PresentationExchangeEvaluator
+
+pres_def = {
+    "id": "32f54163-7166-48f1-93d8-ff217bdb0653",
+    "input_descriptors": [
+        {
+            "id": "citizenship_input_1",
+            "constraints": {
+                "fields": [
+                    {
+                        "path": ["$.credentialSubject.type"],
+                        "filter": {"type": "string", "const": "PermanentResident"},
+                    }
+                ]
+            },
+        }
+    ],
+}
+
+
+def test_evaluator_cache():
+    cache = EvaluatorCache(max_size=2)
+    evaluator = cache.put(
+        "pres_def_id", "v1", PresentationExchangeEvaluator.compile(pres_def)
+    )
+    assert cache.get("pres_def_id", "v1") is evaluator
+
+    # a newer record version is compiled again
+    assert cache.get("pres_def_id", "v2") is None
+
+    cache.invalidate("pres_def_id")
+    assert cache.get("pres_def_id", "v1") is None
+
+    # least recently used evaluators are evicted
+    for record_id in ("a", "b", "c"):
+        cache.put(record_id, "v1", evaluator)
+    assert cache.get("a", "v1") is None
+    assert cache.get("c", "v1") is evaluator
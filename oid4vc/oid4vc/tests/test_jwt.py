@@ -0,0 +1,79 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from acapy_agent.resolver.base import ResolverError
+from acapy_agent.wallet.util import bytes_to_b58, bytes_to_b64
+from aries_askar import Key, KeyAlg
+
+from oid4vc import jwt as test_module
+
+
+@pytest.fixture(autouse=True)
+def clear_key_material_cache():
+    test_module.KEY_MATERIAL_CACHE.clear()
+    yield
+    test_module.KEY_MATERIAL_CACHE.clear()
+
+
+def mock_profile(resolver) -> MagicMock:
+    return MagicMock(inject=MagicMock(return_value=resolver))
+
+
+@pytest.mark.asyncio
+async def test_key_material_did_jwk_and_did_key():
+    resolver = MagicMock(dereference_verification_method=AsyncMock())
+    profile = mock_profile(resolver)
+    key = Key.generate(KeyAlg.ED25519)
+
+    encoded = bytes_to_b64(key.get_jwk_public().encode(), urlsafe=True, pad=False)
+    resolved = await test_module.key_material_for_kid(profile, f"did:jwk:{encoded}#0")
+    assert resolved.get_public_bytes() == key.get_public_bytes()
+
+    multibase = "z" + bytes_to_b58(b"\xed\x01" + key.get_public_bytes())
+    resolved = await test_module.key_material_for_kid(
+        profile, f"did:key:{multibase}#{multibase}"
+    )
+    assert resolved.get_public_bytes() == key.get_public_bytes()
+
+    resolver.dereference_verification_method.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_key_material_cached():
+    key = Key.generate(KeyAlg.ED25519)
+    vm = MagicMock(type="JsonWebKey2020", public_key_jwk=key.get_jwk_public())
+    resolver = MagicMock(dereference_verification_method=AsyncMock(return_value=vm))
+    profile = mock_profile(resolver)
+
+    kid = "did:web:example.com#key-1"
+    for _ in range(2):
+        resolved = await test_module.key_material_for_kid(profile, kid)
+        assert resolved.get_public_bytes() == key.get_public_bytes()
+    resolver.dereference_verification_method.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_key_material_negative_cached(monkeypatch):
+    resolver = MagicMock(
+        dereference_verification_method=AsyncMock(side_effect=ResolverError("down"))
+    )
+    profile = mock_profile(resolver)
+
+    kid = "did:web:example.com#key-1"
+    errors = []
+    for _ in range(3):
+        with pytest.raises(ResolverError, match="down") as exc_info:
+            await test_module.key_material_for_kid(profile, kid)
+        errors.append(exc_info.value)
+    resolver.dereference_verification_method.assert_awaited_once()
+    # each caller gets its own exception
+    assert errors[1] is not errors[2]
+
+    # failures are remembered for a shorter time
+    monkeypatch.setattr(test_module.KEY_MATERIAL_CACHE, "negative_ttl", 0)
+    test_module.KEY_MATERIAL_CACHE.clear()
+    with pytest.raises(ResolverError):
+        await test_module.key_material_for_kid(profile, kid)
+    with pytest.raises(ResolverError):
+        await test_module.key_material_for_kid(profile, kid)
+    assert resolver.dereference_verification_method.await_count == 3
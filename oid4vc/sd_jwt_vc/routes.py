@@ -21,6 +21,7 @@ from marshmallow import fields
 
 
 from oid4vc.cred_processor import CredProcessors
+from oid4vc.issuer_metadata import ISSUER_METADATA_CACHE
 
 from oid4vc.models.supported_cred import SupportedCredential, SupportedCredentialSchema
 from oid4vc.routes import supported_cred_is_unique
@@ -186,6 +187,7 @@ async def supported_credential_create(request: web.Request):
 
     async with profile.session() as session:
         await record.save(session, reason="Save credential supported record.")
+    ISSUER_METADATA_CACHE.invalidate(profile)
 
     return web.json_response(record.serialize())
 
@@ -262,6 +264,7 @@ async def update_supported_credential_sd_jwt(request: web.Request):
         raise web.HTTPNotFound(reason=err.roll_up) from err
     except (StorageError, BaseModelError) as err:
         raise web.HTTPBadRequest(reason=err.roll_up) from err
+    ISSUER_METADATA_CACHE.invalidate(context.profile)
 
     registered_processors = context.inject(CredProcessors)
     if record.format not in registered_processors.issuers:
@@ -0,0 +1,277 @@
+"""Status list benchmarks.
+
+Runs against an in-memory Askar profile and prints one JSON document with the
+results of each scenario, for sizing list_size/shard_size and catching
+regressions in status_handler.py and models.py.
+
+Usage (from the plugin directory):
+
+    poetry run python -m benchmarks.run --output results.json
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import time
+from typing import List
+
+from acapy_agent.admin.request_context import AdminRequestContext
+from acapy_agent.config.plugin_settings import PLUGIN_CONFIG_KEY
+from acapy_agent.utils.testing import create_test_profile
+
+from status_list.v1_0 import status_handler
+from status_list.v1_0.feistel import FeistelPermutation
+from status_list.v1_0.models import StatusListCred, StatusListDef
+
+SCENARIOS = ("assign", "bulk_update", "render", "feistel")
+
+
+def summarize(samples: List[float]) -> dict:
+    """Summarize latency samples in milliseconds."""
+
+    samples = sorted(samples)
+    return {
+        "samples": len(samples),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 3),
+        "p50_ms": round(samples[len(samples) // 2] * 1000, 3),
+        "p95_ms": round(samples[int(len(samples) * 0.95)] * 1000, 3),
+        "max_ms": round(samples[-1] * 1000, 3),
+    }
+
+
+async def create_context(list_size: int, shard_size: int) -> AdminRequestContext:
+    """Create an admin context on a fresh in-memory profile."""
+
+    profile = await create_test_profile(
+        {
+            PLUGIN_CONFIG_KEY: {
+                "status_list": {
+                    "list_size": str(list_size),
+                    "shard_size": str(shard_size),
+                    "public_uri": "https://status.example.com/{tenant_id}/{list_number}",
+                    "file_path": "/tmp/status-list-bench/{tenant_id}/{list_number}",
+                }
+            }
+        }
+    )
+    return AdminRequestContext(profile)
+
+
+async def create_definition(
+    context: AdminRequestContext, list_size: int, shard_size: int, status_size: int = 1
+) -> StatusListDef:
+    """Create a status list definition with its current and spare lists."""
+
+    definition = StatusListDef(
+        supported_cred_id="bench_supported_cred_id",
+        status_purpose="revocation",
+        status_size=status_size,
+        shard_size=shard_size,
+        list_type="ietf",
+        list_size=list_size,
+        issuer_did="did:web:status.example.com",
+    )
+    wallet_id = status_handler.get_wallet_id(context)
+    async with context.profile.transaction() as txn:
+        for _ in range(2):
+            list_number = await status_handler.assign_status_list_number(txn, wallet_id)
+            if not definition.list_numbers:
+                definition.list_number = list_number
+            definition.next_list_number = list_number
+            definition.add_list_number(list_number)
+            await status_handler.create_next_status_list(txn, definition)
+        await definition.save(txn)
+        await txn.commit()
+    return definition
+
+
+async def bench_assign(args) -> dict:
+    """Entry assignment rate under concurrent tasks."""
+
+    context = await create_context(args.list_size, args.shard_size)
+    definition = await create_definition(context, args.list_size, args.shard_size)
+
+    async def worker(count: int):
+        for _ in range(count):
+            await status_handler.assign_status_list_entry(context, definition.id)
+
+    per_task = args.count // args.tasks
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(per_task) for _ in range(args.tasks)))
+    elapsed = time.perf_counter() - start
+
+    assigned = per_task * args.tasks
+    return {
+        "list_size": args.list_size,
+        "shard_size": args.shard_size,
+        "tasks": args.tasks,
+        "entries": assigned,
+        "seconds": round(elapsed, 3),
+        "entries_per_second": round(assigned / elapsed, 1),
+    }
+
+
+async def bench_bulk_update(args) -> dict:
+    """Bulk reservation and bulk status update of many credentials."""
+
+    context = await create_context(args.list_size, args.shard_size)
+    definition = await create_definition(context, args.list_size, args.shard_size)
+
+    start = time.perf_counter()
+    entries = await status_handler.reserve_status_list_entries(
+        context, definition.id, args.count
+    )
+    reserve_elapsed = time.perf_counter() - start
+
+    async with context.profile.transaction() as txn:
+        for number, entry in enumerate(entries):
+            await StatusListCred(
+                definition_id=definition.id,
+                credential_id=f"bench-{number}",
+                list_number=entry["list_number"],
+                list_index=entry["list_index"],
+            ).save(txn)
+        await txn.commit()
+
+    updates = {f"bench-{number}": "1" for number in range(len(entries))}
+    start = time.perf_counter()
+    result = await status_handler.update_status_list_entries(
+        context, definition.id, updates
+    )
+    update_elapsed = time.perf_counter() - start
+
+    return {
+        "list_size": args.list_size,
+        "shard_size": args.shard_size,
+        "entries": len(result["updated"]),
+        "reserve_seconds": round(reserve_elapsed, 3),
+        "reserve_entries_per_second": round(len(entries) / reserve_elapsed, 1),
+        "update_seconds": round(update_elapsed, 3),
+        "update_entries_per_second": round(len(result["updated"]) / update_elapsed, 1),
+    }
+
+
+async def bench_render(args) -> List[dict]:
+    """get_status_list render latency as list_size and shard_size vary."""
+
+    results = []
+    for list_size in args.list_sizes:
+        for shard_size in args.shard_sizes:
+            if shard_size > list_size:
+                continue
+            context = await create_context(list_size, shard_size)
+            definition = await create_definition(context, list_size, shard_size)
+            samples = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                await status_handler.get_status_list(
+                    context, definition, definition.list_number
+                )
+                samples.append(time.perf_counter() - start)
+            results.append(
+                {"list_size": list_size, "shard_size": shard_size, **summarize(samples)}
+            )
+    return results
+
+
+async def bench_feistel(args) -> List[dict]:
+    """Feistel permutation cost, one index at a time and in batches."""
+
+    results = []
+    for list_size in args.list_sizes:
+        feistel = FeistelPermutation(list_size, b"benchmark-seed")
+        count = min(args.count, list_size)
+
+        start = time.perf_counter()
+        for index in range(count):
+            feistel.permute(index)
+        single = time.perf_counter() - start
+
+        start = time.perf_counter()
+        feistel.permute_many(range(count))
+        batch = time.perf_counter() - start
+
+        results.append(
+            {
+                "list_size": list_size,
+                "indexes": count,
+                "permute_us": round(single / count * 1e6, 3),
+                "permute_many_us": round(batch / count * 1e6, 3),
+            }
+        )
+    return results
+
+
+async def run(args) -> dict:
+    """Run the selected scenarios."""
+
+    benchmarks = {
+        "assign": bench_assign,
+        "bulk_update": bench_bulk_update,
+        "render": bench_render,
+        "feistel": bench_feistel,
+    }
+    results = {}
+    for scenario in args.scenarios:
+        results[scenario] = await benchmarks[scenario](args)
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {
+            "list_size": args.list_size,
+            "shard_size": args.shard_size,
+            "count": args.count,
+            "tasks": args.tasks,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+
+def parse_args(argv: List[str]):
+    """Parse command line arguments."""
+
+    def sizes(value: str) -> List[int]:
+        return [int(size) for size in value.split(",")]
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--scenarios",
+        type=lambda value: value.split(","),
+        default=list(SCENARIOS),
+        help=f"Comma separated scenarios to run, from {', '.join(SCENARIOS)}",
+    )
+    parser.add_argument("--list-size", type=int, default=131072)
+    parser.add_argument("--shard-size", type=int, default=1024)
+    parser.add_argument("--list-sizes", type=sizes, default=[16384, 131072, 1048576])
+    parser.add_argument("--shard-sizes", type=sizes, default=[1024, 8192, 65536])
+    parser.add_argument("--count", type=int, default=1000, help="Entries per run")
+    parser.add_argument("--tasks", type=int, default=8, help="Concurrent tasks")
+    parser.add_argument("--repeat", type=int, default=20, help="Render samples")
+    parser.add_argument("--output", help="Write results to a file instead of stdout")
+    args = parser.parse_args(argv)
+
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    return args
+
+
+def main(argv: List[str] = None):
+    """Run benchmarks and write their results as JSON."""
+
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    report = json.dumps(asyncio.run(run(args)), indent=2)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,40 @@
 """Status List Plugin v1.0."""
+
+import logging
+
+from acapy_agent.config.injection_context import InjectionContext
+from acapy_agent.core.event_bus import Event, EventBus
+from acapy_agent.core.profile import Profile
+from acapy_agent.core.util import SHUTDOWN_EVENT_PATTERN
+
+from .bitmap_store import BITMAP_STORE, SHARD_SAVED_EVENT_PATTERN
+from .events import EVENT_BATCHER
+from .republisher import REPUBLISHER, SHARD_UPDATED_EVENT_PATTERN
+
+LOGGER = logging.getLogger(__name__)
+
+
+async def setup(context: InjectionContext):
+    """Setup the plugin."""
+
+    event_bus = context.inject(EventBus)
+    if not event_bus:
+        raise ValueError("EventBus missing in context")
+
+    # republish changed status lists in the background
+    event_bus.subscribe(SHARD_UPDATED_EVENT_PATTERN, REPUBLISHER.on_shard_updated)
+    LOGGER.debug("Subscribed status list republisher to shard updates.")
+
+    # keep mapped status list bitmaps current
+    event_bus.subscribe(SHARD_SAVED_EVENT_PATTERN, BITMAP_STORE.on_shard_saved)
+
+    event_bus.subscribe(SHUTDOWN_EVENT_PATTERN, shutdown)
+
+
+async def shutdown(profile: Profile, event: Event):
+    """Shutdown event handler; emit pending events, republish and unmap bitmaps."""
+
+    await EVENT_BATCHER.flush()
+    # publish the lists changed within a pending republish window
+    await REPUBLISHER.flush()
+    await BITMAP_STORE.close()
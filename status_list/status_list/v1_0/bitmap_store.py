@@ -0,0 +1,355 @@
+"""Memory-mapped status list bitmaps with a write-ahead log."""
+
+import asyncio
+import hashlib
+import logging
+import mmap
+import os
+import re
+import struct
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from math import ceil
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from acapy_agent.admin.request_context import AdminRequestContext
+from acapy_agent.core.event_bus import Event
+from acapy_agent.core.profile import Profile
+from bitarray import bitarray
+
+from .config import Config, ConfigError
+from .models import SHARD_SAVED_EVENT_TOPIC, StatusListDef, StatusListShard
+
+LOGGER = logging.getLogger(__name__)
+
+SHARD_SAVED_EVENT_PATTERN = re.compile(f"^{SHARD_SAVED_EVENT_TOPIC}$")
+
+# Bitmap file header: magic, format, list size, shard size, status size
+HEADER = struct.Struct(">4sIIII")
+HEADER_SIZE = 32
+MAGIC = b"SLBM"
+FORMAT = 1
+
+# Bytes of the shard version digests kept after the header
+VERSION_SIZE = 16
+
+# Write-ahead log record header: shard number, payload length, payload crc32
+WAL_RECORD = struct.Struct(">III")
+
+# Log size after which the mapped file is flushed and the log truncated
+WAL_CHECKPOINT_SIZE = 1 << 20
+
+# A single writer keeps log appends and mapped writes in order
+BITMAP_WRITE_EXECUTOR = ThreadPoolExecutor(
+    max_workers=1, thread_name_prefix="status-list-bitmap"
+)
+
+# (shard number, shard version, status bits, mask bits)
+ShardBits = Tuple[int, Optional[str], bitarray, bitarray]
+
+
+def version_digest(version: Optional[str]) -> bytes:
+    """Return the fixed size digest of a shard version."""
+    if not version:
+        return bytes(VERSION_SIZE)
+    return hashlib.blake2b(version.encode(), digest_size=VERSION_SIZE).digest()
+
+
+class MappedBitmap:
+    """Status and mask bits of one status list in a memory-mapped file.
+
+    Shard writes are appended to a write-ahead log and synced before they are
+    applied to the mapped file; the log is replayed when the file is reopened.
+    """
+
+    def __init__(self, path: Path, list_size: int, shard_size: int, status_size: int):
+        """Initialize a mapped bitmap."""
+        self.path = path
+        self.wal_path = path.with_suffix(".wal")
+        self.list_size = list_size
+        self.shard_size = shard_size
+        self.status_size = status_size
+        self.shard_count = ceil(list_size / shard_size)
+
+        self.status_offset = HEADER_SIZE + self.shard_count * VERSION_SIZE
+        self.mask_offset = self.status_offset + ceil(list_size * status_size / 8)
+        self.size = self.mask_offset + ceil(list_size / 8)
+
+        # held while the mapped bits are changed or read
+        self.lock = threading.Lock()
+        # status version of the list the shards were last caught up with
+        self.synced_version: Optional[str] = None
+        self.status: Optional[bitarray] = None
+        self.mask: Optional[bitarray] = None
+        self._file = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._wal = None
+
+    @property
+    def header(self) -> bytes:
+        """Header identifying the layout of the file."""
+        return HEADER.pack(
+            MAGIC, FORMAT, self.list_size, self.shard_size, self.status_size
+        ).ljust(HEADER_SIZE, b"\0")
+
+    def open(self):
+        """Map the file, creating it or replaying its write-ahead log."""
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        reuse = False
+        if self.path.is_file() and self.path.stat().st_size == self.size:
+            with open(self.path, "rb") as file:
+                reuse = file.read(HEADER_SIZE) == self.header
+
+        self._file = open(self.path, "r+b" if reuse else "w+b")
+        if not reuse:
+            self._file.truncate(self.size)
+        self._mmap = mmap.mmap(self._file.fileno(), self.size)
+        self.status = bitarray(
+            buffer=memoryview(self._mmap)[self.status_offset : self.mask_offset]
+        )
+        self.mask = bitarray(buffer=memoryview(self._mmap)[self.mask_offset :])
+        self._wal = open(self.wal_path, "a+b")
+
+        if reuse:
+            self._replay()
+        else:
+            self._mmap[:HEADER_SIZE] = self.header
+            self.mask.setall(1)
+            self.checkpoint()
+
+    def _replay(self):
+        """Apply the complete records of the write-ahead log."""
+
+        self._wal.seek(0)
+        log = self._wal.read()
+        offset = 0
+        while offset + WAL_RECORD.size <= len(log):
+            shard_number, length, crc = WAL_RECORD.unpack_from(log, offset)
+            start = offset + WAL_RECORD.size
+            payload = log[start : start + length]
+            if len(payload) != length or zlib.crc32(payload) != crc:
+                # torn write at the tail of the log
+                break
+            try:
+                self._apply(shard_number, payload)
+            except ValueError:
+                break
+            offset = start + length
+        LOGGER.debug(f"Replayed {offset} bytes of {self.wal_path}.")
+        self.checkpoint()
+
+    def _apply(self, shard_number: int, payload: bytes):
+        """Copy one logged shard into the mapped file."""
+
+        status_length = self.shard_size * self.status_size
+        status_bytes = ceil(status_length / 8)
+        if shard_number >= self.shard_count or len(payload) != (
+            VERSION_SIZE + status_bytes + ceil(self.shard_size / 8)
+        ):
+            raise ValueError(f"Invalid bitmap record for shard {shard_number}.")
+
+        status_bits = bitarray()
+        status_bits.frombytes(payload[VERSION_SIZE : VERSION_SIZE + status_bytes])
+        mask_bits = bitarray()
+        mask_bits.frombytes(payload[VERSION_SIZE + status_bytes :])
+
+        status_start = shard_number * status_length
+        status_end = min(status_start + status_length, self.list_size * self.status_size)
+        mask_start = shard_number * self.shard_size
+        mask_end = min(mask_start + self.shard_size, self.list_size)
+
+        version_start = HEADER_SIZE + shard_number * VERSION_SIZE
+        with self.lock:
+            self._mmap[version_start : version_start + VERSION_SIZE] = payload[
+                :VERSION_SIZE
+            ]
+            self.status[status_start:status_end] = status_bits[
+                : status_end - status_start
+            ]
+            self.mask[mask_start:mask_end] = mask_bits[: mask_end - mask_start]
+
+    def shard_version(self, shard_number: int) -> bytes:
+        """Return the version digest of a mapped shard."""
+        start = HEADER_SIZE + shard_number * VERSION_SIZE
+        return self._mmap[start : start + VERSION_SIZE]
+
+    def write_shards(self, shards: List[ShardBits]):
+        """Log shard bitmaps, then copy them into the mapped file."""
+
+        records = []
+        for shard_number, version, status_bits, mask_bits in shards:
+            payload = b"".join(
+                (version_digest(version), status_bits.tobytes(), mask_bits.tobytes())
+            )
+            records.append((shard_number, payload))
+            self._wal.write(
+                WAL_RECORD.pack(shard_number, len(payload), zlib.crc32(payload))
+            )
+            self._wal.write(payload)
+        self._wal.flush()
+        os.fsync(self._wal.fileno())
+
+        for shard_number, payload in records:
+            self._apply(shard_number, payload)
+        if self._wal.tell() >= WAL_CHECKPOINT_SIZE:
+            self.checkpoint()
+
+    def checkpoint(self):
+        """Flush the mapped file and truncate the write-ahead log."""
+        self._mmap.flush()
+        self._wal.truncate(0)
+        self._wal.flush()
+        os.fsync(self._wal.fileno())
+
+    def close(self):
+        """Checkpoint and unmap the file."""
+        if self._mmap is None:
+            return
+        self.checkpoint()
+        # release the exported buffers before unmapping
+        self.status = self.mask = None
+        self._mmap.close()
+        self._file.close()
+        self._wal.close()
+        self._mmap = None
+
+
+class BitmapStore:
+    """Memory-mapped bitmaps of the status lists rendered by this agent.
+
+    Shard records stay the source of truth. A list is mapped when first
+    rendered, catching up with any shard saved while it was not mapped, and is
+    then kept current from the bitmaps of committed shard saves. Shards saved by
+    other agents sharing the storage are caught up with when a list is rendered
+    at a status version the mapped bits were not synced with.
+    """
+
+    def __init__(self):
+        """Initialize a bitmap store."""
+        self._bitmaps: Dict[Path, MappedBitmap] = {}
+        self._locks: Dict[Path, asyncio.Lock] = {}
+
+    @staticmethod
+    def bitmap_file(profile: Profile, list_number: str) -> Optional[Path]:
+        """Return the bitmap file of a status list, if a bitmap store is set."""
+
+        try:
+            bitmap_path = Config.from_settings(profile.settings).bitmap_path
+        except ConfigError:
+            return None
+        if not bitmap_path or not str(list_number).isdigit():
+            return None
+        wallet_id = profile.settings.get("wallet.id") or "base"
+        return Path(bitmap_path.format(tenant_id=wallet_id)) / f"{list_number}.bitmap"
+
+    async def open_list(
+        self,
+        context: AdminRequestContext,
+        definition: StatusListDef,
+        list_number: str,
+        status_version: str,
+    ) -> Optional[MappedBitmap]:
+        """Return the mapped bitmap of a status list, or None without a store.
+
+        The mapped bits are caught up with the shards of the list unless they
+        were already synced at the given status version.
+        """
+
+        path = self.bitmap_file(context.profile, list_number)
+        if path is None:
+            return None
+        bitmap = self._bitmaps.get(path)
+        if bitmap and bitmap.synced_version == status_version:
+            return bitmap
+
+        async with self._locks.setdefault(path, asyncio.Lock()):
+            bitmap = self._bitmaps.get(path)
+            if bitmap and bitmap.synced_version == status_version:
+                return bitmap
+
+            loop = asyncio.get_running_loop()
+            if bitmap is None:
+                bitmap = MappedBitmap(
+                    path,
+                    definition.list_size,
+                    definition.shard_size,
+                    definition.status_size,
+                )
+                await loop.run_in_executor(BITMAP_WRITE_EXECUTOR, bitmap.open)
+
+            async with context.profile.session() as session:
+                tag_filter = {"definition_id": definition.id, "list_number": list_number}
+                shards = await StatusListShard.query(session, tag_filter)
+            stale = [
+                (
+                    int(shard.shard_number),
+                    shard.version,
+                    shard.status_bits,
+                    shard.mask_bits,
+                )
+                for shard in shards
+                # unversioned shards cannot be told apart from an empty slot
+                if not shard.version
+                or bitmap.shard_version(int(shard.shard_number))
+                != version_digest(shard.version)
+            ]
+            if stale:
+                await loop.run_in_executor(
+                    BITMAP_WRITE_EXECUTOR, bitmap.write_shards, stale
+                )
+                LOGGER.debug(f"Caught up {len(stale)} shards of {path}.")
+
+            bitmap.synced_version = status_version
+            self._bitmaps[path] = bitmap
+        return bitmap
+
+    async def on_shard_saved(self, profile: Profile, event: Event):
+        """Write the bitmaps of a committed shard into its mapped list."""
+
+        payload = event.payload or {}
+        path = self.bitmap_file(profile, payload.get("list_number"))
+        if path is None:
+            return
+        lock = self._locks.get(path)
+        if lock and lock.locked():
+            # the list is being mapped or caught up; write after it
+            async with lock:
+                pass
+        bitmap = self._bitmaps.get(path)
+        if bitmap is None:
+            # caught up when the list is first rendered
+            return
+
+        shard = (
+            int(payload["shard_number"]),
+            payload["version"],
+            payload["status_bits"],
+            payload["mask_bits"],
+        )
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(
+                BITMAP_WRITE_EXECUTOR, bitmap.write_shards, [shard]
+            )
+        except Exception:
+            LOGGER.exception(f"Failed to write status list bitmap {path}.")
+            # remapped and caught up on the next render
+            self._bitmaps.pop(path, None)
+            with suppress(Exception):
+                await loop.run_in_executor(BITMAP_WRITE_EXECUTOR, bitmap.close)
+
+    async def close(self):
+        """Checkpoint and unmap all bitmaps."""
+
+        loop = asyncio.get_running_loop()
+        bitmaps = list(self._bitmaps.values())
+        self._bitmaps.clear()
+        for bitmap in bitmaps:
+            await loop.run_in_executor(BITMAP_WRITE_EXECUTOR, bitmap.close)
+
+
+BITMAP_STORE = BitmapStore()
@@ -2,6 +2,7 @@
 
 from dataclasses import dataclass
 from os import getenv
+from typing import Optional
 
 from acapy_agent.config.base import BaseSettings
 from acapy_agent.config.settings import Settings
@@ -29,6 +30,16 @@ class Config:
     shard_size: int
     public_uri: str
     file_path: str
+    spare_threshold: float = 0.0
+    lease_size: int = 0
+    lease_ttl: int = 300
+    worker_id: Optional[str] = None
+    republish_window: float = 0.0
+    republish_concurrency: int = 2
+    event_batch_size: int = 0
+    event_batch_interval: float = 1.0
+    serve_files: bool = False
+    bitmap_path: Optional[str] = None
 
     @classmethod
     def from_settings(cls, settings: BaseSettings) -> "Config":
@@ -44,6 +55,38 @@ class Config:
         )
         public_uri = plugin_settings.get("public_uri") or getenv("STATUS_LIST_PUBLIC_URI")
         file_path = plugin_settings.get("file_path") or getenv("STATUS_LIST_FILE_PATH")
+        spare_threshold = float(
+            plugin_settings.get("spare_threshold")
+            or getenv("STATUS_LIST_SPARE_THRESHOLD")
+            or "0"
+        )
+        lease_size = int(
+            plugin_settings.get("lease_size") or getenv("STATUS_LIST_LEASE_SIZE") or "0"
+        )
+        lease_ttl = int(
+            plugin_settings.get("lease_ttl") or getenv("STATUS_LIST_LEASE_TTL") or "300"
+        )
+        worker_id = plugin_settings.get("worker_id") or getenv("STATUS_LIST_WORKER_ID")
+        republish_window = float(
+            plugin_settings.get("republish_window")
+            or getenv("STATUS_LIST_REPUBLISH_WINDOW")
+            or "0"
+        )
+        republish_concurrency = int(
+            plugin_settings.get("republish_concurrency")
+            or getenv("STATUS_LIST_REPUBLISH_CONCURRENCY")
+            or "2"
+        )
+        event_batch_size = int(
+            plugin_settings.get("event_batch_size")
+            or getenv("STATUS_LIST_EVENT_BATCH_SIZE")
+            or "0"
+        )
+        event_batch_interval = float(
+            plugin_settings.get("event_batch_interval")
+            or getenv("STATUS_LIST_EVENT_BATCH_INTERVAL")
+            or "1"
+        )
         if not list_size:
             raise ConfigError("list_size", "STATUS_LIST_SIZE")
         if not shard_size:
@@ -52,5 +95,42 @@ class Config:
             raise ConfigError("public_uri", "STATUS_LIST_PUBLIC_URI")
         if not file_path:
             raise ConfigError("file_path", "STATUS_LIST_FILE_PATH")
+        if not 0 <= spare_threshold < 1:
+            raise ConfigError("spare_threshold", "STATUS_LIST_SPARE_THRESHOLD")
+        if lease_size < 0:
+            raise ConfigError("lease_size", "STATUS_LIST_LEASE_SIZE")
+        if lease_ttl <= 0:
+            raise ConfigError("lease_ttl", "STATUS_LIST_LEASE_TTL")
+        serve_files = str(
+            plugin_settings.get("serve_files") or getenv("STATUS_LIST_SERVE_FILES") or ""
+        ).lower() in ("true", "1", "yes")
+        bitmap_path = plugin_settings.get("bitmap_path") or getenv(
+            "STATUS_LIST_BITMAP_PATH"
+        )
+        if republish_window < 0:
+            raise ConfigError("republish_window", "STATUS_LIST_REPUBLISH_WINDOW")
+        if republish_concurrency <= 0:
+            raise ConfigError(
+                "republish_concurrency", "STATUS_LIST_REPUBLISH_CONCURRENCY"
+            )
+        if event_batch_size < 0:
+            raise ConfigError("event_batch_size", "STATUS_LIST_EVENT_BATCH_SIZE")
+        if event_batch_interval <= 0:
+            raise ConfigError("event_batch_interval", "STATUS_LIST_EVENT_BATCH_INTERVAL")
 
-        return cls(list_size, shard_size, public_uri, file_path)
+        return cls(
+            list_size,
+            shard_size,
+            public_uri,
+            file_path,
+            spare_threshold,
+            lease_size,
+            lease_ttl,
+            worker_id,
+            republish_window,
+            republish_concurrency,
+            event_batch_size,
+            event_batch_interval,
+            serve_files,
+            bitmap_path,
+        )
@@ -14,6 +14,8 @@ from aiohttp_apispec import docs, request_schema, response_schema, match_info_sc
 from marshmallow import fields
 
 from .. import status_handler
+from ..models import StatusListDef
+from .status_list_def import MatchStatusListDefRequest
 
 LOGGER = logging.getLogger(__name__)
 
@@ -130,6 +132,113 @@ async def update_status_list_cred(request: web.BaseRequest):
     return web.json_response(result)
 
 
+class UpdateStatusListCredEntrySchema(OpenAPISchema):
+    """Status update of a single credential in a bulk request."""
+
+    cred_id = fields.Str(
+        required=True,
+        metadata={"description": "Status list credential identifier."},
+    )
+    status = fields.Str(
+        required=True,
+        metadata={"description": "Status bitstring", "example": "10"},
+    )
+
+
+class UpdateStatusListCredsRequest(OpenAPISchema):
+    """Request schema for updating many status list entries."""
+
+    entries = fields.List(
+        fields.Nested(UpdateStatusListCredEntrySchema()),
+        required=True,
+        metadata={"description": "Status updates by credential identifier"},
+    )
+
+
+class UpdatedStatusListCredSchema(StatusListCredSchema):
+    """Updated status list entry in a bulk response."""
+
+    credential_id = fields.Str(
+        required=False,
+        metadata={"description": "Status list credential identifier."},
+    )
+
+
+class UpdateStatusListCredsResponse(OpenAPISchema):
+    """Response schema for updating many status list entries."""
+
+    updated = fields.List(
+        fields.Nested(UpdatedStatusListCredSchema()),
+        required=True,
+        metadata={"description": "Updated status list entries"},
+    )
+    not_found = fields.List(
+        fields.Str(),
+        required=True,
+        metadata={"description": "Credential identifiers without a status entry"},
+    )
+
+
+@docs(
+    tags=["status-list"],
+    summary="Update status list entries of many credentials",
+)
+@match_info_schema(MatchStatusListDefRequest())
+@request_schema(UpdateStatusListCredsRequest())
+@response_schema(UpdateStatusListCredsResponse(), 200, description="")
+@tenant_authentication
+async def update_status_list_creds(request: web.BaseRequest):
+    """Request handler for updating status list entries of many credentials."""
+
+    definition_id = request.match_info["def_id"]
+
+    body: Dict[str, Any] = await request.json()
+    entries = body.get("entries", None)
+    if not entries:
+        raise web.HTTPBadRequest(reason="entries are required")
+
+    updates: Dict[str, str] = {}
+    for entry in entries:
+        credential_id = entry.get("cred_id", None)
+        bitstring = entry.get("status", None)
+        if not credential_id or not bitstring:
+            raise web.HTTPBadRequest(reason="cred_id and status are required")
+        if not set(bitstring) <= {"0", "1"}:
+            raise web.HTTPBadRequest(reason="status must be valid bitstring of 0 and 1")
+        updates[credential_id] = bitstring
+
+    context: AdminRequestContext = request["context"]
+    try:
+        async with context.profile.session() as session:
+            definition = await StatusListDef.retrieve_by_id(session, definition_id)
+    except StorageNotFoundError as err:
+        raise web.HTTPNotFound(reason=err.roll_up) from err
+    except (StorageError, BaseModelError) as err:
+        raise web.HTTPInternalServerError(reason=err.roll_up) from err
+
+    # reject the whole batch before any entry is updated
+    for credential_id, bitstring in updates.items():
+        if len(bitstring) != definition.status_size:
+            raise web.HTTPBadRequest(
+                reason=f"status of {credential_id} must be "
+                f"{definition.status_size} bit(s) long"
+            )
+
+    try:
+        result = await status_handler.update_status_list_entries(
+            context, definition_id, updates
+        )
+        LOGGER.debug(f"Updated {len(result['updated'])} status list entries.")
+
+    except StorageNotFoundError as err:
+        raise web.HTTPNotFound(reason=err.roll_up) from err
+
+    except (StorageError, BaseModelError, BaseError) as err:
+        raise web.HTTPInternalServerError(reason=err.roll_up) from err
+
+    return web.json_response(result)
+
+
 class MatchBindStatusListCredRequest(OpenAPISchema):
     """Request schema for querying status list entry."""
 
@@ -21,7 +21,13 @@ from marshmallow import fields
 from marshmallow.validate import OneOf
 
 from ..error import StatusListError
-from ..models import StatusListDef, StatusListDefSchema, StatusListShard, StatusListCred
+from ..models import (
+    StatusListCred,
+    StatusListDef,
+    StatusListDefSchema,
+    StatusListShard,
+    StatusListVersion,
+)
 from .. import status_handler
 
 LOGGER = logging.getLogger(__name__)
@@ -334,8 +340,15 @@ async def update_status_list_def(request: web.BaseRequest):
             # Save updated status list definition
             await definition.save(txn, reason="Update status list definition.")
 
+            # Lists are rendered anew with the updated definition
+            for list_number in definition.list_numbers or []:
+                await status_handler.bump_status_list_version(
+                    txn, definition_id, list_number
+                )
+
             # Commit all changes
             await txn.commit()
+            status_handler.invalidate_status_list_tokens(definition_id)
 
             LOGGER.debug(f"Updated status list definition: {definition}.")
 
@@ -387,12 +400,21 @@ async def delete_status_list_def(request: web.Request):
                 for shard in shards:
                     await shard.delete_record(txn)
 
+                # delete status list versions
+                versions = await StatusListVersion.query(
+                    txn, {"definition_id": definition_id}
+                )
+                for version in versions:
+                    await version.delete_record(txn)
+
                 # delete status list definition
                 definition = await StatusListDef.retrieve_by_id(txn, definition_id)
                 await definition.delete_record(txn)
 
                 # commit all changes
                 await txn.commit()
+                status_handler.invalidate_status_list_tokens(definition_id)
+                status_handler.CREDENTIAL_INDEX.forget(definition_id)
 
                 # create response
                 result = {"deleted": True, "def_id": definition_id}
@@ -0,0 +1,24 @@
+"""Status list metrics controller."""
+
+from aiohttp import web
+from aiohttp_apispec import docs
+
+from acapy_agent.admin.decorators.auth import admin_authentication
+
+from .. import metrics
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@docs(
+    tags=["status-list"],
+    summary="Status list allocation and publication metrics in Prometheus format",
+)
+@admin_authentication
+async def get_status_list_metrics(request: web.BaseRequest):
+    """Request handler for exposing status list metrics."""
+
+    return web.Response(
+        body=metrics.REGISTRY.expose().encode("utf-8"),
+        headers={"Content-Type": CONTENT_TYPE},
+    )
@@ -13,8 +13,6 @@ from aiohttp_apispec import docs, match_info_schema, response_schema
 from marshmallow import fields
 
 from .. import status_handler
-from ..config import Config
-from ..jwt import jwt_sign
 from ..models import StatusListDef
 
 LOGGER = logging.getLogger(__name__)
@@ -40,13 +38,13 @@ class PublishStatusListResponseSchema(OpenAPISchema):
     status_lists = fields.List(
         fields.Str(),
         required=False,
-        metadata={"description": "Published status lists."},
+        metadata={"description": "Status lists published by this request."},
     )
 
 
 @docs(
     tags=["status-list"],
-    summary="Publish all status lists under a status list definition",
+    summary="Publish status lists under a status list definition that have changed",
 )
 @match_info_schema(MatchStatusListDefRequest())
 @response_schema(PublishStatusListResponseSchema(), 200, description="")
@@ -57,36 +55,11 @@ async def publish_status_list(request: web.BaseRequest):
     definition_id = request.match_info["def_id"]
 
     try:
-        published = []
         context: AdminRequestContext = request["context"]
-        config = Config.from_settings(context.profile.settings)
-        wallet_id = status_handler.get_wallet_id(context)
         async with context.profile.session() as session:
             definition = await StatusListDef.retrieve_by_id(session, definition_id)
 
-        for list_number in definition.list_numbers:
-            status_list = await status_handler.get_status_list(
-                context, definition, list_number
-            )
-            # publish status list
-            if config.file_path is not None:
-                path = config.file_path.format(
-                    tenant_id=wallet_id,
-                    list_number=list_number,
-                )
-                headers = (
-                    {"typ": "statuslist+jwt"} if definition.list_type == "ietf" else {}
-                )
-                jws = await jwt_sign(
-                    profile=context.profile,
-                    headers=headers,
-                    payload=status_list,
-                    did=definition.issuer_did,
-                    verification_method=definition.verification_method,
-                )
-                status_handler.write_to_file(path, jws.encode("utf-8"))
-            # add status_list to published list
-            published.append(status_list)
+        published = await status_handler.publish_status_lists(context, definition)
 
         return web.json_response(
             {
@@ -1,11 +1,18 @@
 """Status list controller."""
 
 import logging
+from typing import Any, Dict
 
 from aiohttp import web
-from aiohttp_apispec import docs, response_schema, match_info_schema, querystring_schema
+from aiohttp_apispec import (
+    docs,
+    request_schema,
+    response_schema,
+    match_info_schema,
+    querystring_schema,
+)
 from marshmallow import fields
-from marshmallow.validate import OneOf
+from marshmallow.validate import OneOf, Range
 
 from acapy_agent.admin.decorators.auth import tenant_authentication
 from acapy_agent.admin.request_context import AdminRequestContext
@@ -75,6 +82,175 @@ async def assign_status_list_entry(request: web.BaseRequest):
         raise web.HTTPInternalServerError(reason=err.roll_up) from err
 
 
+class ReserveStatusListEntriesRequest(OpenAPISchema):
+    """Request schema for reserving a batch of status list entries."""
+
+    count = fields.Int(
+        required=True,
+        validate=Range(min=1),
+        metadata={"description": "Number of entries to reserve", "example": 1000},
+    )
+
+
+class ReserveStatusListEntriesResponse(OpenAPISchema):
+    """Response schema for reserving a batch of status list entries."""
+
+    entries = fields.List(
+        fields.Nested(AssignStatusListEntryResponse()),
+        required=True,
+        metadata={"description": "Reserved status list entries"},
+    )
+
+
+@docs(
+    tags=["status-list"],
+    summary="Reserve a batch of status list entries",
+)
+@match_info_schema(MatchStatusListDefRequest())
+@request_schema(ReserveStatusListEntriesRequest())
+@response_schema(ReserveStatusListEntriesResponse(), 200, description="")
+@tenant_authentication
+async def reserve_status_list_entries(request: web.BaseRequest):
+    """Request handler for reserving a batch of status list entries."""
+
+    definition_id = request.match_info["def_id"]
+    body: Dict[str, Any] = await request.json()
+    count = body.get("count", None)
+    if not isinstance(count, int) or count <= 0:
+        raise web.HTTPBadRequest(reason="count must be a positive integer")
+
+    try:
+        context: AdminRequestContext = request["context"]
+        entries = await status_handler.reserve_status_list_entries(
+            context, definition_id, count
+        )
+
+        return web.json_response({"entries": entries})
+
+    except StorageNotFoundError as err:
+        raise web.HTTPNotFound(reason=err.roll_up) from err
+
+    except (StorageError, BaseModelError, BaseError) as err:
+        raise web.HTTPInternalServerError(reason=err.roll_up) from err
+
+
+class TransitionStatusListEntriesRequest(OpenAPISchema):
+    """Request schema for transitioning status list entries by selector."""
+
+    status = fields.Str(
+        required=True,
+        metadata={"description": "Status bitstring", "example": "01"},
+    )
+    list_numbers = fields.List(
+        fields.Str(),
+        required=False,
+        metadata={"description": "Only transition entries of these lists"},
+    )
+    cred_ids = fields.List(
+        fields.Str(),
+        required=False,
+        metadata={"description": "Only transition entries of these credentials"},
+    )
+
+
+class TransitionStatusListEntriesResponse(OpenAPISchema):
+    """Response schema for transitioning status list entries by selector."""
+
+    updated_entries = fields.Int(
+        required=True,
+        metadata={"description": "Number of entries updated", "example": 1000},
+    )
+    updated_shards = fields.Int(
+        required=True,
+        metadata={"description": "Number of shards updated", "example": 4},
+    )
+    not_found = fields.List(
+        fields.Str(),
+        required=False,
+        metadata={"description": "Credential identifiers without a status entry"},
+    )
+
+
+@docs(
+    tags=["status-list"],
+    summary="Set the status of all assigned entries matching a selector",
+)
+@match_info_schema(MatchStatusListDefRequest())
+@request_schema(TransitionStatusListEntriesRequest())
+@response_schema(TransitionStatusListEntriesResponse(), 200, description="")
+@tenant_authentication
+async def transition_status_list_entries(request: web.BaseRequest):
+    """Request handler for transitioning status list entries by selector."""
+
+    definition_id = request.match_info["def_id"]
+    body: Dict[str, Any] = await request.json()
+    bitstring = body.get("status", None)
+    if not bitstring:
+        raise web.HTTPBadRequest(reason="status is required")
+    if not set(bitstring) <= {"0", "1"}:
+        raise web.HTTPBadRequest(reason="status must be valid bitstring of 0 and 1")
+    list_numbers = body.get("list_numbers", None)
+    credential_ids = body.get("cred_ids", None)
+    if list_numbers is not None and credential_ids is not None:
+        raise web.HTTPBadRequest(reason="list_numbers and cred_ids are exclusive")
+
+    try:
+        context: AdminRequestContext = request["context"]
+        result = await status_handler.transition_status_list_entries(
+            context,
+            definition_id,
+            bitstring,
+            list_numbers=list_numbers,
+            credential_ids=credential_ids,
+        )
+
+        return web.json_response(result)
+
+    except StorageNotFoundError as err:
+        raise web.HTTPNotFound(reason=err.roll_up) from err
+
+    except (StorageError, BaseModelError, BaseError) as err:
+        raise web.HTTPInternalServerError(reason=err.roll_up) from err
+
+
+class MigrateStatusListShardsResponse(OpenAPISchema):
+    """Response schema for migrating status list shards."""
+
+    migrated = fields.Int(
+        required=True,
+        metadata={"description": "Number of shards rewritten", "example": 128},
+    )
+    format_version = fields.Int(
+        required=True,
+        metadata={"description": "Storage format of the shards", "example": 2},
+    )
+
+
+@docs(
+    tags=["status-list"],
+    summary="Migrate status list shards to the current storage format",
+)
+@match_info_schema(MatchStatusListDefRequest())
+@response_schema(MigrateStatusListShardsResponse(), 200, description="")
+@tenant_authentication
+async def migrate_status_list_shards(request: web.BaseRequest):
+    """Request handler for migrating status list shards."""
+
+    definition_id = request.match_info["def_id"]
+
+    try:
+        context: AdminRequestContext = request["context"]
+        result = await status_handler.migrate_status_list_shards(context, definition_id)
+
+        return web.json_response(result)
+
+    except StorageNotFoundError as err:
+        raise web.HTTPNotFound(reason=err.roll_up) from err
+
+    except (StorageError, BaseModelError, BaseError) as err:
+        raise web.HTTPInternalServerError(reason=err.roll_up) from err
+
+
 class MatchStatusListRequest(OpenAPISchema):
     """Match info for request with identifier."""
 
@@ -0,0 +1,78 @@
+"""Batched emission of status list entry events."""
+
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from acapy_agent.core.profile import Profile
+
+from .config import Config
+
+LOGGER = logging.getLogger(__name__)
+
+STATUS_LIST_EVENT_TOPIC = "acapy::record::status-list::{state}"
+
+
+class StatusListEventBatcher:
+    """Aggregate entry events per definition and emit them as one event.
+
+    A batch is emitted once it holds event_batch_size entries, or
+    event_batch_interval seconds after its first entry.
+    """
+
+    def __init__(self):
+        """Initialize a status list event batcher."""
+        # (wallet_id, definition_id, state) -> (profile, entries)
+        self._batches: Dict[Tuple[str, str, str], Tuple[Profile, List[dict]]] = {}
+        self._timers: Dict[Tuple[str, str, str], asyncio.Task] = {}
+
+    async def add(
+        self,
+        profile: Profile,
+        definition_id: str,
+        state: str,
+        entries: List[dict],
+        config: Config,
+    ):
+        """Add entry events to the batch of a definition."""
+
+        key = (profile.settings.get("wallet.id") or "base", definition_id, state)
+        _, batch = self._batches.setdefault(key, (profile, []))
+        batch.extend(entries)
+
+        if len(batch) >= config.event_batch_size:
+            await self.flush(key)
+        elif key not in self._timers:
+            self._timers[key] = asyncio.create_task(
+                self._flush_later(key, config.event_batch_interval)
+            )
+
+    async def _flush_later(self, key: tuple, interval: float):
+        """Emit a batch once its interval has elapsed."""
+        await asyncio.sleep(interval)
+        self._timers.pop(key, None)
+        await self.flush(key)
+
+    async def flush(self, key: Optional[tuple] = None):
+        """Emit one batch, or all pending batches."""
+
+        for key in [key] if key else list(self._batches):
+            timer = self._timers.pop(key, None)
+            if timer and timer is not asyncio.current_task():
+                timer.cancel()
+            batch = self._batches.pop(key, None)
+            if not batch:
+                continue
+
+            profile, entries = batch
+            _, definition_id, state = key
+            try:
+                await profile.notify(
+                    STATUS_LIST_EVENT_TOPIC.format(state=state),
+                    {"definition_id": definition_id, "state": state, "entries": entries},
+                )
+            except Exception:
+                LOGGER.exception(f"Failed to emit status list {state} events.")
+
+
+EVENT_BATCHER = StatusListEventBatcher()
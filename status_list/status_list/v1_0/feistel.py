@@ -2,6 +2,13 @@
 
 import hashlib
 import hmac
+from functools import lru_cache
+from typing import Iterable, List
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 class FeistelPermutation:
@@ -116,3 +123,60 @@ class FeistelPermutation:
         else:
             # Direct balanced Feistel
             return self._feistel_permute_extended(i)
+
+    def permute_many(self, indexes: Iterable[int]) -> List[int]:
+        """Map a batch of inputs in [0..N-1] to their permuted outputs.
+
+        Uses vectorized integer operations when NumPy is available, otherwise falls
+        back to permuting each input in turn.
+        """
+        if isinstance(indexes, range):
+            if len(indexes) == 0:
+                return []
+            bounds = (indexes[0], indexes[-1])
+        else:
+            indexes = list(indexes)
+            if not indexes:
+                return []
+            bounds = (min(indexes), max(indexes))
+        if bounds[0] < 0 or bounds[1] >= self.N:
+            raise ValueError("Input must be in [0..N-1].")
+
+        if np is None:
+            return [self.permute(i) for i in indexes]
+
+        if isinstance(indexes, range):
+            x = np.arange(indexes.start, indexes.stop, indexes.step, dtype=np.uint64)
+        else:
+            x = np.fromiter(indexes, dtype=np.uint64, count=len(indexes))
+
+        x = self._feistel_permute_array(x)
+        if self.use_cycle_walking:
+            # Cycle-walk only the outputs that landed outside [0..N-1]
+            pending = x >= self.N_inner
+            while pending.any():
+                x[pending] = self._feistel_permute_array(x[pending])
+                pending = x >= self.N_inner
+
+        return x.tolist()
+
+    def _feistel_permute_array(self, x):
+        """Apply the balanced Feistel to a NumPy array of inputs."""
+        half = np.uint64(self.half)
+        mask_half = np.uint64(self.mask_half)
+        C = np.uint64(self.C)
+
+        L = x >> half
+        R = x & mask_half
+        for K in self.round_keys:
+            L, R = R, L ^ ((C * (R ^ np.uint64(K))) & mask_half)
+
+        return (L << half) | R
+
+
+@lru_cache(maxsize=256)
+def get_permutation(
+    N: int, master_key_bytes: bytes, rounds: int = 4
+) -> FeistelPermutation:
+    """Return a cached Feistel permutation for a list size and seed."""
+    return FeistelPermutation(N, master_key_bytes, rounds)
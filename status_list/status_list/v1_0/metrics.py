@@ -0,0 +1,187 @@
+"""In-process metrics for status list allocation and publication."""
+
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SHARD_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096)
+
+
+def format_labels(names: Sequence[str], values: Sequence[str], **extra) -> str:
+    """Format label pairs in the Prometheus text format."""
+    pairs = [*zip(names, values), *extra.items()]
+    if not pairs:
+        return ""
+    escaped = (
+        (name, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+        for name, value in pairs
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+class Counter:
+    """Monotonic counter."""
+
+    def __init__(self, name: str, description: str, labels: Sequence[str] = ()):
+        """Initialize a counter."""
+        self.name = name
+        self.description = description
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        """Increment the counter."""
+        key = tuple(str(labels[name]) for name in self.labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        """Return the current value of the counter."""
+        return self._values.get(tuple(str(labels[name]) for name in self.labels), 0)
+
+    def expose(self) -> List[str]:
+        """Return the counter in the Prometheus text format."""
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{format_labels(self.labels, key)} {value:g}")
+        return lines
+
+    def reset(self):
+        """Drop all recorded values."""
+        self._values.clear()
+
+
+class Histogram:
+    """Histogram of observed values in cumulative buckets."""
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        labels: Sequence[str] = (),
+    ):
+        """Initialize a histogram."""
+        self.name = name
+        self.description = description
+        self.buckets = tuple(sorted(buckets))
+        self.labels = tuple(labels)
+        # label values -> (bucket counts, sum, count)
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels):
+        """Record an observation."""
+        key = tuple(str(labels[name]) for name in self.labels)
+        entry = self._values.setdefault(key, [[0] * len(self.buckets), 0.0, 0])
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                entry[0][i] += 1
+        entry[1] += value
+        entry[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of a block in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels) -> int:
+        """Return the number of observations."""
+        entry = self._values.get(tuple(str(labels[name]) for name in self.labels))
+        return entry[2] if entry else 0
+
+    def expose(self) -> List[str]:
+        """Return the histogram in the Prometheus text format."""
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} histogram",
+        ]
+        for key, (counts, total, count) in sorted(self._values.items()):
+            for bound, bucket_count in zip(self.buckets, counts):
+                labels = format_labels(self.labels, key, le=f"{bound:g}")
+                lines.append(f"{self.name}_bucket{labels} {bucket_count}")
+            labels = format_labels(self.labels, key, le="+Inf")
+            lines.append(f"{self.name}_bucket{labels} {count}")
+            labels = format_labels(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {total:g}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+    def reset(self):
+        """Drop all recorded values."""
+        self._values.clear()
+
+
+class Registry:
+    """Collection of metrics exposed together."""
+
+    def __init__(self):
+        """Initialize a metrics registry."""
+        self._metrics = []
+
+    def register(self, metric):
+        """Register a metric and return it."""
+        self._metrics.append(metric)
+        return metric
+
+    def expose(self) -> str:
+        """Return all metrics in the Prometheus text format."""
+        return "".join(
+            line + "\n" for metric in self._metrics for line in metric.expose()
+        )
+
+    def reset(self):
+        """Drop the recorded values of all metrics."""
+        for metric in self._metrics:
+            metric.reset()
+
+
+REGISTRY = Registry()
+
+ASSIGN_SECONDS = REGISTRY.register(
+    Histogram("status_list_assign_seconds", "Time to assign a status list entry.")
+)
+DEFINITION_LOCK_SECONDS = REGISTRY.register(
+    Histogram(
+        "status_list_definition_lock_seconds",
+        "Time a status list definition is locked to take list indexes.",
+    )
+)
+SHARD_LOCK_SECONDS = REGISTRY.register(
+    Histogram(
+        "status_list_shard_lock_seconds",
+        "Time a status list shard is locked to assign an entry.",
+    )
+)
+ASSIGN_RETRIES = REGISTRY.register(
+    Counter(
+        "status_list_assign_retries_total",
+        "Entry assignments retried because the entry was already assigned.",
+    )
+)
+ROLLOVERS = REGISTRY.register(
+    Counter("status_list_rollovers_total", "Full status lists switched to a spare.")
+)
+RENDER_SHARDS = REGISTRY.register(
+    Histogram(
+        "status_list_render_shards",
+        "Number of shards read to render a status list.",
+        buckets=SHARD_BUCKETS,
+    )
+)
+COMPRESS_SECONDS = REGISTRY.register(
+    Histogram("status_list_compress_seconds", "Time to compress a status list.")
+)
+SIGN_SECONDS = REGISTRY.register(
+    Histogram("status_list_sign_seconds", "Time to sign a status list.")
+)
+PUBLISH_SECONDS = REGISTRY.register(
+    Histogram(
+        "status_list_publish_seconds",
+        "Time to publish the status lists of a definition.",
+        labels=("definition_id",),
+    )
+)
@@ -2,17 +2,21 @@
 
 import random
 import string
+import zlib
+from collections import OrderedDict
 from typing import List, Optional
+from uuid import uuid4
 
+from acapy_agent.core.profile import ProfileSession
 from acapy_agent.messaging.models.base_record import BaseRecord, BaseRecordSchema
 from acapy_agent.wallet.util import b64_to_bytes, bytes_to_b64
-from bitarray import bitarray
+from bitarray import bitarray, frozenbitarray
 from bitarray import util as bitutil
 from marshmallow import fields
 
-from .config import Config
+from .config import Config, ConfigError
 from .error import DuplicateListNumberError
-from .feistel import FeistelPermutation
+from .feistel import get_permutation
 
 
 class StatusListDef(BaseRecord):
@@ -115,13 +119,23 @@ class StatusListDef(BaseRecord):
         """Return a random entry from the status list."""
         # generate a random index
         master_key_bytes = self.list_seed.encode("utf-8")
-        feistel = FeistelPermutation(self.list_size, master_key_bytes)
+        feistel = get_permutation(self.list_size, master_key_bytes)
         random_index = feistel.permute(self.list_index)
         # calculate shard_number and shard_index
         shard_number = random_index // self.shard_size
         shard_index = random_index % self.shard_size
         return random_index, shard_number, shard_index
 
+    def get_random_entries(self, count: int) -> list:
+        """Return up to count random entries from the current list index onwards."""
+        master_key_bytes = self.list_seed.encode("utf-8")
+        feistel = get_permutation(self.list_size, master_key_bytes)
+        stop = min(self.list_index + count, self.list_size)
+        return [
+            (index, index // self.shard_size, index % self.shard_size)
+            for index in feistel.permute_many(range(self.list_index, stop))
+        ]
+
     def seed_list(self) -> str:
         """Seed the status list."""
         self.list_seed = "".join(
@@ -248,13 +262,72 @@ class StatusListDefSchema(BaseRecordSchema):
     )
 
 
+class ShardBitsCache:
+    """In-process LRU cache of decoded shard bitmaps, validated by record version."""
+
+    def __init__(self, max_size: int = 4096):
+        """Initialize a shard bitmap cache."""
+        self.max_size = max_size
+        self._entries: OrderedDict = OrderedDict()
+
+    def get(self, key: tuple, version: str, name: str) -> Optional[bitarray]:
+        """Return a mutable copy of a cached bitmap if its version is current."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != version or name not in entry[1]:
+            return None
+        self._entries.move_to_end(key)
+        return bitarray(entry[1][name])
+
+    def peek(self, key: tuple, version: str, name: str) -> Optional[frozenbitarray]:
+        """Return the cached bitmap itself, for read-only use."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != version:
+            return None
+        return entry[1].get(name)
+
+    def put(self, key: tuple, version: str, name: str, bits: bitarray) -> None:
+        """Store a frozen copy of a decoded bitmap for a shard version."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != version:
+            entry = (version, {})
+        entry[1][name] = frozenbitarray(bits)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: tuple) -> None:
+        """Drop the cached bitmaps of a shard."""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all cached bitmaps."""
+        self._entries.clear()
+
+
+SHARD_CACHE = ShardBitsCache()
+
+# Storage formats of the shard bitmaps
+SHARD_FORMAT_BASE64 = 1  # base64 of the raw bitmap bytes
+SHARD_FORMAT_DEFLATE = 2  # base64 of the deflated bitmap bytes
+SHARD_FORMAT = SHARD_FORMAT_DEFLATE
+
+# Emitted with the bitmaps of a saved shard, on commit, for the bitmap store
+SHARD_SAVED_EVENT_TOPIC = "acapy::status-list::shard-saved"
+
+
+def pack_bits(bits: bitarray) -> str:
+    """Deflate bitmap bytes; long runs of equal bits shrink to a few bytes."""
+    return bytes_to_b64(zlib.compress(bits.tobytes(), 1), True)
+
+
 class StatusListShard(BaseRecord):
     """Status List Shard."""
 
     RECORD_TOPIC = "status-list"
     RECORD_TYPE = "status-list-shard"
     RECORD_ID_NAME = "id"
-    TAG_NAMES = {"definition_id", "list_number", "shard_number"}
+    TAG_NAMES = {"definition_id", "list_number", "shard_number", "dirty"}
 
     class Meta:
         """Status List Shard Metadata."""
@@ -272,6 +345,11 @@ class StatusListShard(BaseRecord):
         status_size: int,
         status_encoded: Optional[str] = None,
         mask_encoded: Optional[str] = None,
+        status_packed: Optional[str] = None,
+        mask_packed: Optional[str] = None,
+        format_version: Optional[int] = None,
+        version: Optional[str] = None,
+        dirty: Optional[str] = None,
         **kwargs,
     ) -> None:
         """Initialize a new status list shard instance."""
@@ -283,13 +361,25 @@ class StatusListShard(BaseRecord):
         self.shard_number = shard_number
         self.shard_size = shard_size
         self.status_size = status_size
-        self.status_encoded = status_encoded
-        self.mask_encoded = mask_encoded
-
-        if self.status_encoded is None:
+        self.version = version
+        self.dirty = dirty or "false"
+
+        self._status_bits = None
+        self._status_encoded = status_encoded
+        self._status_packed = status_packed
+        self._mask_bits = None
+        self._mask_encoded = mask_encoded
+        self._mask_packed = mask_packed
+
+        # records written before format versions were introduced are base64
+        if format_version is None and status_encoded is not None:
+            format_version = SHARD_FORMAT_BASE64
+        self.format_version = format_version or SHARD_FORMAT
+
+        if status_encoded is None and status_packed is None:
             self.status_bits = bitutil.zeros(self.shard_size * self.status_size)
 
-        if self.mask_encoded is None:
+        if mask_encoded is None and mask_packed is None:
             self.mask_bits = bitutil.ones(self.shard_size)
 
     @property
@@ -300,6 +390,10 @@ class StatusListShard(BaseRecord):
     @property
     def record_value(self) -> dict:
         """Return dict representation of the record for storage."""
+        if self.format_version == SHARD_FORMAT_BASE64:
+            bitmaps = ("status_encoded", "mask_encoded")
+        else:
+            bitmaps = ("status_packed", "mask_packed", "format_version")
         return {
             prop: getattr(self, prop)
             for prop in (
@@ -308,41 +402,187 @@ class StatusListShard(BaseRecord):
                 "shard_number",
                 "shard_size",
                 "status_size",
-                "status_encoded",
-                "mask_encoded",
+                *bitmaps,
+                "version",
+                "dirty",
             )
         }
 
+    @property
+    def cache_key(self) -> tuple:
+        """Key of this shard in the shard bitmap cache."""
+        return (self.definition_id, self.list_number, self.shard_number)
+
+    def _stored_bytes(self, encoded: Optional[str], packed: Optional[str]) -> bytes:
+        """Return the raw bitmap bytes from whichever format is stored."""
+        if packed is not None:
+            return zlib.decompress(b64_to_bytes(packed, True))
+        return b64_to_bytes(encoded, True)
+
+    def _decode_bits(
+        self, name: str, encoded: Optional[str], packed: Optional[str], size: int
+    ) -> bitarray:
+        """Decode a bitmap, reusing the cached copy for the current version."""
+        if self.version:
+            bits = SHARD_CACHE.get(self.cache_key, self.version, name)
+            if bits is not None:
+                return bits
+
+        bits = bitarray()
+        bits.frombytes(self._stored_bytes(encoded, packed))
+        del bits[size:]
+
+        if self.version:
+            SHARD_CACHE.put(self.cache_key, self.version, name, bits)
+        return bits
+
+    @property
+    def status_encoded(self) -> Optional[str]:
+        """Base64 status string, re-encoded only after the bits have changed."""
+        if self._status_encoded is None:
+            self._status_encoded = bytes_to_b64(self.status_bits.tobytes(), True)
+        return self._status_encoded
+
+    @status_encoded.setter
+    def status_encoded(self, encoded: Optional[str]):
+        """Set base64 status string."""
+        self._status_encoded = encoded
+        self._status_packed = None
+        self._status_bits = None
+
+    @property
+    def status_packed(self) -> Optional[str]:
+        """Deflated status string, re-packed only after the bits have changed."""
+        if self._status_packed is None:
+            self._status_packed = pack_bits(self.status_bits)
+        return self._status_packed
+
+    @status_packed.setter
+    def status_packed(self, packed: Optional[str]):
+        """Set deflated status string."""
+        self._status_packed = packed
+        self._status_encoded = None
+        self._status_bits = None
+
+    @property
+    def mask_encoded(self) -> Optional[str]:
+        """Base64 mask string, re-encoded only after the bits have changed."""
+        if self._mask_encoded is None:
+            self._mask_encoded = bytes_to_b64(self.mask_bits.tobytes(), True)
+        return self._mask_encoded
+
+    @mask_encoded.setter
+    def mask_encoded(self, encoded: Optional[str]):
+        """Set base64 mask string."""
+        self._mask_encoded = encoded
+        self._mask_packed = None
+        self._mask_bits = None
+
+    @property
+    def mask_packed(self) -> Optional[str]:
+        """Deflated mask string, re-packed only after the bits have changed."""
+        if self._mask_packed is None:
+            self._mask_packed = pack_bits(self.mask_bits)
+        return self._mask_packed
+
+    @mask_packed.setter
+    def mask_packed(self, packed: Optional[str]):
+        """Set deflated mask string."""
+        self._mask_packed = packed
+        self._mask_encoded = None
+        self._mask_bits = None
+
     @property
     def status_bits(self) -> bitarray:
-        """Parse encoded status string to bits."""
-        status_bytes = b64_to_bytes(self.status_encoded, True)
-        status_bits = bitarray()
-        status_bits.frombytes(status_bytes)
-        while len(status_bits) > self.shard_size * self.status_size:
-            for i in range(self.status_size):
-                status_bits.pop(len(status_bits) - 1)
-        return status_bits
+        """Parse encoded status string to bits.
+
+        The decoded bits are held by the shard; assign them back after changing
+        them so that they are re-encoded on save.
+        """
+        if self._status_bits is None:
+            self._status_bits = self._decode_bits(
+                "status",
+                self._status_encoded,
+                self._status_packed,
+                self.shard_size * self.status_size,
+            )
+        return self._status_bits
 
     @status_bits.setter
     def status_bits(self, bits: bitarray):
-        """Encode status bits to a string."""
-        self.status_encoded = bytes_to_b64(bits.tobytes(), True)
+        """Set status bits, deferring encoding until the shard is saved."""
+        self._status_bits = bits
+        self._status_encoded = None
+        self._status_packed = None
+
+    def status_buffer(self):
+        """Return status bits for read-only use without copying them.
+
+        Byte-aligned shards that have not been decoded yet return the stored bytes
+        instead of a bitarray.
+        """
+        if self._status_bits is not None:
+            return self._status_bits
+        if self.version:
+            bits = SHARD_CACHE.peek(self.cache_key, self.version, "status")
+            if bits is not None:
+                return bits
+        size = self.shard_size * self.status_size
+        if size % 8 == 0:
+            raw = self._stored_bytes(self._status_encoded, self._status_packed)
+            return memoryview(raw)[: size // 8]
+        return self.status_bits
 
     @property
     def mask_bits(self) -> bitarray:
-        """Parse encoded mask string to bits."""
-        mask_bytes = b64_to_bytes(self.mask_encoded, True)
-        mask_bits = bitarray()
-        mask_bits.frombytes(mask_bytes)
-        while len(mask_bits) > self.shard_size:
-            mask_bits.pop(len(mask_bits) - 1)
-        return mask_bits
+        """Parse encoded mask string to bits.
+
+        The decoded bits are held by the shard; assign them back after changing
+        them so that they are re-encoded on save.
+        """
+        if self._mask_bits is None:
+            self._mask_bits = self._decode_bits(
+                "mask", self._mask_encoded, self._mask_packed, self.shard_size
+            )
+        return self._mask_bits
 
     @mask_bits.setter
     def mask_bits(self, bits: bitarray):
-        """Encode mask bits to a string."""
-        self.mask_encoded = bytes_to_b64(bits.tobytes(), True)
+        """Set mask bits, deferring encoding until the shard is saved."""
+        self._mask_bits = bits
+        self._mask_encoded = None
+        self._mask_packed = None
+
+    async def save(self, session: ProfileSession, **kwargs) -> str:
+        """Persist the shard under a new version and refresh the shard cache.
+
+        Shards stored in an older format are migrated to the current one. With a
+        bitmap store configured, the bitmaps are handed to it once committed.
+        """
+        self.version = uuid4().hex
+        self.format_version = SHARD_FORMAT
+        record_id = await super().save(session, **kwargs)
+        for name, bits in (("status", self._status_bits), ("mask", self._mask_bits)):
+            if bits is not None:
+                SHARD_CACHE.put(self.cache_key, self.version, name, bits)
+
+        try:
+            bitmap_path = Config.from_settings(session.profile.settings).bitmap_path
+        except ConfigError:
+            bitmap_path = None
+        if bitmap_path:
+            await session.emit_event(
+                SHARD_SAVED_EVENT_TOPIC,
+                {
+                    "definition_id": self.definition_id,
+                    "list_number": self.list_number,
+                    "shard_number": self.shard_number,
+                    "version": self.version,
+                    "status_bits": frozenbitarray(self.status_bits),
+                    "mask_bits": frozenbitarray(self.mask_bits),
+                },
+            )
+        return record_id
 
 
 class StatusListShardSchema(BaseRecordSchema):
@@ -406,6 +646,27 @@ class StatusListShardSchema(BaseRecordSchema):
             "example": "H4sIAEbCVmcC__sHAJYwB4gBAAAA",
         },
     )
+    format_version = fields.Int(
+        required=False,
+        metadata={
+            "description": "Storage format of the shard bitmaps",
+            "example": SHARD_FORMAT,
+        },
+    )
+    version = fields.Str(
+        required=False,
+        metadata={
+            "description": "Status list shard version, renewed on every save",
+            "example": "3fa85f6457174562b3fc2c963f66afa6",
+        },
+    )
+    dirty = fields.Str(
+        required=False,
+        metadata={
+            "description": "Whether statuses changed since the list was last published",
+            "example": "false",
+        },
+    )
 
 
 class StatusListCred(BaseRecord):
@@ -502,6 +763,200 @@ class StatusListCredSchema(BaseRecordSchema):
     )
 
 
+class StatusListLease(BaseRecord):
+    """Status List Index Lease."""
+
+    RECORD_TOPIC = "status-list"
+    RECORD_TYPE = "status-list-lease"
+    RECORD_ID_NAME = "id"
+    TAG_NAMES = {"definition_id", "worker_id"}
+
+    class Meta:
+        """Status List Lease Metadata."""
+
+        schema_class = "StatusListLeaseSchema"
+
+    def __init__(
+        self,
+        *,
+        id: Optional[str] = None,
+        definition_id: str = None,
+        worker_id: str = None,
+        list_number: Optional[str] = None,
+        list_seed: Optional[str] = None,
+        list_size: Optional[int] = None,
+        shard_size: Optional[int] = None,
+        start_index: Optional[int] = None,
+        end_index: Optional[int] = None,
+        expires_at: Optional[float] = None,
+        **kwargs,
+    ) -> None:
+        """Initialize a new status list lease instance."""
+
+        super().__init__(id, **kwargs)
+
+        self.definition_id = definition_id
+        self.worker_id = worker_id
+        self.list_number = list_number
+        self.list_seed = list_seed
+        self.list_size = list_size
+        self.shard_size = shard_size
+        self.start_index = start_index
+        self.end_index = end_index
+        self.expires_at = expires_at
+
+    @property
+    def id(self) -> str:
+        """Accessor for the ID associated with this record."""
+        return self._id
+
+    @property
+    def record_value(self) -> dict:
+        """Return dict representation of the record for storage."""
+        return {
+            prop: getattr(self, prop)
+            for prop in (
+                "definition_id",
+                "worker_id",
+                "list_number",
+                "list_seed",
+                "list_size",
+                "shard_size",
+                "start_index",
+                "end_index",
+                "expires_at",
+            )
+        }
+
+
+class StatusListLeaseSchema(BaseRecordSchema):
+    """Status List Lease Schema."""
+
+    class Meta:
+        """Status List Lease Schema Metadata."""
+
+        model_class = "StatusListLease"
+
+    id = fields.Str(
+        required=False,
+        metadata={"description": "Status list lease identifier"},
+    )
+    definition_id = fields.Str(
+        required=True,
+        metadata={"description": "Status list definition identifier"},
+    )
+    worker_id = fields.Str(
+        required=True,
+        metadata={"description": "Identifier of the worker holding the lease"},
+    )
+    list_number = fields.Str(
+        required=True,
+        metadata={"description": "Status list number", "example": "3"},
+    )
+    list_seed = fields.Str(
+        required=True,
+        metadata={"description": "Random seed of the leased status list"},
+    )
+    list_size = fields.Int(
+        required=True,
+        metadata={"description": "Number of entries in the list", "example": 131072},
+    )
+    shard_size = fields.Int(
+        required=True,
+        metadata={"description": "Number of entries in each shard", "example": 1024},
+    )
+    start_index = fields.Int(
+        required=True,
+        metadata={"description": "First leased list index", "example": 1000},
+    )
+    end_index = fields.Int(
+        required=True,
+        metadata={"description": "List index after the last leased one", "example": 2000},
+    )
+    expires_at = fields.Float(
+        required=True,
+        metadata={"description": "Lease expiry as unix timestamp"},
+    )
+
+
+class StatusListVersion(BaseRecord):
+    """Version of the status bits of one status list.
+
+    A new version is saved whenever status bits of the list change or its
+    definition is updated; cached status list tokens are checked against it.
+    """
+
+    RECORD_TYPE = "status-list-version"
+    RECORD_ID_NAME = "id"
+    TAG_NAMES = {"definition_id", "list_number"}
+
+    class Meta:
+        """Status List Version Metadata."""
+
+        schema_class = "StatusListVersionSchema"
+
+    def __init__(
+        self,
+        *,
+        id: Optional[str] = None,
+        definition_id: str = None,
+        list_number: str = None,
+        status_version: Optional[str] = None,
+        **kwargs,
+    ) -> None:
+        """Initialize a new status list version instance."""
+
+        super().__init__(id, **kwargs)
+
+        self.definition_id = definition_id
+        self.list_number = list_number
+        self.status_version = status_version
+
+    @staticmethod
+    def record_id(definition_id: str, list_number: str) -> str:
+        """Return the identifier of the version record of a status list."""
+        return f"{definition_id}:{list_number}"
+
+    @property
+    def id(self) -> str:
+        """Accessor for the ID associated with this record."""
+        return self._id
+
+    @property
+    def record_value(self) -> dict:
+        """Return dict representation of the record for storage."""
+        return {
+            prop: getattr(self, prop)
+            for prop in ("definition_id", "list_number", "status_version")
+        }
+
+
+class StatusListVersionSchema(BaseRecordSchema):
+    """Status List Version Schema."""
+
+    class Meta:
+        """Status List Version Schema Metadata."""
+
+        model_class = "StatusListVersion"
+
+    id = fields.Str(
+        required=False,
+        metadata={"description": "Status list version identifier"},
+    )
+    definition_id = fields.Str(
+        required=True,
+        metadata={"description": "Status list definition identifier"},
+    )
+    list_number = fields.Str(
+        required=True,
+        metadata={"description": "Status list number", "example": "3"},
+    )
+    status_version = fields.Str(
+        required=False,
+        metadata={"description": "Version of the status bits of the list"},
+    )
+
+
 class StatusListReg(BaseRecord):
     """Status List Registry."""
 
@@ -0,0 +1,110 @@
+"""Debounced background republishing of changed status lists."""
+
+import asyncio
+import logging
+import re
+from contextlib import suppress
+from typing import Dict, Set, Tuple
+
+from acapy_agent.admin.request_context import AdminRequestContext
+from acapy_agent.core.event_bus import Event
+from acapy_agent.core.profile import Profile
+from acapy_agent.storage.error import StorageNotFoundError
+
+from .config import Config, ConfigError
+from .models import StatusListDef
+from . import status_handler
+
+LOGGER = logging.getLogger(__name__)
+
+SHARD_UPDATED_EVENT_PATTERN = re.compile("^acapy::record::status-list::updated$")
+
+
+class StatusListRepublisher:
+    """Coalesce shard updates per definition and republish the affected lists."""
+
+    def __init__(self):
+        """Initialize a status list republisher."""
+        # (wallet_id, definition_id) -> list numbers changed in the current window
+        self._pending: Dict[Tuple[str, str], Set[str]] = {}
+        self._tasks: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+        # set while flushing, to end the pending windows early
+        self._flushing = asyncio.Event()
+
+    async def on_shard_updated(self, profile: Profile, event: Event):
+        """Schedule a republish of the list a shard update belongs to."""
+
+        payload = event.payload or {}
+        definition_id = payload.get("definition_id")
+        if "shard_number" in payload:
+            list_numbers = {str(payload.get("list_number"))}
+        else:
+            # batched entry events
+            list_numbers = {
+                str(entry["list_number"])
+                for entry in payload.get("entries") or []
+                if "list_number" in entry
+            }
+        if not definition_id or not list_numbers:
+            return
+
+        try:
+            config = Config.from_settings(profile.settings)
+        except ConfigError:
+            return
+        if not config.republish_window:
+            return
+
+        key = (profile.settings.get("wallet.id") or "base", definition_id)
+        self._pending.setdefault(key, set()).update(list_numbers)
+        if key not in self._tasks:
+            task = asyncio.create_task(self._republish_later(profile, key, config))
+            self._tasks[key] = task
+
+    async def _republish_later(self, profile: Profile, key: tuple, config: Config):
+        """Republish the lists changed within one window, once it has elapsed."""
+
+        try:
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._flushing.wait(), config.republish_window)
+        finally:
+            # updates from now on open a new window
+            self._tasks.pop(key, None)
+            list_numbers = self._pending.pop(key, set())
+
+        wallet_id, definition_id = key
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            try:
+                context = AdminRequestContext(
+                    profile,
+                    metadata={"wallet_id": wallet_id} if wallet_id != "base" else None,
+                )
+                async with profile.session() as session:
+                    definition = await StatusListDef.retrieve_by_id(
+                        session, definition_id
+                    )
+                published = await status_handler.publish_status_lists(
+                    context,
+                    definition,
+                    list_numbers=sorted(list_numbers),
+                    concurrency=config.republish_concurrency,
+                )
+                LOGGER.debug(
+                    f"Republished {len(published)} status lists of {definition_id}."
+                )
+            except StorageNotFoundError:
+                LOGGER.debug(f"Status list definition {definition_id} was deleted.")
+            except Exception:
+                LOGGER.exception(f"Failed to republish status lists of {definition_id}.")
+
+    async def flush(self):
+        """Republish the pending lists now, without waiting for their windows."""
+        self._flushing.set()
+        try:
+            await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        finally:
+            self._flushing.clear()
+
+
+REPUBLISHER = StatusListRepublisher()
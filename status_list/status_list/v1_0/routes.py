@@ -7,6 +7,7 @@ from aiohttp import web
 from .controllers.status_list_cred import (
     get_status_list_cred,
     update_status_list_cred,
+    update_status_list_creds,
     bind_status_list_cred,
 )
 from .controllers.status_list_def import (
@@ -16,8 +17,15 @@ from .controllers.status_list_def import (
     update_status_list_def,
     delete_status_list_def,
 )
-from .controllers.status_list_shard import get_status_list, assign_status_list_entry
+from .controllers.status_list_shard import (
+    get_status_list,
+    assign_status_list_entry,
+    reserve_status_list_entries,
+    migrate_status_list_shards,
+    transition_status_list_entries,
+)
 from .controllers.status_list_pub import publish_status_list
+from .controllers.status_list_metrics import get_status_list_metrics
 
 
 LOGGER = logging.getLogger(__name__)
@@ -43,6 +51,10 @@ async def register(app: web.Application):
                 "/status-list/defs/{def_id}/creds/{cred_id}",
                 update_status_list_cred,
             ),
+            web.patch(
+                "/status-list/defs/{def_id}/creds",
+                update_status_list_creds,
+            ),
             #
             # status list definitions
             #
@@ -72,6 +84,14 @@ async def register(app: web.Application):
                 "/status-list/defs/{def_id}/entries",
                 assign_status_list_entry,
             ),
+            web.post(
+                "/status-list/defs/{def_id}/entries/bulk",
+                reserve_status_list_entries,
+            ),
+            web.patch(
+                "/status-list/defs/{def_id}/entries",
+                transition_status_list_entries,
+            ),
             #
             # status list shards
             #
@@ -80,10 +100,22 @@ async def register(app: web.Application):
                 get_status_list,
                 allow_head=False,
             ),
+            web.post(
+                "/status-list/defs/{def_id}/shards/migrate",
+                migrate_status_list_shards,
+            ),
             #
             # status list publish
             #
             web.put("/status-list/defs/{def_id}/publish", publish_status_list),
+            #
+            # status list metrics
+            #
+            web.get(
+                "/status-list/metrics",
+                get_status_list_metrics,
+                allow_head=False,
+            ),
         ]
     )
 
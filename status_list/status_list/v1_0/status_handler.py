@@ -1,55 +1,185 @@
 """Status handler."""
 
+import asyncio
 import logging
-import gzip
+import hashlib
+import json
 import math
 import os
 import time
 import tempfile
+import zlib
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from functools import wraps
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 from types import SimpleNamespace
 from datetime import datetime, timedelta, timezone
 from bitarray import bitarray
 from filelock import FileLock, Timeout
 from pathlib import Path
+from uuid import uuid4
 
 from acapy_agent.admin.request_context import AdminRequestContext
-from acapy_agent.core.profile import ProfileSession
+from acapy_agent.core.profile import Profile, ProfileSession
 from acapy_agent.storage.error import StorageNotFoundError
 from acapy_agent.wallet.util import bytes_to_b64
 
+from . import metrics
+from .bitmap_store import BITMAP_STORE
 from .config import Config
 from .error import StatusListError
-from .models import StatusListDef, StatusListShard, StatusListCred, StatusListReg
+from .events import EVENT_BATCHER
+from .feistel import get_permutation
+from .models import (
+    SHARD_FORMAT,
+    StatusListDef,
+    StatusListShard,
+    StatusListCred,
+    StatusListLease,
+    StatusListReg,
+    StatusListVersion,
+)
 from .jwt import jwt_sign
 
 LOGGER = logging.getLogger(__name__)
 
+# Seconds a status list token may be cached before a fresh copy is fetched
+STATUS_LIST_TTL = 43200
 
-def with_retries(max_attempts=3, delay=2):
-    """Decorator to retry a function."""
+# (wallet_id, definition_id, list_number) -> (definition fingerprint, content hash)
+PUBLISHED_LISTS: Dict[Tuple[str, str, str], Tuple[str, str]] = {}
+
+
+@dataclass
+class StatusListToken:
+    """Signed status list token with its HTTP caching metadata."""
+
+    definition_id: str
+    list_number: str
+    # version of the status bits the token was rendered from
+    status_version: str
+    token: str
+    etag: str
+    expires_at: float
+
+    @property
+    def max_age(self) -> int:
+        """Seconds left before the token should be rendered again."""
+        return max(int(self.expires_at - time.monotonic()), 0)
+
+
+# (definition_id, list_number) -> signed status list token
+STATUS_LIST_TOKENS: Dict[Tuple[str, str], StatusListToken] = {}
+
+# (wallet_id, list_number) -> definition_id
+LIST_DEFINITIONS: Dict[Tuple[str, str], str] = {}
+
+
+@dataclass(frozen=True)
+class EntryLocation:
+    """Location of the status entry assigned to a credential."""
+
+    list_number: str
+    list_index: int
+    shard_number: int
+    shard_index: int
+    status_size: int
+
+
+class CredentialIndex:
+    """In-process LRU index from credential identifier to status entry location."""
+
+    def __init__(self, max_size: int = 100_000):
+        """Initialize a credential index."""
+        self.max_size = max_size
+        self._entries: OrderedDict = OrderedDict()
+
+    def get(self, definition_id: str, credential_id: str) -> Optional[EntryLocation]:
+        """Return the location of a credential entry if it is indexed."""
+        location = self._entries.get((definition_id, credential_id))
+        if location is not None:
+            self._entries.move_to_end((definition_id, credential_id))
+        return location
+
+    def put(self, definition_id: str, credential_id: str, location: EntryLocation):
+        """Index the location of a credential entry."""
+        self._entries[(definition_id, credential_id)] = location
+        self._entries.move_to_end((definition_id, credential_id))
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def forget(self, definition_id: str, credential_id: Optional[str] = None):
+        """Drop the indexed entries of a credential, or of a whole definition."""
+        if credential_id is not None:
+            self._entries.pop((definition_id, credential_id), None)
+            return
+        for key in [key for key in self._entries if key[0] == definition_id]:
+            del self._entries[key]
+
+    def clear(self):
+        """Drop all indexed entries."""
+        self._entries.clear()
+
+
+CREDENTIAL_INDEX = CredentialIndex()
+
+# definition_id -> background task provisioning its spare list
+SPARE_LIST_TASKS: Dict[str, asyncio.Task] = {}
+
+# Identifies the index leases of this process unless a worker id is configured
+WORKER_ID = uuid4().hex
+
+
+@dataclass
+class IndexLease:
+    """Block of list indexes leased by this process."""
+
+    record_id: str
+    list_number: str
+    shard_size: int
+    entries: deque
+    expires_at: float
+
+    def usable(self, lease_ttl: int) -> bool:
+        """Whether entries can still be handed out before the lease expires."""
+        return bool(self.entries) and time.time() < self.expires_at - lease_ttl / 10
+
+
+# definition_id -> index lease held by this process
+INDEX_LEASES: Dict[str, IndexLease] = {}
+LEASE_LOCKS: Dict[str, asyncio.Lock] = {}
+
+# Bounded pool for the blocking file writes of published status lists
+PUBLISH_CONCURRENCY = 4
+FILE_WRITE_EXECUTOR = ThreadPoolExecutor(
+    max_workers=PUBLISH_CONCURRENCY, thread_name_prefix="status-list-writer"
+)
+
+
+def with_async_retries(max_attempts=3, delay=2):
+    """Decorator to retry a coroutine function with exponential backoff."""
 
     def decorator(func):
         @wraps(func)
-        def wrapper(*args, **kwargs):
+        async def wrapper(*args, **kwargs):
             for attempt in range(1, max_attempts + 1):
                 try:
-                    return func(*args, **kwargs)
+                    return await func(*args, **kwargs)
                 except Exception as e:
                     LOGGER.warning(f"Attempt {attempt} failed with error: {e}")
                     if attempt == max_attempts:
                         raise
-                    time.sleep(delay)
+                    await asyncio.sleep(delay * 2 ** (attempt - 1))
 
         return wrapper
 
     return decorator
 
 
-@with_retries(max_attempts=3, delay=2)
-def write_to_file(path: str, data: bytes) -> None:
-    """Write data to a local file atomically."""
+def write_file_atomic(path: str, data: bytes) -> None:
+    """Write data to a temporary file and rename it over the target under a lock."""
 
     full_path = Path(path).resolve()
     try:
@@ -89,6 +219,14 @@ def write_to_file(path: str, data: bytes) -> None:
         raise
 
 
+@with_async_retries(max_attempts=3, delay=2)
+async def write_to_file_async(path: str, data: bytes) -> None:
+    """Write data to a local file atomically without blocking the event loop."""
+
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(FILE_WRITE_EXECUTOR, write_file_atomic, path, data)
+
+
 def get_wallet_id(context: AdminRequestContext):
     """Get wallet id."""
 
@@ -127,108 +265,484 @@ async def create_next_status_list(session: ProfileSession, definition: StatusLis
             status_size=definition.status_size,
         )
         await shard.save(session, reason="Create new status list.")
+    await bump_status_list_version(session, definition.id, definition.next_list_number)
 
 
-async def generate_random_index(context: AdminRequestContext, definition_id: str):
-    """Generate random index."""
+async def get_status_list_version(
+    session: ProfileSession, definition_id: str, list_number: str
+) -> str:
+    """Return the version of the status bits of a status list."""
+
+    try:
+        record = await StatusListVersion.retrieve_by_id(
+            session, StatusListVersion.record_id(definition_id, list_number)
+        )
+    except StorageNotFoundError:
+        # lists created before versions were recorded, until first updated
+        return ""
+    return record.status_version
+
+
+async def bump_status_list_version(
+    session: ProfileSession, definition_id: str, list_number: str
+) -> str:
+    """Record a new version of the status bits of a status list."""
+
+    record_id = StatusListVersion.record_id(definition_id, list_number)
+    try:
+        record = await StatusListVersion.retrieve_by_id(session, record_id)
+    except StorageNotFoundError:
+        record = StatusListVersion(
+            id=record_id,
+            definition_id=definition_id,
+            list_number=list_number,
+            new_with_id=True,
+        )
+    record.status_version = uuid4().hex
+    await record.save(session, reason="Status list bits changed.")
+    return record.status_version
+
+
+async def create_spare_list(
+    txn: ProfileSession, wallet_id: str, definition: StatusListDef
+) -> None:
+    """Create a spare status list and make it the definition's next list."""
+
+    definition.next_list_number = await assign_status_list_number(txn, wallet_id)
+    definition.add_list_number(definition.next_list_number)
+    await create_next_status_list(txn, definition)
+
+
+async def rotate_status_list(
+    context: AdminRequestContext,
+    txn: ProfileSession,
+    definition: StatusListDef,
+) -> None:
+    """Switch a locked definition to its spare list once the current one is full."""
+
+    config = Config.from_settings(context.profile.settings)
+    wallet_id = get_wallet_id(context)
+
+    if definition.list_index >= definition.list_size:
+        metrics.ROLLOVERS.inc()
+        if config.spare_threshold and (
+            definition.list_number == definition.next_list_number
+        ):
+            # spare list was not provisioned in time
+            await create_spare_list(txn, wallet_id, definition)
+        definition.list_number = definition.next_list_number
+        definition.list_index = 0
+        definition.seed_list()
+
+    # create a spare list, unless it is provisioned in the background
+    if (
+        not config.spare_threshold
+        and definition.list_number == definition.next_list_number
+    ):
+        await create_spare_list(txn, wallet_id, definition)
+
+
+async def advance_list_index(
+    context: AdminRequestContext,
+    txn: ProfileSession,
+    definition: StatusListDef,
+    count: int = 1,
+) -> list:
+    """Take the next random entries from a locked definition and advance its index."""
+
+    entries = []
+    while len(entries) < count:
+        list_number = definition.list_number
+        random_entries = definition.get_random_entries(count - len(entries))
+        entries.extend((list_number, *entry) for entry in random_entries)
+
+        # increment list index
+        definition.list_index += len(random_entries)
+        await rotate_status_list(context, txn, definition)
+
+    return entries
+
+
+async def provision_spare_list(profile: Profile, wallet_id: str, definition_id: str):
+    """Create a spare status list outside of the assignment path."""
+
+    try:
+        async with profile.session() as session:
+            definition = await StatusListDef.retrieve_by_id(session, definition_id)
+        if definition.list_number != definition.next_list_number:
+            return
+
+        # reserve a list number and write its shards without the definition lock
+        async with profile.transaction() as txn:
+            list_number = await assign_status_list_number(txn, wallet_id)
+            await txn.commit()
+        async with profile.transaction() as txn:
+            definition.next_list_number = list_number
+            await create_next_status_list(txn, definition)
+            await txn.commit()
+
+        # only switch the spare list pointer under the definition lock
+        async with profile.transaction() as txn:
+            definition = await StatusListDef.retrieve_by_id(
+                txn, definition_id, for_update=True
+            )
+            if definition.list_number == definition.next_list_number:
+                definition.next_list_number = list_number
+                definition.add_list_number(list_number)
+                await definition.save(txn, reason="Provision spare status list.")
+                await txn.commit()
+                LOGGER.debug(f"Provisioned spare list {list_number} for {definition_id}.")
+                return
+
+        # another worker provisioned a spare list first, drop this one
+        async with profile.transaction() as txn:
+            tag_filter = {"definition_id": definition_id, "list_number": list_number}
+            for shard in await StatusListShard.query(txn, tag_filter):
+                await shard.delete_record(txn)
+            await txn.commit()
+
+    except Exception as err:
+        LOGGER.error(f"Failed to provision spare list for {definition_id}: {err}")
+
+
+def schedule_spare_list(context: AdminRequestContext, definition: StatusListDef):
+    """Provision a spare list in the background once utilization passes threshold."""
+
+    config = Config.from_settings(context.profile.settings)
+    if (
+        not config.spare_threshold
+        or definition.list_number != definition.next_list_number
+        or definition.list_index < config.spare_threshold * definition.list_size
+        or definition.id in SPARE_LIST_TASKS
+    ):
+        return
+
+    definition_id = definition.id
+    task = asyncio.ensure_future(
+        provision_spare_list(context.profile, get_wallet_id(context), definition_id)
+    )
+    SPARE_LIST_TASKS[definition_id] = task
+    task.add_done_callback(lambda _: SPARE_LIST_TASKS.pop(definition_id, None))
+
+
+async def unassigned_lease_entries(txn: ProfileSession, lease: StatusListLease) -> deque:
+    """Permute a reclaimed lease range, dropping entries that were already assigned."""
+
+    feistel = get_permutation(lease.list_size, lease.list_seed.encode("utf-8"))
+    random_indexes = feistel.permute_many(range(lease.start_index, lease.end_index))
+
+    tag_filter = {"definition_id": lease.definition_id, "list_number": lease.list_number}
+    shards = {
+        int(shard.shard_number): shard
+        for shard in await StatusListShard.query(txn, tag_filter)
+    }
+    return deque(
+        random_index
+        for random_index in random_indexes
+        if shards[random_index // lease.shard_size].mask_bits[
+            random_index % lease.shard_size
+        ]
+    )
+
+
+async def acquire_index_lease(
+    context: AdminRequestContext, definition_id: str
+) -> IndexLease:
+    """Lease a block of list indexes to this worker in one locked update."""
 
+    config = Config.from_settings(context.profile.settings)
+    worker_id = config.worker_id or WORKER_ID
+    previous = INDEX_LEASES.pop(definition_id, None)
+
+    # renew a lease that still has entries, or release an exhausted one
+    if previous:
+        async with context.profile.transaction() as txn:
+            try:
+                record = await StatusListLease.retrieve_by_id(
+                    txn, previous.record_id, for_update=True
+                )
+            except StorageNotFoundError:
+                record = None
+            if record and record.worker_id == worker_id:
+                if previous.entries:
+                    previous.expires_at = record.expires_at = (
+                        time.time() + config.lease_ttl
+                    )
+                    await record.save(txn, reason="Renew status list lease.")
+                    await txn.commit()
+                    INDEX_LEASES[definition_id] = previous
+                    return previous
+                await record.delete_record(txn)
+                await txn.commit()
+
+    lock_start = time.perf_counter()
     async with context.profile.transaction() as txn:
-        # generate a random index
         definition = await StatusListDef.retrieve_by_id(
             txn, definition_id, for_update=True
         )
-        random_index, shard_number, shard_index = definition.get_random_entry()
+        now = time.time()
+        expires_at = now + config.lease_ttl
+        held = {lease.record_id for lease in INDEX_LEASES.values()}
+
+        # reclaim a lease of a stopped worker
+        entries = None
+        records = await StatusListLease.query(txn, {"definition_id": definition_id})
+        for record in records:
+            if record.expires_at > now and (
+                record.worker_id != worker_id or record.id in held
+            ):
+                continue
+            entries = await unassigned_lease_entries(txn, record)
+            if not entries:
+                await record.delete_record(txn)
+                continue
+            record.worker_id = worker_id
+            record.expires_at = expires_at
+            await record.save(txn, reason="Reclaim status list lease.")
+            break
 
-        # increment list index
-        definition.list_index += 1
-        if definition.list_index >= definition.list_size:
-            definition.list_number = definition.next_list_number
-            definition.list_index = 0
-            definition.seed_list()
-
-        # create a spare list
-        if definition.list_number == definition.next_list_number:
-            wallet_id = get_wallet_id(context)
-            definition.next_list_number = await assign_status_list_number(txn, wallet_id)
-            definition.add_list_number(definition.next_list_number)
-            await create_next_status_list(txn, definition)
+        # or lease the next block of list indexes
+        if not entries:
+            record = StatusListLease(
+                definition_id=definition_id,
+                worker_id=worker_id,
+                list_number=definition.list_number,
+                list_seed=definition.list_seed,
+                list_size=definition.list_size,
+                shard_size=definition.shard_size,
+                start_index=definition.list_index,
+                end_index=min(
+                    definition.list_index + config.lease_size, definition.list_size
+                ),
+                expires_at=expires_at,
+            )
+            feistel = get_permutation(record.list_size, record.list_seed.encode("utf-8"))
+            entries = deque(
+                feistel.permute_many(range(record.start_index, record.end_index))
+            )
+            await record.save(txn, reason="Lease status list indexes.")
+
+            definition.list_index = record.end_index
+            await rotate_status_list(context, txn, definition)
+            await definition.save(txn, reason="Lease status list indexes.")
 
-        # save and commit
-        await definition.save(txn, reason="Increment list index.")
         await txn.commit()
+    metrics.DEFINITION_LOCK_SECONDS.observe(time.perf_counter() - lock_start)
+
+    schedule_spare_list(context, definition)
+
+    lease = IndexLease(
+        record_id=record.id,
+        list_number=record.list_number,
+        shard_size=record.shard_size,
+        entries=entries,
+        expires_at=expires_at,
+    )
+    INDEX_LEASES[definition_id] = lease
+    LOGGER.debug(f"Leased {len(entries)} status list entries of {definition_id}.")
+
+    return lease
+
+
+async def next_random_entry(context: AdminRequestContext, definition_id: str):
+    """Return the next entry to assign, taken from this worker's lease if enabled."""
+
+    config = Config.from_settings(context.profile.settings)
+    if not config.lease_size:
+        with metrics.DEFINITION_LOCK_SECONDS.time():
+            async with context.profile.transaction() as txn:
+                # generate a random index
+                definition = await StatusListDef.retrieve_by_id(
+                    txn, definition_id, for_update=True
+                )
+                entries = await advance_list_index(context, txn, definition)
 
-        return random_index, shard_number, shard_index
+                # save and commit
+                await definition.save(txn, reason="Increment list index.")
+                await txn.commit()
+        schedule_spare_list(context, definition)
+        return entries[0]
+
+    lease = INDEX_LEASES.get(definition_id)
+    if not lease or not lease.usable(config.lease_ttl):
+        async with LEASE_LOCKS.setdefault(definition_id, asyncio.Lock()):
+            lease = INDEX_LEASES.get(definition_id)
+            if not lease or not lease.usable(config.lease_ttl):
+                lease = await acquire_index_lease(context, definition_id)
+
+    random_index = lease.entries.popleft()
+    shard_number = random_index // lease.shard_size
+    shard_index = random_index % lease.shard_size
+    return lease.list_number, random_index, shard_number, shard_index
+
+
+async def generate_random_index(context: AdminRequestContext, definition_id: str):
+    """Generate random index."""
+
+    _, random_index, shard_number, shard_index = await next_random_entry(
+        context, definition_id
+    )
+    return random_index, shard_number, shard_index
 
 
 async def assign_random_entry(context: AdminRequestContext, definition_id: str):
     """Assign a random status list entry."""
 
-    random_index, shard_number, shard_index = await generate_random_index(
+    list_number, random_index, shard_number, shard_index = await next_random_entry(
         context, definition_id
     )
 
-    async with context.profile.transaction() as txn:
-        definition = await StatusListDef.retrieve_by_id(txn, definition_id)
-
-        tag_filter = {
-            "definition_id": definition.id,
-            "list_number": definition.list_number,
-            "shard_number": str(shard_number),
-        }
-        # lock shard and assign an entry
-        shard = await StatusListShard.retrieve_by_tag_filter(
-            txn, tag_filter, for_update=True
-        )
+    with metrics.SHARD_LOCK_SECONDS.time():
+        async with context.profile.transaction() as txn:
+            tag_filter = {
+                "definition_id": definition_id,
+                "list_number": list_number,
+                "shard_number": str(shard_number),
+            }
+            # lock shard and assign an entry
+            shard = await StatusListShard.retrieve_by_tag_filter(
+                txn, tag_filter, for_update=True
+            )
 
-        # retun None if entry is assigned
-        if not shard.mask_bits[shard_index]:
-            LOGGER.error(
-                (
-                    f"Entry is already assigned at "
-                    f"list={definition.list_number}, "
-                    f"entry={definition.list_index}, "
-                    f"shard={shard_number}, "
-                    f"index={shard_index}"
+            # retun None if entry is assigned
+            if not shard.mask_bits[shard_index]:
+                LOGGER.error(
+                    (
+                        f"Entry is already assigned at "
+                        f"list={list_number}, "
+                        f"entry={random_index}, "
+                        f"shard={shard_number}, "
+                        f"index={shard_index}"
+                    )
                 )
-            )
-            return None
+                return None
 
-        # mark entry as assigned
-        mask_bits = shard.mask_bits
-        mask_bits[shard_index] = False
-        shard.mask_bits = mask_bits
-        await shard.save(txn, reason="Assign a status entry")
+            # mark entry as assigned
+            mask_bits = shard.mask_bits
+            mask_bits[shard_index] = False
+            shard.mask_bits = mask_bits
+            await shard.save(txn, reason="Assign a status entry")
 
-        # commmit all changes
-        await txn.commit()
+            # commmit all changes
+            await txn.commit()
 
-        # return status list entry
-        result = {
-            "list_number": definition.list_number,
-            "list_index": random_index,
-            "status": shard.status_bits[
-                shard_index : shard_index + definition.status_size
-            ].to01(),
-            "assigned": not shard.mask_bits[shard_index],
-        }
-        LOGGER.debug(f"Assigned status list entry: {result}")
+            # return status list entry
+            bit_index = shard_index * shard.status_size
+            result = {
+                "list_number": list_number,
+                "list_index": random_index,
+                "status": shard.status_bits[
+                    bit_index : bit_index + shard.status_size
+                ].to01(),
+                "assigned": not shard.mask_bits[shard_index],
+            }
+            LOGGER.debug(f"Assigned status list entry: {result}")
 
-        return result
+            return result
 
 
 async def assign_status_list_entry(context: AdminRequestContext, definition_id: str):
     """Assign available status list entry."""
 
     retries = 10
-    for i in range(retries):
-        if entry := await assign_random_entry(context, definition_id):
-            break
-        if i >= retries - 1:
+    with metrics.ASSIGN_SECONDS.time():
+        for i in range(retries):
+            if entry := await assign_random_entry(context, definition_id):
+                break
+            if i >= retries - 1:
+                raise StatusListError(
+                    f"Error in obtaining status list entry after {retries} retries."
+                )
+            metrics.ASSIGN_RETRIES.inc()
+
+    return entry
+
+
+async def reserve_status_list_entries(
+    context: AdminRequestContext, definition_id: str, count: int
+) -> list:
+    """Reserve a batch of status list entries in a single transaction."""
+
+    if count <= 0:
+        raise StatusListError("Number of entries to reserve must be positive.")
+
+    entries = []
+    async with context.profile.transaction() as txn:
+        # lock definition once for the whole batch
+        definition = await StatusListDef.retrieve_by_id(
+            txn, definition_id, for_update=True
+        )
+        status_size = definition.status_size
+
+        retries = 10
+        for _ in range(retries):
+            # walk the feistel sequence and group entries by shard
+            shard_entries = {}
+            for (
+                list_number,
+                random_index,
+                shard_number,
+                shard_index,
+            ) in await advance_list_index(context, txn, definition, count - len(entries)):
+                shard_entries.setdefault((list_number, shard_number), []).append(
+                    (random_index, shard_index)
+                )
+
+            # lock each shard once and mark its entries as assigned
+            for (list_number, shard_number), positions in sorted(
+                shard_entries.items(), key=lambda item: (int(item[0][0]), item[0][1])
+            ):
+                tag_filter = {
+                    "definition_id": definition.id,
+                    "list_number": list_number,
+                    "shard_number": str(shard_number),
+                }
+                shard = await StatusListShard.retrieve_by_tag_filter(
+                    txn, tag_filter, for_update=True
+                )
+                mask_bits = shard.mask_bits
+                status_bits = shard.status_bits
+                for random_index, shard_index in positions:
+                    if not mask_bits[shard_index]:
+                        LOGGER.warning(
+                            (
+                                f"Entry is already assigned at "
+                                f"list={list_number}, "
+                                f"shard={shard_number}, "
+                                f"index={shard_index}"
+                            )
+                        )
+                        continue
+                    mask_bits[shard_index] = False
+                    bit_index = shard_index * status_size
+                    entries.append(
+                        {
+                            "list_number": list_number,
+                            "list_index": random_index,
+                            "status": status_bits[
+                                bit_index : bit_index + status_size
+                            ].to01(),
+                            "assigned": True,
+                        }
+                    )
+                shard.mask_bits = mask_bits
+                await shard.save(txn, reason="Assign status entries")
+
+            if len(entries) >= count:
+                break
+        else:
             raise StatusListError(
-                f"Error in obtaining status list entry after {retries} retries."
+                f"Error in reserving {count} status list entries after {retries} retries."
             )
 
-    return entry
+        # save and commit
+        await definition.save(txn, reason="Increment list index.")
+        await txn.commit()
+    schedule_spare_list(context, definition)
+
+    LOGGER.debug(f"Reserved {len(entries)} status list entries for {definition_id}.")
+
+    return entries
 
 
 async def assign_status_entries(
@@ -238,18 +752,24 @@ async def assign_status_entries(
 ):
     """Create a credential status."""
 
-    status_list = []
     config = Config.from_settings(context.profile.settings)
+    wallet_id = get_wallet_id(context)
     async with context.profile.session() as session:
         definitions = await StatusListDef.query(
             session, {"supported_cred_id": supported_cred_id}
         )
-        if not definitions or len(definitions) == 0:
-            return None
+    if not definitions or len(definitions) == 0:
+        return None
+
+    # assign an entry of every definition concurrently, in separate transactions
+    entries = await asyncio.gather(
+        *(assign_status_list_entry(context, definition.id) for definition in definitions)
+    )
 
-        for definition in definitions:
-            wallet_id = get_wallet_id(context)
-            entry = await assign_status_list_entry(context, definition.id)
+    status_list = []
+    status_list_creds = []
+    async with context.profile.transaction() as txn:
+        for definition, entry in zip(definitions, entries):
             entry = SimpleNamespace(**entry)
             public_uri = config.public_uri.format(
                 tenant_id=wallet_id,
@@ -281,14 +801,36 @@ async def assign_status_entries(
                 list_index=entry.list_index,
             )
             await status_list_cred.save(
-                session, reason="Assign a new status list credential entry", event=False
+                txn, reason="Assign a new status list credential entry", event=False
             )
+            status_list_creds.append((definition, status_list_cred, entry))
+
+        # Emit events, delivered once the records are committed
+        if not config.event_batch_size:
+            for _, status_list_cred, entry in status_list_creds:
+                payload = status_list_cred.serialize()
+                payload["state"] = "assigned"
+                payload["status"] = entry.status
+                await status_list_cred.emit_event(txn, payload)
+
+        await txn.commit()
 
-            # Emit event
-            payload = status_list_cred.serialize()
-            payload["state"] = "assigned"
-            payload["status"] = entry.status
-            await status_list_cred.emit_event(session, payload)
+    for definition, _, entry in status_list_creds:
+        CREDENTIAL_INDEX.put(
+            definition.id,
+            credential_id,
+            entry_location(definition, entry.list_number, entry.list_index),
+        )
+        if config.event_batch_size:
+            event = {
+                "credential_id": credential_id,
+                "list_number": entry.list_number,
+                "list_index": entry.list_index,
+                "status": entry.status,
+            }
+            await EVENT_BATCHER.add(
+                context.profile, definition.id, "assigned", [event], config
+            )
 
     if len(status_list) > 1:
         return status_list
@@ -296,36 +838,157 @@ async def assign_status_entries(
         return status_list[0]
 
 
+async def update_status_list_entries(
+    context: AdminRequestContext, definition_id: str, updates: Dict[str, str]
+) -> dict:
+    """Update status list entries of many credentials, one shard at a time."""
+
+    async with context.profile.session() as session:
+        definition = await StatusListDef.retrieve_by_id(session, definition_id)
+
+        # resolve credential entries from the index, then in chunks of tag queries
+        credential_ids = list(updates)
+        locations = {}
+        for credential_id in credential_ids:
+            location = CREDENTIAL_INDEX.get(definition_id, credential_id)
+            if location is not None:
+                locations[credential_id] = location
+        unindexed = [cred_id for cred_id in credential_ids if cred_id not in locations]
+        for i in range(0, len(unindexed), 500):
+            tag_filter = {
+                "definition_id": definition_id,
+                "credential_id": {"$in": unindexed[i : i + 500]},
+            }
+            for record in await StatusListCred.query(session, tag_filter):
+                location = entry_location(
+                    definition, record.list_number, record.list_index
+                )
+                CREDENTIAL_INDEX.put(definition_id, record.credential_id, location)
+                locations[record.credential_id] = location
+
+    # group entries by shard
+    shard_entries = {}
+    for credential_id, location in locations.items():
+        bitstring = updates[credential_id]
+        if len(bitstring) != definition.status_size:
+            raise StatusListError(
+                f"Status of {credential_id} must be {definition.status_size} bit(s) long."
+            )
+        shard_entries.setdefault(
+            (location.list_number, location.shard_number), []
+        ).append((credential_id, location.list_index, location.shard_index))
+
+    updated = []
+    for (list_number, shard_number), entries in sorted(
+        shard_entries.items(), key=lambda item: (int(item[0][0]), item[0][1])
+    ):
+        async with context.profile.transaction() as txn:
+            tag_filter = {
+                "definition_id": definition_id,
+                "list_number": str(list_number),
+                "shard_number": str(shard_number),
+            }
+            shard = await StatusListShard.retrieve_by_tag_filter(
+                txn, tag_filter, for_update=True
+            )
+            status_bits = shard.status_bits
+            mask_bits = shard.mask_bits
+            shard_updates = []
+            for credential_id, entry_index, shard_index in entries:
+                bit_index = shard_index * definition.status_size
+                bitstring = updates[credential_id]
+                status_bits[bit_index : bit_index + definition.status_size] = bitarray(
+                    bitstring
+                )
+                shard_updates.append(
+                    {
+                        "credential_id": credential_id,
+                        "list": list_number,
+                        "index": entry_index,
+                        "status": bitstring,
+                        "assigned": not mask_bits[shard_index],
+                    }
+                )
+            shard.status_bits = status_bits
+            shard.dirty = "true"
+            await shard.save(txn, reason="Update status list entries.")
+            await bump_status_list_version(txn, definition_id, str(list_number))
+
+            # Emit one event per shard
+            shard.state = "updated"
+            payload = shard.serialize()
+            payload["entries"] = [
+                {
+                    "credential_id": entry["credential_id"],
+                    "list_index": entry["index"],
+                    "status": entry["status"],
+                }
+                for entry in shard_updates
+            ]
+            await shard.emit_event(txn, payload)
+
+            await txn.commit()
+            invalidate_status_list_tokens(definition_id, str(list_number))
+
+        updated.extend(shard_updates)
+
+    return {
+        "updated": updated,
+        "not_found": [cred_id for cred_id in credential_ids if cred_id not in locations],
+    }
+
+
+def entry_location(
+    definition: StatusListDef, list_number: str, list_index: int
+) -> EntryLocation:
+    """Compute the location of a status entry in the shards of a definition."""
+
+    list_index = int(list_index)
+    return EntryLocation(
+        list_number=str(list_number),
+        list_index=list_index,
+        shard_number=list_index // definition.shard_size,
+        shard_index=list_index % definition.shard_size,
+        status_size=definition.status_size,
+    )
+
+
+async def locate_status_list_entry(
+    session: ProfileSession, definition_id: str, credential_id: str
+) -> EntryLocation:
+    """Locate the status entry of a credential, using the credential index."""
+
+    location = CREDENTIAL_INDEX.get(definition_id, credential_id)
+    if location is None:
+        tag_filter = {
+            "definition_id": definition_id,
+            "credential_id": credential_id,
+        }
+        record = await StatusListCred.retrieve_by_tag_filter(session, tag_filter)
+        definition = await StatusListDef.retrieve_by_id(session, definition_id)
+        location = entry_location(definition, record.list_number, record.list_index)
+        CREDENTIAL_INDEX.put(definition_id, credential_id, location)
+    return location
+
+
 async def get_status_list_entry(
     session: ProfileSession, definition_id: str, credential_id: str
 ):
     """Get status list entry."""
 
+    location = await locate_status_list_entry(session, definition_id, credential_id)
     tag_filter = {
         "definition_id": definition_id,
-        "credential_id": credential_id,
-    }
-    record = await StatusListCred.retrieve_by_tag_filter(session, tag_filter)
-    list_number = record.list_number
-    entry_index = record.list_index
-
-    definition = await StatusListDef.retrieve_by_id(session, definition_id)
-    shard_number = entry_index // definition.shard_size
-    shard_index = entry_index % definition.shard_size
-    tag_filter = {
-        "definition_id": definition_id,
-        "list_number": str(list_number),
-        "shard_number": str(shard_number),
+        "list_number": location.list_number,
+        "shard_number": str(location.shard_number),
     }
     shard = await StatusListShard.retrieve_by_tag_filter(session, tag_filter)
-    bit_index = shard_index * definition.status_size
+    bit_index = location.shard_index * location.status_size
     return {
-        "list": definition.list_number,
-        "index": entry_index,
-        "status": shard.status_bits[
-            bit_index : bit_index + definition.status_size
-        ].to01(),
-        "assigned": not shard.mask_bits[shard_index],
+        "list": location.list_number,
+        "index": location.list_index,
+        "status": shard.status_bits[bit_index : bit_index + location.status_size].to01(),
+        "assigned": not shard.mask_bits[location.shard_index],
     }
 
 
@@ -334,162 +997,527 @@ async def update_status_list_entry(
 ):
     """Update status list entry by list number and entry index."""
 
-    tag_filter = {
-        "definition_id": definition_id,
-        "credential_id": credential_id,
-    }
-    record = await StatusListCred.retrieve_by_tag_filter(session, tag_filter)
-    list_number = record.list_number
-    entry_index = record.list_index
+    config = Config.from_settings(session.profile.settings)
 
-    definition = await StatusListDef.retrieve_by_id(session, definition_id)
-    shard_number = entry_index // definition.shard_size
-    shard_index = entry_index % definition.shard_size
+    location = await locate_status_list_entry(session, definition_id, credential_id)
     tag_filter = {
         "definition_id": definition_id,
-        "list_number": str(list_number),
-        "shard_number": str(shard_number),
+        "list_number": location.list_number,
+        "shard_number": str(location.shard_number),
     }
     shard = await StatusListShard.retrieve_by_tag_filter(
         session, tag_filter, for_update=True
     )
-    bit_index = shard_index * definition.status_size
+    bit_index = location.shard_index * location.status_size
     status_bits = shard.status_bits
-    status_bits[bit_index : bit_index + definition.status_size] = bitarray(bitstring)
+    status_bits[bit_index : bit_index + location.status_size] = bitarray(bitstring)
     shard.status_bits = status_bits
+    shard.dirty = "true"
     await shard.save(session, reason="Update status list entry.")
+    await bump_status_list_version(session, definition_id, location.list_number)
+    invalidate_status_list_tokens(definition_id, location.list_number)
 
     # Emit event
-    shard.state = "updated"
-    payload = shard.serialize()
-    payload["credential_id"] = credential_id
-    payload["list_index"] = entry_index
-    payload["status"] = bitstring
-    await shard.emit_event(session, payload)
+    if config.event_batch_size:
+        event = {
+            "credential_id": credential_id,
+            "list_number": location.list_number,
+            "list_index": location.list_index,
+            "status": bitstring,
+        }
+        await EVENT_BATCHER.add(
+            session.profile, definition_id, "updated", [event], config
+        )
+    else:
+        shard.state = "updated"
+        payload = shard.serialize()
+        payload["credential_id"] = credential_id
+        payload["list_index"] = location.list_index
+        payload["status"] = bitstring
+        await shard.emit_event(session, payload)
 
     return {
-        "list": definition.list_number,
-        "index": entry_index,
-        "status": shard.status_bits[
-            bit_index : bit_index + definition.status_size
-        ].to01(),
-        "assigned": not shard.mask_bits[shard_index],
+        "list": location.list_number,
+        "index": location.list_index,
+        "status": shard.status_bits[bit_index : bit_index + location.status_size].to01(),
+        "assigned": not shard.mask_bits[location.shard_index],
     }
 
 
-async def get_status_list(
+async def transition_status_list_entries(
+    context: AdminRequestContext,
+    definition_id: str,
+    bitstring: str,
+    list_numbers: Optional[List[str]] = None,
+    credential_ids: Optional[List[str]] = None,
+) -> dict:
+    """Set the status of every assigned entry matching a selector.
+
+    Entries are selected by credential identifiers, by list numbers, or else all
+    entries of the definition. Lists are transitioned a whole shard at a time.
+    """
+
+    async with context.profile.session() as session:
+        definition = await StatusListDef.retrieve_by_id(session, definition_id)
+    if len(bitstring) != definition.status_size:
+        raise StatusListError(f"Status must be {definition.status_size} bit(s) long.")
+
+    if credential_ids is not None:
+        result = await update_status_list_entries(
+            context, definition_id, dict.fromkeys(credential_ids, bitstring)
+        )
+        shards = {
+            (entry["list"], entry["index"] // definition.shard_size)
+            for entry in result["updated"]
+        }
+        return {
+            "updated_entries": len(result["updated"]),
+            "updated_shards": len(shards),
+            "not_found": result["not_found"],
+        }
+
+    tag_filter = {"definition_id": definition_id}
+    if list_numbers is not None:
+        tag_filter["list_number"] = {"$in": [str(n) for n in list_numbers]}
+    async with context.profile.session() as session:
+        shards = await StatusListShard.query(session, tag_filter)
+    shards = sorted(shards, key=lambda s: (int(s.list_number), int(s.shard_number)))
+
+    updated_entries = 0
+    updated_shards = 0
+    for shard in shards:
+        if shard.mask_bits.all():
+            # nothing assigned in this shard
+            continue
+
+        async with context.profile.transaction() as txn:
+            shard = await StatusListShard.retrieve_by_id(txn, shard.id, for_update=True)
+            mask_bits = shard.mask_bits
+            assigned = mask_bits.count(0)
+
+            # each status bit of the entries is a strided slice of the shard bits
+            status_bits = shard.status_bits
+            for offset, bit in enumerate(bitstring):
+                plane = status_bits[offset :: shard.status_size]
+                if bit == "1":
+                    plane |= ~mask_bits
+                else:
+                    plane &= mask_bits
+                status_bits[offset :: shard.status_size] = plane
+            shard.status_bits = status_bits
+            shard.dirty = "true"
+            await shard.save(txn, reason="Transition status list entries.")
+            await bump_status_list_version(txn, definition_id, shard.list_number)
+
+            # Emit one event per shard
+            shard.state = "updated"
+            payload = shard.serialize()
+            payload["transition"] = {"status": bitstring, "entries": assigned}
+            await shard.emit_event(txn, payload)
+
+            await txn.commit()
+        invalidate_status_list_tokens(definition_id, shard.list_number)
+
+        updated_entries += assigned
+        updated_shards += 1
+
+    LOGGER.debug(
+        f"Transitioned {updated_entries} status list entries of {definition_id}."
+    )
+    return {
+        "updated_entries": updated_entries,
+        "updated_shards": updated_shards,
+        "not_found": [],
+    }
+
+
+async def migrate_status_list_shards(
+    context: AdminRequestContext, definition_id: str
+) -> dict:
+    """Rewrite the shards of a definition that are stored in an older format."""
+
+    async with context.profile.session() as session:
+        await StatusListDef.retrieve_by_id(session, definition_id)
+        shards = await StatusListShard.query(session, {"definition_id": definition_id})
+
+    migrated = 0
+    for shard in shards:
+        if shard.format_version == SHARD_FORMAT:
+            continue
+        async with context.profile.transaction() as txn:
+            shard = await StatusListShard.retrieve_by_id(txn, shard.id, for_update=True)
+            if shard.format_version != SHARD_FORMAT:
+                await shard.save(txn, reason="Migrate status list shard format.")
+                migrated += 1
+            await txn.commit()
+
+    LOGGER.debug(f"Migrated {migrated} status list shards of {definition_id}.")
+    return {"migrated": migrated, "format_version": SHARD_FORMAT}
+
+
+async def encode_status_list(
     context: AdminRequestContext, definition: StatusListDef, list_number: str
-):
-    """Compress status list."""
+) -> str:
+    """Compress and encode the status bits of a status list."""
 
-    config = Config.from_settings(context.profile.settings)
-    wallet_id = get_wallet_id(context)
+    bitmap = None
+    if BITMAP_STORE.bitmap_file(context.profile, list_number):
+        async with context.profile.session() as session:
+            status_version = await get_status_list_version(
+                session, definition.id, list_number
+            )
+        bitmap = await BITMAP_STORE.open_list(
+            context, definition, list_number, status_version
+        )
+    if bitmap:
+        # compress straight from the mapped status bits
+        metrics.RENDER_SHARDS.observe(0)
+        with metrics.COMPRESS_SECONDS.time():
+            compressor = zlib.compressobj(wbits=31)
+            with bitmap.lock:
+                compressed = compressor.compress(bitmap.status) + compressor.flush()
+        return bytes_to_b64(compressed, True).rstrip("=")
 
     async with context.profile.session() as session:
         tag_filter = {"definition_id": definition.id, "list_number": list_number}
         shards = await StatusListShard.query(session, tag_filter)
         shards = sorted(shards, key=lambda s: int(s.shard_number))
+    metrics.RENDER_SHARDS.observe(len(shards))
+
+    # feed shards in order into a gzip stream, carrying over unaligned bits
+    compress_start = time.perf_counter()
+    compressor = zlib.compressobj(wbits=31)
+    chunks = []
+    pending = bitarray()
+    for shard in shards:
+        status_bits = shard.status_buffer()
+        if not pending and (
+            not isinstance(status_bits, bitarray) or len(status_bits) % 8 == 0
+        ):
+            chunks.append(compressor.compress(status_bits))
+            continue
+        if not isinstance(status_bits, bitarray):
+            status_bits = shard.status_bits
+        pending.extend(status_bits)
+        aligned = len(pending) - len(pending) % 8
+        chunks.append(compressor.compress(pending[:aligned].tobytes()))
+        del pending[:aligned]
+    if pending:
+        chunks.append(compressor.compress(pending.tobytes()))
+    chunks.append(compressor.flush())
+    metrics.COMPRESS_SECONDS.observe(time.perf_counter() - compress_start)
+
+    base64 = bytes_to_b64(b"".join(chunks), True)
+    return base64.rstrip("=")
+
+
+def format_status_list(
+    context: AdminRequestContext,
+    definition: StatusListDef,
+    list_number: str,
+    encoded_list: str,
+) -> dict:
+    """Format an encoded status list according to the list type."""
 
-        status_bits = bitarray()
-        for shard in shards:
-            status_bits.extend(shard.status_bits)
+    config = Config.from_settings(context.profile.settings)
+    wallet_id = get_wallet_id(context)
 
-        bytes = gzip.compress(status_bits.tobytes())
-        base64 = bytes_to_b64(bytes, True)
-        encoded_list = base64.rstrip("=")
+    public_uri = config.public_uri.format(
+        tenant_id=wallet_id,
+        list_number=list_number,
+    )
 
-        public_uri = config.public_uri.format(
-            tenant_id=wallet_id,
-            list_number=list_number,
-        )
+    now = datetime.now(timezone.utc)
+    validUntil = now + timedelta(days=365)
+    unix_now = int(now.timestamp())
+    unix_validUntil = int(validUntil.timestamp())
+    ttl = STATUS_LIST_TTL
+
+    payload = {
+        "iss": definition.issuer_did,
+        "nbf": unix_now,
+        "jti": f"urn:uuid:{list_number}",
+        "sub": public_uri,
+    }
 
-        now = datetime.now(timezone.utc)
-        validUntil = now + timedelta(days=365)
-        unix_now = int(now.timestamp())
-        unix_validUntil = int(validUntil.timestamp())
-        ttl = 43200
-
-        payload = {
-            "iss": definition.issuer_did,
-            "nbf": unix_now,
-            "jti": f"urn:uuid:{list_number}",
-            "sub": public_uri,
+    if definition.list_type == "ietf":
+        status_list = {
+            **payload,
+            "iat": unix_now,
+            "exp": unix_validUntil,
+            "ttl": ttl,
+            "status_list": {
+                "bits": definition.status_size,
+                "lst": encoded_list,
+            },
         }
-
-        if definition.list_type == "ietf":
-            status_list = {
-                **payload,
-                "iat": unix_now,
-                "exp": unix_validUntil,
-                "ttl": ttl,
-                "status_list": {
-                    "bits": definition.status_size,
-                    "lst": encoded_list,
-                },
-            }
-        elif definition.list_type == "w3c":
-            status_list = {
-                **payload,
-                "vc": {
-                    "@context": ["https://www.w3.org/ns/credentials/v2"],
-                    "id": public_uri,
-                    "type": [
-                        "VerifiableCredential",
-                        "BitstringStatusListCredential",
-                    ],
-                    "issuer": definition.issuer_did,
-                    "validFrom": now.isoformat(),
-                    "validUntil": validUntil.isoformat(),
-                    "credentialSubject": {
-                        "id": public_uri + "#list",
-                        "type": "BitstringStatusList",
-                        "statusPurpose": definition.status_purpose,
-                        "encodedList": encoded_list,
-                    },
+    elif definition.list_type == "w3c":
+        status_list = {
+            **payload,
+            "vc": {
+                "@context": ["https://www.w3.org/ns/credentials/v2"],
+                "id": public_uri,
+                "type": [
+                    "VerifiableCredential",
+                    "BitstringStatusListCredential",
+                ],
+                "issuer": definition.issuer_did,
+                "validFrom": now.isoformat(),
+                "validUntil": validUntil.isoformat(),
+                "credentialSubject": {
+                    "id": public_uri + "#list",
+                    "type": "BitstringStatusList",
+                    "statusPurpose": definition.status_purpose,
+                    "encodedList": encoded_list,
                 },
-            }
-            if definition.status_purpose == "message":
-                status_list["vc"]["credentialSubject"]["statusSize"] = (
-                    definition.status_size
-                )
-                status_list["vc"]["credentialSubject"]["statusMessage"] = (
-                    definition.status_message
-                )
-        else:  # raw list
-            status_list = {
-                "definition_id": definition.id,
-                "list_number": list_number,
-                "list_size": definition.list_size,
-                "status_purpose": definition.status_purpose,
-                "status_message": definition.status_message,
-                "status_size": definition.status_size,
-                "encoded_list": encoded_list,
-            }
+            },
+        }
+        if definition.status_purpose == "message":
+            status_list["vc"]["credentialSubject"]["statusSize"] = definition.status_size
+            status_list["vc"]["credentialSubject"]["statusMessage"] = (
+                definition.status_message
+            )
+    else:  # raw list
+        status_list = {
+            "definition_id": definition.id,
+            "list_number": list_number,
+            "list_size": definition.list_size,
+            "status_purpose": definition.status_purpose,
+            "status_message": definition.status_message,
+            "status_size": definition.status_size,
+            "encoded_list": encoded_list,
+        }
 
-        return status_list
+    return status_list
 
 
-async def get_status_list_token(
+async def get_status_list(
+    context: AdminRequestContext, definition: StatusListDef, list_number: str
+):
+    """Compress status list."""
+
+    encoded_list = await encode_status_list(context, definition, list_number)
+    return format_status_list(context, definition, list_number, encoded_list)
+
+
+async def sign_status_list(
+    context: AdminRequestContext, definition: StatusListDef, status_list: dict
+) -> str:
+    """Sign a formatted status list with the definition issuer key."""
+
+    headers = {"typ": "statuslist+jwt"} if definition.list_type == "ietf" else {}
+
+    with metrics.SIGN_SECONDS.time():
+        return await jwt_sign(
+            profile=context.profile,
+            headers=headers,
+            payload=status_list,
+            did=definition.issuer_did,
+            verification_method=definition.verification_method,
+        )
+
+
+def cache_status_list_token(
+    definition: StatusListDef, list_number: str, status_version: str, token: str
+) -> StatusListToken:
+    """Cache a signed status list token rendered from a status list version."""
+
+    cached = StatusListToken(
+        definition_id=definition.id,
+        list_number=list_number,
+        status_version=status_version,
+        token=token,
+        etag=hashlib.sha256(token.encode()).hexdigest()[:32],
+        expires_at=time.monotonic() + STATUS_LIST_TTL,
+    )
+    STATUS_LIST_TOKENS[(definition.id, list_number)] = cached
+    return cached
+
+
+def invalidate_status_list_tokens(
+    definition_id: str, list_number: Optional[str] = None
+) -> None:
+    """Drop cached tokens of a status list, or of all lists of a definition."""
+
+    for key in list(STATUS_LIST_TOKENS):
+        if key[0] == definition_id and list_number in (None, key[1]):
+            del STATUS_LIST_TOKENS[key]
+
+
+async def get_cached_status_list_token(
     context: AdminRequestContext,
     list_number: str,
     definition: Optional[StatusListDef] = None,
-):
-    """Publish status list."""
+) -> StatusListToken:
+    """Return the signed status list token, rendering it only when not cached.
 
-    if definition is None:
-        async with context.profile.session() as session:
+    A cached token is only served while the status version of its list is
+    unchanged, so updates made through other agents are seen on next read.
+    """
+
+    wallet_id = get_wallet_id(context)
+    definition_id = (
+        definition.id if definition else LIST_DEFINITIONS.get((wallet_id, list_number))
+    )
+    async with context.profile.session() as session:
+        if not definition_id:
             tag_filter = {"list_number": list_number}
             shards = await StatusListShard.query(session, tag_filter, limit=1)
             definition_id = shards[0].definition_id
+        status_version = await get_status_list_version(
+            session, definition_id, list_number
+        )
+
+        cached = STATUS_LIST_TOKENS.get((definition_id, list_number))
+        if (
+            cached
+            and cached.status_version == status_version
+            and cached.expires_at > time.monotonic()
+        ):
+            return cached
+
+        if definition is None:
             definition = await StatusListDef.retrieve_by_id(session, definition_id)
+    LIST_DEFINITIONS[(wallet_id, list_number)] = definition.id
 
     status_list = await get_status_list(context, definition, list_number)
-    headers = {"typ": "statuslist+jwt"} if definition.list_type == "ietf" else {}
+    token = await sign_status_list(context, definition, status_list)
+
+    return cache_status_list_token(definition, list_number, status_version, token)
+
+
+async def get_status_list_token(
+    context: AdminRequestContext,
+    list_number: str,
+    definition: Optional[StatusListDef] = None,
+):
+    """Publish status list."""
+
+    cached = await get_cached_status_list_token(context, list_number, definition)
+    return cached.token
+
+
+def get_status_list_file_path(
+    context: AdminRequestContext, list_number: str
+) -> Optional[Path]:
+    """Return the published file of a status list, when files are served directly."""
+
+    config = Config.from_settings(context.profile.settings)
+    if not config.serve_files or not list_number.isdigit():
+        return None
 
-    return await jwt_sign(
-        profile=context.profile,
-        headers=headers,
-        payload=status_list,
-        did=definition.issuer_did,
-        verification_method=definition.verification_method,
+    path = Path(
+        config.file_path.format(tenant_id=get_wallet_id(context), list_number=list_number)
+    )
+    return path if path.is_file() else None
+
+
+def definition_fingerprint(definition: StatusListDef) -> str:
+    """Hash the definition attributes that end up in a published status list."""
+
+    attributes = [
+        definition.list_type,
+        definition.list_size,
+        definition.status_purpose,
+        definition.status_message,
+        definition.status_size,
+        definition.issuer_did,
+        definition.verification_method,
+    ]
+    return hashlib.sha256(json.dumps(attributes).encode()).hexdigest()
+
+
+async def clear_dirty_shards(
+    context: AdminRequestContext, shards: List[StatusListShard]
+) -> None:
+    """Clear dirty flags of shards that have not changed since they were read."""
+
+    async with context.profile.transaction() as txn:
+        for shard in shards:
+            current = await StatusListShard.retrieve_by_id(txn, shard.id, for_update=True)
+            if current.version != shard.version:
+                continue
+            current.dirty = "false"
+            await current.save(txn, reason="Status list published.")
+        await txn.commit()
+
+
+async def publish_status_lists(
+    context: AdminRequestContext,
+    definition: StatusListDef,
+    list_numbers: Optional[List[str]] = None,
+    concurrency: int = PUBLISH_CONCURRENCY,
+) -> list:
+    """Publish the status lists of a definition that changed since last published.
+
+    Only the given list numbers are considered when they are specified.
+    """
+
+    publish_start = time.perf_counter()
+    config = Config.from_settings(context.profile.settings)
+    wallet_id = get_wallet_id(context)
+    fingerprint = definition_fingerprint(definition)
+
+    async with context.profile.session() as session:
+        tag_filter = {"definition_id": definition.id, "dirty": "true"}
+        dirty_shards = await StatusListShard.query(session, tag_filter)
+    dirty_lists = {}
+    for shard in dirty_shards:
+        dirty_lists.setdefault(shard.list_number, []).append(shard)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def publish_list(list_number: str) -> Optional[dict]:
+        key = (wallet_id, definition.id, list_number)
+        last_published = PUBLISHED_LISTS.get(key)
+        if (
+            list_number not in dirty_lists
+            and last_published
+            and last_published[0] == fingerprint
+        ):
+            return None
+
+        status_list = None
+        async with semaphore:
+            async with context.profile.session() as session:
+                status_version = await get_status_list_version(
+                    session, definition.id, list_number
+                )
+            encoded_list = await encode_status_list(context, definition, list_number)
+            content_hash = hashlib.sha256(
+                f"{fingerprint}.{encoded_list}".encode()
+            ).hexdigest()
+            if not last_published or last_published[1] != content_hash:
+                status_list = format_status_list(
+                    context, definition, list_number, encoded_list
+                )
+                # publish status list
+                if config.file_path is not None:
+                    path = config.file_path.format(
+                        tenant_id=wallet_id,
+                        list_number=list_number,
+                    )
+                    jws = await sign_status_list(context, definition, status_list)
+                    cache_status_list_token(definition, list_number, status_version, jws)
+                    await write_to_file_async(path, jws.encode("utf-8"))
+                PUBLISHED_LISTS[key] = (fingerprint, content_hash)
+            else:
+                LOGGER.debug(f"Status list {list_number} is unchanged, skip publishing.")
+
+        if list_number in dirty_lists:
+            await clear_dirty_shards(context, dirty_lists[list_number])
+
+        return status_list
+
+    # publish the lists in parallel, writing their files on the thread pool
+    if list_numbers is not None:
+        list_numbers = [n for n in definition.list_numbers if n in list_numbers]
+    else:
+        list_numbers = definition.list_numbers
+    results = await asyncio.gather(
+        *(publish_list(list_number) for list_number in list_numbers)
+    )
+    metrics.PUBLISH_SECONDS.observe(
+        time.perf_counter() - publish_start, definition_id=definition.id
     )
+    return [status_list for status_list in results if status_list]
@@ -85,3 +85,71 @@ async def test_status_list_cred_routes(context: AdminRequestContext, seed_db):
         with pytest.raises(HTTPInternalServerError) as err:
             await controller.get_status_list_cred(request)
     assert isinstance(err.value, HTTPInternalServerError)
+
+
+@pytest.mark.asyncio
+async def test_update_status_list_creds(context: AdminRequestContext, seed_db):
+    """Test bulk status_list_cred route."""
+
+    request_dict = {
+        "context": context,
+        "outbound_message_router": AsyncMock(),
+    }
+    request = MagicMock(
+        app={},
+        match_info={"def_id": "definition_id"},
+        query={},
+        __getitem__=lambda _, k: request_dict[k],
+        headers={},
+        json=AsyncMock(
+            return_value={"entries": [{"cred_id": "credential_id", "status": "1"}]}
+        ),
+    )
+
+    with patch.object(controller, "web", autospec=True) as mock_web:
+        await controller.update_status_list_creds(request)
+        result = mock_web.json_response.call_args[0][0]
+        assert result["updated"][0]["credential_id"] == "credential_id"
+        assert result["updated"][0]["status"] == "1"
+        assert result["not_found"] == []
+
+    with patch(
+        "status_list.v1_0.status_handler.update_status_list_entries",
+        side_effect=StorageNotFoundError("No record found"),
+    ):
+        with pytest.raises(HTTPNotFound):
+            await controller.update_status_list_creds(request)
+
+    with patch(
+        "status_list.v1_0.status_handler.update_status_list_entries",
+        side_effect=StorageError("Storage error"),
+    ):
+        with pytest.raises(HTTPInternalServerError):
+            await controller.update_status_list_creds(request)
+
+    request.json.return_value = {"entries": [{"cred_id": "credential_id"}]}
+    with pytest.raises(HTTPBadRequest):
+        await controller.update_status_list_creds(request)
+
+    request.json.return_value = {
+        "entries": [{"cred_id": "credential_id", "status": "0x2a"}]
+    }
+    with pytest.raises(HTTPBadRequest):
+        await controller.update_status_list_creds(request)
+
+    request.json.return_value = {
+        "entries": [
+            {"cred_id": "credential_id", "status": "1"},
+            {"cred_id": "other_credential_id", "status": "10"},
+        ]
+    }
+    with patch(
+        "status_list.v1_0.status_handler.update_status_list_entries"
+    ) as mock_update:
+        with pytest.raises(HTTPBadRequest):
+            await controller.update_status_list_creds(request)
+    mock_update.assert_not_called()
+
+    request.json.return_value = {}
+    with pytest.raises(HTTPBadRequest):
+        await controller.update_status_list_creds(request)
@@ -0,0 +1,24 @@
+import pytest
+from unittest.mock import MagicMock
+
+from acapy_agent.admin.request_context import AdminRequestContext
+
+from ...controllers import status_list_metrics as controller
+from ... import metrics
+
+
+@pytest.mark.asyncio
+async def test_get_status_list_metrics(context: AdminRequestContext):
+    metrics.ROLLOVERS.inc()
+    request_dict = {"context": context}
+    request = MagicMock(
+        app={},
+        match_info={},
+        query={},
+        __getitem__=lambda _, k: request_dict[k],
+        headers={"x-api-key": "secret-key"},
+    )
+
+    response = await controller.get_status_list_metrics(request)
+    assert response.content_type == "text/plain"
+    assert "# TYPE status_list_rollovers_total counter" in response.body.decode()
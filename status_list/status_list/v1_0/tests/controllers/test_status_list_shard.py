@@ -1,7 +1,7 @@
 import pytest
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
-from aiohttp.web import HTTPNotFound, HTTPInternalServerError
+from aiohttp.web import HTTPBadRequest, HTTPNotFound, HTTPInternalServerError
 
 from acapy_agent.admin.request_context import AdminRequestContext
 from acapy_agent.storage.error import StorageError, StorageNotFoundError
@@ -51,6 +51,49 @@ async def test_assign_status_list_entry(context: AdminRequestContext, seed_db):
     assert isinstance(err.value, HTTPInternalServerError)
 
 
+@pytest.mark.asyncio
+async def test_reserve_status_list_entries(context: AdminRequestContext, seed_db):
+    """Test status_list_shard bulk routes."""
+
+    request_dict = {
+        "context": context,
+        "outbound_message_router": AsyncMock(),
+    }
+    request = MagicMock(
+        app={},
+        match_info={"def_id": "definition_id"},
+        query={},
+        __getitem__=lambda _, k: request_dict[k],
+        headers={},
+        json=AsyncMock(return_value={"count": 5}),
+    )
+
+    with patch.object(controller, "web", autospec=True) as mock_web:
+        await controller.reserve_status_list_entries(request)
+        result = mock_web.json_response.call_args[0][0]
+        assert len(result["entries"]) == 5
+        assert all(entry["assigned"] for entry in result["entries"])
+
+    request.json.return_value = {"count": 0}
+    with pytest.raises(HTTPBadRequest):
+        await controller.reserve_status_list_entries(request)
+
+    request.json.return_value = {"count": 5}
+    with patch(
+        "status_list.v1_0.status_handler.reserve_status_list_entries",
+        side_effect=StorageNotFoundError("No record found"),
+    ):
+        with pytest.raises(HTTPNotFound):
+            await controller.reserve_status_list_entries(request)
+
+    with patch(
+        "status_list.v1_0.status_handler.reserve_status_list_entries",
+        side_effect=StorageError("Storage error"),
+    ):
+        with pytest.raises(HTTPInternalServerError):
+            await controller.reserve_status_list_entries(request)
+
+
 @pytest.mark.asyncio
 async def test_get_status_list(context: AdminRequestContext, seed_db):
     """Test status_list_shard routes."""
@@ -89,3 +132,38 @@ async def test_get_status_list(context: AdminRequestContext, seed_db):
         with pytest.raises(HTTPInternalServerError) as err:
             await controller.get_status_list(request)
     assert isinstance(err.value, HTTPInternalServerError)
+
+
+@pytest.mark.asyncio
+async def test_transition_status_list_entries(context: AdminRequestContext, seed_db):
+    """Test status_list_shard transition routes."""
+
+    request_dict = {
+        "context": context,
+        "outbound_message_router": AsyncMock(),
+    }
+    request = MagicMock(
+        app={},
+        match_info={"def_id": "definition_msg_id"},
+        query={},
+        __getitem__=lambda _, k: request_dict[k],
+        headers={},
+        json=AsyncMock(return_value={"status": "01"}),
+    )
+
+    with patch.object(controller, "web", autospec=True) as mock_web:
+        await controller.transition_status_list_entries(request)
+        result = mock_web.json_response.call_args[0][0]
+        assert result["not_found"] == []
+
+    request.json.return_value = {"status": "0x"}
+    with pytest.raises(HTTPBadRequest):
+        await controller.transition_status_list_entries(request)
+
+    request.json.return_value = {"status": "01"}
+    with patch(
+        "status_list.v1_0.status_handler.transition_status_list_entries",
+        side_effect=StorageNotFoundError("No record found"),
+    ):
+        with pytest.raises(HTTPNotFound):
+            await controller.transition_status_list_entries(request)
@@ -0,0 +1,186 @@
+import gzip
+import json
+import pytest
+import zlib
+from dataclasses import replace
+from types import SimpleNamespace
+
+from acapy_agent.admin.request_context import AdminRequestContext
+from acapy_agent.core.event_bus import Event
+from acapy_agent.storage.base import BaseStorage
+from acapy_agent.wallet.util import b64_to_bytes
+from bitarray import bitarray
+
+from .. import status_handler
+from ..bitmap_store import WAL_RECORD, BitmapStore, MappedBitmap, version_digest
+from ..models import SHARD_SAVED_EVENT_TOPIC, StatusListDef, StatusListShard
+
+
+def decode_status_list(encoded: str) -> bitarray:
+    bits = bitarray()
+    bits.frombytes(gzip.decompress(b64_to_bytes(encoded, True)))
+    return bits
+
+
+def test_mapped_bitmap(tmp_path):
+    path = tmp_path / "base" / "1.bitmap"
+    bitmap = MappedBitmap(path, list_size=16, shard_size=6, status_size=2)
+    bitmap.open()
+    assert not bitmap.status.any()
+    assert bitmap.mask.all()
+
+    bitmap.write_shards(
+        [
+            (1, "v1", bitarray("110000000000"), bitarray("011111")),
+            (2, "v2", bitarray("10" * 6), bitarray("0" * 6)),
+        ]
+    )
+    assert bitmap.status[12:32] == bitarray("11000000000010101010")
+    assert bitmap.mask[6:16] == bitarray("0111110000")
+    assert bitmap.shard_version(1) == version_digest("v1")
+    status = bitmap.status.copy()
+    bitmap.close()
+
+    # logged writes that were not applied are replayed, up to a torn record
+    bitmap = MappedBitmap(path, list_size=16, shard_size=6, status_size=2)
+    bitmap.open()
+    assert bitmap.status == status
+    payload = version_digest("v3") + bitarray("1" * 12).tobytes() + bytes(1)
+    record = WAL_RECORD.pack(0, len(payload), zlib.crc32(payload)) + payload
+    bitmap._wal.write(record + record[:-4])
+    bitmap._wal.flush()
+
+    reopened = MappedBitmap(path, list_size=16, shard_size=6, status_size=2)
+    reopened.open()
+    assert reopened.status[:12].all()
+    assert reopened.status[12:] == status[12:]
+    assert not reopened.mask[:6].any()
+    reopened.close()
+    bitmap.close()
+
+    # a layout change recreates the file
+    resized = MappedBitmap(path, list_size=32, shard_size=8, status_size=1)
+    resized.open()
+    assert not resized.status.any()
+    resized.close()
+
+
+@pytest.mark.asyncio
+async def test_bitmap_store_render(
+    context: AdminRequestContext, seed_db, plugin_config, monkeypatch, tmp_path
+):
+    async with context.profile.session() as session:
+        definition = await StatusListDef.retrieve_by_id(session, "definition_id")
+        entry = await status_handler.get_status_list_entry(
+            session, "definition_id", "credential_id"
+        )
+    list_number = entry["list"]
+    expected = await status_handler.encode_status_list(context, definition, list_number)
+
+    config = replace(plugin_config, bitmap_path=str(tmp_path / "{tenant_id}"))
+    monkeypatch.setattr(
+        "status_list.v1_0.bitmap_store.Config",
+        SimpleNamespace(from_settings=lambda _: config),
+    )
+    store = BitmapStore()
+    monkeypatch.setattr(status_handler, "BITMAP_STORE", store)
+
+    # rendered from the mapped bits once caught up with the shards
+    encoded = await status_handler.encode_status_list(context, definition, list_number)
+    assert decode_status_list(encoded) == decode_status_list(expected)
+    assert (tmp_path / "base" / f"{list_number}.bitmap").is_file()
+
+    # committed shard saves are written into the mapped list
+    bit = "0" if entry["status"] == "1" else "1"
+    async with context.profile.session() as session:
+        await status_handler.update_status_list_entry(
+            session, "definition_id", "credential_id", bit
+        )
+        shard = await StatusListShard.retrieve_by_tag_filter(
+            session,
+            {
+                "definition_id": "definition_id",
+                "list_number": list_number,
+                "shard_number": str(entry["index"] // definition.shard_size),
+            },
+        )
+    await store.on_shard_saved(
+        context.profile,
+        Event(
+            SHARD_SAVED_EVENT_TOPIC,
+            {
+                "definition_id": "definition_id",
+                "list_number": list_number,
+                "shard_number": shard.shard_number,
+                "version": shard.version,
+                "status_bits": shard.status_bits,
+                "mask_bits": shard.mask_bits,
+            },
+        ),
+    )
+    encoded = await status_handler.encode_status_list(context, definition, list_number)
+    assert decode_status_list(encoded)[entry["index"]] == int(bit)
+
+    # shards saved by another agent, without an event here, are caught up on render
+    async with context.profile.session() as session:
+        await status_handler.update_status_list_entry(
+            session, "definition_id", "credential_id", entry["status"]
+        )
+    encoded = await status_handler.encode_status_list(context, definition, list_number)
+    assert decode_status_list(encoded) == decode_status_list(expected)
+    async with context.profile.session() as session:
+        await status_handler.update_status_list_entry(
+            session, "definition_id", "credential_id", bit
+        )
+
+    # shards saved while the list was not mapped are caught up when it is reopened
+    await store.close()
+    async with context.profile.session() as session:
+        await status_handler.update_status_list_entry(
+            session, "definition_id", "credential_id", entry["status"]
+        )
+    store = BitmapStore()
+    monkeypatch.setattr(status_handler, "BITMAP_STORE", store)
+    encoded = await status_handler.encode_status_list(context, definition, list_number)
+    assert decode_status_list(encoded) == decode_status_list(expected)
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_bitmap_store_unversioned_shard(
+    context: AdminRequestContext, seed_db, plugin_config, monkeypatch, tmp_path
+):
+    async with context.profile.session() as session:
+        definition = await StatusListDef.retrieve_by_id(session, "definition_id")
+        list_number = definition.list_numbers[0]
+        shard = await StatusListShard.retrieve_by_tag_filter(
+            session,
+            {
+                "definition_id": "definition_id",
+                "list_number": list_number,
+                "shard_number": "0",
+            },
+        )
+        status_bits = shard.status_bits
+        status_bits[0] = 1
+        shard.status_bits = status_bits
+        await shard.save(session)
+
+        # stored as before shards were versioned
+        storage = session.inject(BaseStorage)
+        record = await storage.get_record(StatusListShard.RECORD_TYPE, shard.id)
+        value = json.loads(record.value)
+        value["version"] = None
+        await storage.update_record(record, json.dumps(value), record.tags)
+
+    config = replace(plugin_config, bitmap_path=str(tmp_path / "{tenant_id}"))
+    monkeypatch.setattr(
+        "status_list.v1_0.bitmap_store.Config",
+        SimpleNamespace(from_settings=lambda _: config),
+    )
+    store = BitmapStore()
+    monkeypatch.setattr(status_handler, "BITMAP_STORE", store)
+
+    encoded = await status_handler.encode_status_list(context, definition, list_number)
+    assert decode_status_list(encoded)[0] == 1
+    await store.close()
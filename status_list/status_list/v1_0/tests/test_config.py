@@ -45,3 +45,59 @@ async def test_config(plugin_settings: dict):
         Config.from_settings(Settings(copied_settings))
     except ConfigError as error:
         assert error
+
+    # Test optional settings
+    assert config.spare_threshold == 0.0
+
+    copied_settings = deepcopy(plugin_settings)
+    copied_settings[PLUGIN_CONFIG_KEY]["status_list"]["spare_threshold"] = "0.75"
+    assert Config.from_settings(Settings(copied_settings)).spare_threshold == 0.75
+
+    copied_settings[PLUGIN_CONFIG_KEY]["status_list"]["spare_threshold"] = "1.5"
+    with pytest.raises(ConfigError):
+        Config.from_settings(Settings(copied_settings))
+
+    assert config.lease_size == 0
+    assert config.lease_ttl == 300
+    assert config.worker_id is None
+
+    copied_settings = deepcopy(plugin_settings)
+    copied_settings[PLUGIN_CONFIG_KEY]["status_list"]["lease_size"] = "64"
+    copied_settings[PLUGIN_CONFIG_KEY]["status_list"]["worker_id"] = "worker"
+    config = Config.from_settings(Settings(copied_settings))
+    assert config.lease_size == 64
+    assert config.worker_id == "worker"
+
+    copied_settings[PLUGIN_CONFIG_KEY]["status_list"]["lease_ttl"] = "-1"
+    with pytest.raises(ConfigError):
+        Config.from_settings(Settings(copied_settings))
+
+    assert config.republish_window == 0.0
+    copied_settings = deepcopy(plugin_settings)
+    copied_settings[PLUGIN_CONFIG_KEY]["status_list"]["republish_window"] = "2.5"
+    copied_settings[PLUGIN_CONFIG_KEY]["status_list"]["republish_concurrency"] = "4"
+    config = Config.from_settings(Settings(copied_settings))
+    assert config.republish_window == 2.5
+    assert config.republish_concurrency == 4
+
+    copied_settings[PLUGIN_CONFIG_KEY]["status_list"]["republish_concurrency"] = "-1"
+    with pytest.raises(ConfigError):
+        Config.from_settings(Settings(copied_settings))
+
+    assert config.event_batch_size == 0
+    copied_settings = deepcopy(plugin_settings)
+    copied_settings[PLUGIN_CONFIG_KEY]["status_list"]["event_batch_size"] = "100"
+    copied_settings[PLUGIN_CONFIG_KEY]["status_list"]["event_batch_interval"] = "0.5"
+    config = Config.from_settings(Settings(copied_settings))
+    assert config.event_batch_size == 100
+    assert config.event_batch_interval == 0.5
+
+    copied_settings[PLUGIN_CONFIG_KEY]["status_list"]["event_batch_interval"] = "-1"
+    with pytest.raises(ConfigError):
+        Config.from_settings(Settings(copied_settings))
+
+    assert config.bitmap_path is None
+    copied_settings = deepcopy(plugin_settings)
+    copied_settings[PLUGIN_CONFIG_KEY]["status_list"]["bitmap_path"] = "/tmp/{tenant_id}"
+    config = Config.from_settings(Settings(copied_settings))
+    assert config.bitmap_path == "/tmp/{tenant_id}"
@@ -0,0 +1,42 @@
+import asyncio
+import pytest
+from dataclasses import replace
+from unittest.mock import AsyncMock, MagicMock
+
+from ..events import StatusListEventBatcher
+
+
+@pytest.mark.asyncio
+async def test_event_batcher(plugin_config):
+    config = replace(plugin_config, event_batch_size=3, event_batch_interval=0.05)
+    profile = MagicMock(settings={}, notify=AsyncMock())
+    batcher = StatusListEventBatcher()
+
+    # size trigger
+    for index in range(3):
+        await batcher.add(
+            profile, "definition_id", "assigned", [{"list_index": index}], config
+        )
+    profile.notify.assert_awaited_once_with(
+        "acapy::record::status-list::assigned",
+        {
+            "definition_id": "definition_id",
+            "state": "assigned",
+            "entries": [{"list_index": 0}, {"list_index": 1}, {"list_index": 2}],
+        },
+    )
+
+    # time trigger, batched per definition and state
+    profile.notify.reset_mock()
+    await batcher.add(profile, "definition_id", "updated", [{"list_index": 3}], config)
+    await batcher.add(profile, "other_id", "updated", [{"list_index": 4}], config)
+    profile.notify.assert_not_awaited()
+    await asyncio.sleep(0.1)
+    assert profile.notify.await_count == 2
+
+    # pending batches are emitted on flush
+    profile.notify.reset_mock()
+    await batcher.add(profile, "definition_id", "updated", [{"list_index": 5}], config)
+    await batcher.flush()
+    profile.notify.assert_awaited_once()
+    assert not batcher._timers
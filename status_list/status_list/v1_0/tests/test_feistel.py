@@ -1,6 +1,8 @@
 import random
 
-from ..feistel import FeistelPermutation
+import pytest
+
+from ..feistel import FeistelPermutation, get_permutation
 
 
 def test_feistel_permutation():
@@ -65,3 +67,28 @@ def test_feistel_permutation():
         feistel.permute(20)
     except ValueError:
         assert True
+
+
+def test_feistel_permute_many():
+    master_key_bytes = random.randbytes(16)
+    for N in (2**4, 2**5, 2**17):
+        feistel = FeistelPermutation(N, master_key_bytes)
+        expected = [feistel.permute(i) for i in range(N)]
+        assert feistel.permute_many(range(N)) == expected
+        assert feistel.permute_many(range(3, N, 7)) == expected[3:N:7]
+        assert feistel.permute_many([N - 1, 0]) == [expected[N - 1], expected[0]]
+        assert feistel.permute_many(range(0)) == []
+
+    feistel = FeistelPermutation(16, master_key_bytes)
+    with pytest.raises(ValueError):
+        feistel.permute_many(range(10, 20))
+    with pytest.raises(ValueError):
+        feistel.permute_many([-1])
+
+
+def test_get_permutation_cache():
+    master_key_bytes = random.randbytes(16)
+    feistel = get_permutation(2**17, master_key_bytes)
+    assert get_permutation(2**17, master_key_bytes) is feistel
+    assert get_permutation(2**18, master_key_bytes) is not feistel
+    assert get_permutation(2**17, random.randbytes(16)) is not feistel
@@ -0,0 +1,38 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from acapy_agent.core.util import SHUTDOWN_EVENT_PATTERN
+
+from .. import setup, shutdown
+from ..bitmap_store import BITMAP_STORE, SHARD_SAVED_EVENT_PATTERN
+from ..republisher import REPUBLISHER, SHARD_UPDATED_EVENT_PATTERN
+
+
+@pytest.mark.asyncio
+async def test_setup():
+    event_bus = MagicMock()
+    context = MagicMock(inject=MagicMock(return_value=event_bus))
+
+    await setup(context)
+    event_bus.subscribe.assert_any_call(
+        SHARD_UPDATED_EVENT_PATTERN, REPUBLISHER.on_shard_updated
+    )
+    event_bus.subscribe.assert_any_call(
+        SHARD_SAVED_EVENT_PATTERN, BITMAP_STORE.on_shard_saved
+    )
+    event_bus.subscribe.assert_any_call(SHUTDOWN_EVENT_PATTERN, shutdown)
+
+    context.inject.return_value = None
+    with pytest.raises(ValueError):
+        await setup(context)
+
+
+@pytest.mark.asyncio
+async def test_shutdown():
+    with (
+        patch.object(REPUBLISHER, "flush", AsyncMock()) as mock_republish,
+        patch.object(BITMAP_STORE, "close", AsyncMock()) as mock_close,
+    ):
+        await shutdown(MagicMock(), MagicMock())
+    mock_republish.assert_awaited_once()
+    mock_close.assert_awaited_once()
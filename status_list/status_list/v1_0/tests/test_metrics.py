@@ -0,0 +1,52 @@
+import pytest
+
+from acapy_agent.admin.request_context import AdminRequestContext
+
+from .. import metrics, status_handler
+from ..models import StatusListDef
+
+
+def test_metrics_exposition():
+    registry = metrics.Registry()
+    counter = registry.register(metrics.Counter("test_total", "Test counter."))
+    histogram = registry.register(
+        metrics.Histogram(
+            "test_seconds", "Test histogram.", buckets=(0.1, 1), labels=("definition_id",)
+        )
+    )
+    counter.inc()
+    counter.inc(2)
+    histogram.observe(0.05, definition_id='def"1')
+    histogram.observe(0.5, definition_id='def"1')
+    with histogram.time(definition_id="def2"):
+        pass
+
+    text = registry.expose()
+    assert "# TYPE test_total counter\ntest_total 3\n" in text
+    assert "# TYPE test_seconds histogram" in text
+    assert 'test_seconds_bucket{definition_id="def\\"1",le="0.1"} 1' in text
+    assert 'test_seconds_bucket{definition_id="def\\"1",le="1"} 2' in text
+    assert 'test_seconds_bucket{definition_id="def\\"1",le="+Inf"} 2' in text
+    assert 'test_seconds_count{definition_id="def\\"1"} 2' in text
+    assert histogram.count(definition_id="def2") == 1
+
+    registry.reset()
+    assert counter.value() == 0
+    assert "test_total " not in registry.expose()
+
+
+@pytest.mark.asyncio
+async def test_assignment_metrics(context: AdminRequestContext, seed_db):
+    metrics.REGISTRY.reset()
+
+    await status_handler.assign_status_list_entry(context, "definition_id")
+    async with context.profile.session() as session:
+        definition = await StatusListDef.retrieve_by_id(session, "definition_id")
+    await status_handler.get_status_list(context, definition, definition.list_number)
+
+    assert metrics.ASSIGN_SECONDS.count() == 1
+    assert metrics.DEFINITION_LOCK_SECONDS.count() == 1
+    assert metrics.SHARD_LOCK_SECONDS.count() == 1
+    assert metrics.RENDER_SHARDS.count() == 1
+    assert metrics.COMPRESS_SECONDS.count() == 1
+    assert "status_list_shard_lock_seconds_count 1" in metrics.REGISTRY.expose()
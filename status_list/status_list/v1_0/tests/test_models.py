@@ -1,8 +1,17 @@
 import pytest
+from bitarray import util as bitutil
 
 from acapy_agent.core.profile import Profile
+from acapy_agent.wallet.util import bytes_to_b64
 
-from ..models import StatusListDef, StatusListShard, StatusListCred
+from ..models import (
+    SHARD_CACHE,
+    SHARD_FORMAT,
+    SHARD_FORMAT_BASE64,
+    StatusListDef,
+    StatusListShard,
+    StatusListCred,
+)
 from ..status_handler import create_next_status_list
 from ..error import DuplicateListNumberError
 
@@ -50,3 +59,83 @@ async def test_status_list_models(
         # Clean up
         for shard in shards:
             await shard.delete_record(session)
+
+
+@pytest.mark.asyncio
+async def test_status_list_shard_cache(profile: Profile):
+    shard = StatusListShard(
+        definition_id="cache_definition_id",
+        list_number="0",
+        shard_number="0",
+        shard_size=12,
+        status_size=2,
+    )
+    async with profile.session() as session:
+        await shard.save(session)
+        assert shard.version
+        assert SHARD_CACHE.get(shard.cache_key, shard.version, "mask") is not None
+
+        # cached bits are copied to each retrieved shard
+        loaded = await StatusListShard.retrieve_by_id(session, shard.id)
+        mask_bits = loaded.mask_bits
+        assert mask_bits == bitutil.ones(12)
+        mask_bits[3] = False
+        loaded.mask_bits = mask_bits
+        other = await StatusListShard.retrieve_by_id(session, shard.id)
+        assert other.mask_bits[3]
+
+        # saving re-encodes the bits and renews the version
+        version = loaded.version
+        await loaded.save(session)
+        assert loaded.version != version
+        SHARD_CACHE.clear()
+        reloaded = await StatusListShard.retrieve_by_id(session, shard.id)
+        assert not reloaded.mask_bits[3]
+        assert len(reloaded.status_bits) == 24
+
+        # stale versions are not served from the cache
+        assert SHARD_CACHE.get(shard.cache_key, version, "mask") is None
+
+        await reloaded.delete_record(session)
+
+
+@pytest.mark.asyncio
+async def test_status_list_shard_format(profile: Profile):
+    shard = StatusListShard(
+        definition_id="format_definition_id",
+        list_number="0",
+        shard_number="0",
+        shard_size=1024,
+        status_size=1,
+    )
+    assert shard.format_version == SHARD_FORMAT
+    value = shard.record_value
+    assert "status_encoded" not in value
+    assert len(value["mask_packed"]) < len(shard.mask_encoded)
+
+    # legacy base64 records are read and migrated on save
+    mask_bits = shard.mask_bits
+    mask_bits[7] = False
+    legacy = StatusListShard(
+        definition_id="format_definition_id",
+        list_number="0",
+        shard_number="0",
+        shard_size=1024,
+        status_size=1,
+        status_encoded=shard.status_encoded,
+        mask_encoded=bytes_to_b64(mask_bits.tobytes(), True),
+    )
+    assert legacy.format_version == SHARD_FORMAT_BASE64
+    assert "mask_encoded" in legacy.record_value
+    assert "format_version" not in legacy.record_value
+
+    async with profile.session() as session:
+        await legacy.save(session)
+        assert legacy.format_version == SHARD_FORMAT
+        SHARD_CACHE.clear()
+        loaded = await StatusListShard.retrieve_by_id(session, legacy.id)
+        assert loaded.format_version == SHARD_FORMAT
+        assert loaded.mask_bits == mask_bits
+        assert loaded.serialize()["mask_encoded"] == legacy.mask_encoded
+
+        await loaded.delete_record(session)
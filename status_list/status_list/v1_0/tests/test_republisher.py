@@ -0,0 +1,99 @@
+import asyncio
+import pytest
+from copy import deepcopy
+from unittest.mock import AsyncMock, patch
+
+from acapy_agent.config.plugin_settings import PLUGIN_CONFIG_KEY
+from acapy_agent.core.event_bus import Event
+from acapy_agent.utils.testing import create_test_profile
+
+from ..models import StatusListDef
+from ..republisher import StatusListRepublisher
+
+
+@pytest.mark.asyncio
+async def test_republish_coalesces_shard_updates(plugin_settings: dict):
+    settings = deepcopy(plugin_settings)
+    settings[PLUGIN_CONFIG_KEY]["status_list"]["republish_window"] = "0.05"
+    profile = await create_test_profile(settings)
+    definition = StatusListDef(
+        supported_cred_id="republish_supported_cred_id",
+        list_size=16,
+        shard_size=8,
+        list_numbers=["1", "2", "3"],
+    )
+    async with profile.session() as session:
+        await definition.save(session)
+
+    republisher = StatusListRepublisher()
+    topic = "acapy::record::status-list::updated"
+    with patch(
+        "status_list.v1_0.republisher.status_handler.publish_status_lists",
+        AsyncMock(return_value=[]),
+    ) as mock_publish:
+        for list_number, shard_number in (("1", "0"), ("3", "1"), ("1", "1")):
+            await republisher.on_shard_updated(
+                profile,
+                Event(
+                    topic,
+                    {
+                        "definition_id": definition.id,
+                        "list_number": list_number,
+                        "shard_number": shard_number,
+                    },
+                ),
+            )
+        # credential events and other records are ignored
+        await republisher.on_shard_updated(
+            profile, Event(topic, {"definition_id": definition.id, "list_number": "2"})
+        )
+        await asyncio.sleep(0.1)
+        await republisher.flush()
+
+        mock_publish.assert_awaited_once()
+        assert mock_publish.await_args.kwargs["list_numbers"] == ["1", "3"]
+        assert mock_publish.await_args.kwargs["concurrency"] == 2
+
+    # republishing is disabled without a window
+    profile = await create_test_profile(plugin_settings)
+    await republisher.on_shard_updated(
+        profile,
+        Event(
+            topic,
+            {"definition_id": definition.id, "list_number": "1", "shard_number": "0"},
+        ),
+    )
+    assert not republisher._tasks
+
+
+@pytest.mark.asyncio
+async def test_flush_republishes_pending_lists(plugin_settings: dict):
+    settings = deepcopy(plugin_settings)
+    settings[PLUGIN_CONFIG_KEY]["status_list"]["republish_window"] = "60"
+    profile = await create_test_profile(settings)
+    definition = StatusListDef(
+        supported_cred_id="flush_supported_cred_id",
+        list_size=16,
+        shard_size=8,
+        list_numbers=["1"],
+    )
+    async with profile.session() as session:
+        await definition.save(session)
+
+    republisher = StatusListRepublisher()
+    with patch(
+        "status_list.v1_0.republisher.status_handler.publish_status_lists",
+        AsyncMock(return_value=[]),
+    ) as mock_publish:
+        await republisher.on_shard_updated(
+            profile,
+            Event(
+                "acapy::record::status-list::updated",
+                {"definition_id": definition.id, "list_number": "1", "shard_number": "0"},
+            ),
+        )
+        await asyncio.wait_for(republisher.flush(), 5)
+
+        mock_publish.assert_awaited_once()
+        assert mock_publish.await_args.kwargs["list_numbers"] == ["1"]
+        assert not republisher._tasks
@@ -1,85 +1,79 @@
+import asyncio
 import pytest
+import gzip
 import os
+from bitarray import bitarray
 from bitarray import util as bitutil
-from unittest.mock import MagicMock, Mock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
+from dataclasses import replace
 from filelock import Timeout
+from types import SimpleNamespace
 
 from acapy_agent.admin.request_context import AdminRequestContext
+from acapy_agent.wallet.util import b64_to_bytes, pad
 
 from ..error import StatusListError
-from ..models import StatusListDef, StatusListShard, StatusListReg
+from ..models import (
+    SHARD_FORMAT,
+    StatusListCred,
+    StatusListDef,
+    StatusListShard,
+    StatusListLease,
+    StatusListReg,
+)
 from .. import status_handler
 
 
-def test_with_retries():
-    mock_func = Mock(return_value="success")
+@pytest.mark.asyncio
+async def test_with_async_retries():
+    mock_func = AsyncMock(return_value="success")
 
-    @status_handler.with_retries(max_attempts=3, delay=0)
-    def wrapped():
-        return mock_func()
+    @status_handler.with_async_retries(max_attempts=3, delay=0)
+    async def wrapped():
+        return await mock_func()
 
-    result = wrapped()
+    result = await wrapped()
     assert result == "success"
-    assert mock_func.call_count == 1
+    assert mock_func.await_count == 1
 
-    mock_func = Mock(side_effect=ValueError("fail"))
+    mock_func = AsyncMock(side_effect=ValueError("fail"))
 
-    @status_handler.with_retries(max_attempts=3, delay=0)
-    def wrapped():
-        return mock_func()
+    @status_handler.with_async_retries(max_attempts=3, delay=0)
+    async def wrapped():
+        return await mock_func()
 
     with pytest.raises(ValueError, match="fail"):
-        wrapped()
-    assert mock_func.call_count == 3
+        await wrapped()
+    assert mock_func.await_count == 3
 
-    mock_func = Mock(side_effect=[Exception("fail1"), Exception("fail2"), "success"])
+    mock_func = AsyncMock(side_effect=[Exception("fail1"), Exception("fail2"), "success"])
 
-    @status_handler.with_retries(max_attempts=5, delay=0)
-    def wrapped():
-        return mock_func()
+    @status_handler.with_async_retries(max_attempts=5, delay=0)
+    async def wrapped():
+        return await mock_func()
 
-    result = wrapped()
+    result = await wrapped()
     assert result == "success"
-    assert mock_func.call_count == 3
+    assert mock_func.await_count == 3
 
-    mock_func = Mock(side_effect=Exception("fail"))
+    mock_func = AsyncMock(side_effect=Exception("fail"))
 
-    @status_handler.with_retries(max_attempts=3, delay=1)
-    def wrapped():
-        return mock_func()
+    @status_handler.with_async_retries(max_attempts=3, delay=1)
+    async def wrapped():
+        return await mock_func()
 
-    with patch("time.sleep", return_value=None) as mock_sleep:
+    with patch("asyncio.sleep", return_value=None) as mock_sleep:
         with pytest.raises(Exception):
-            wrapped()
-        # sleep should be called twice (between 3 attempts)
-        assert mock_sleep.call_count == 2
+            await wrapped()
+        # sleep should be awaited twice (between 3 attempts)
+        assert mock_sleep.await_count == 2
 
 
-def test_write_to_file_success(tmp_path):
+def test_write_file_atomic(tmp_path):
     file_path = tmp_path / "test.txt"
     content = b"hello world"
 
-    status_handler.write_to_file(str(file_path), content)
-
-    assert file_path.exists()
-    assert file_path.read_bytes() == content
-
-    file_path = tmp_path / "test_retry.txt"
-    content = b"retry test"
-
-    # Patch os.replace to fail once then succeed
-    call_tracker = {"count": 0}
-
-    def flaky_replace(src, dst):
-        if call_tracker["count"] == 0:
-            call_tracker["count"] += 1
-            raise OSError("Simulated failure")
-        return original_replace(src, dst)
-
-    original_replace = os.replace
-
-    with patch("status_list.v1_0.status_handler.os.replace", side_effect=flaky_replace):
-        status_handler.write_to_file(str(file_path), content)
+    status_handler.write_file_atomic(str(file_path), content)
 
     assert file_path.exists()
     assert file_path.read_bytes() == content
@@ -92,7 +86,7 @@ def test_write_to_file_success(tmp_path):
         "status_list.v1_0.status_handler.os.replace", side_effect=OSError("always fail")
     ):
         with pytest.raises(OSError, match="always fail"):
-            status_handler.write_to_file(str(file_path), content)
+            status_handler.write_file_atomic(str(file_path), content)
 
     # Final file should not exist
     assert not file_path.exists()
@@ -105,11 +99,55 @@ def test_write_to_file_success(tmp_path):
         "status_list.v1_0.status_handler.FileLock", side_effect=Timeout("lock timeout")
     ):
         with pytest.raises(Timeout, match="lock timeout"):
-            status_handler.write_to_file(str(file_path), content)
+            status_handler.write_file_atomic(str(file_path), content)
 
     assert not file_path.exists()
 
 
+@pytest.mark.asyncio
+async def test_write_to_file_async(tmp_path):
+    file_paths = [tmp_path / f"list_{i}.txt" for i in range(4)]
+    await asyncio.gather(
+        *(
+            status_handler.write_to_file_async(str(path), path.name.encode())
+            for path in file_paths
+        )
+    )
+    assert all(path.read_bytes() == path.name.encode() for path in file_paths)
+
+    # Retries back off without blocking the event loop
+    file_path = tmp_path / "retry.txt"
+    call_tracker = {"count": 0}
+    original_replace = os.replace
+
+    def flaky_replace(src, dst):
+        if call_tracker["count"] == 0:
+            call_tracker["count"] += 1
+            raise OSError("Simulated failure")
+        return original_replace(src, dst)
+
+    with (
+        patch("status_list.v1_0.status_handler.os.replace", side_effect=flaky_replace),
+        patch("asyncio.sleep", return_value=None) as mock_sleep,
+    ):
+        await status_handler.write_to_file_async(str(file_path), b"retry")
+    assert file_path.read_bytes() == b"retry"
+    mock_sleep.assert_awaited_once_with(2)
+
+    file_path = tmp_path / "fail.txt"
+    with (
+        patch(
+            "status_list.v1_0.status_handler.os.replace",
+            side_effect=OSError("always fail"),
+        ),
+        patch("asyncio.sleep", return_value=None) as mock_sleep,
+    ):
+        with pytest.raises(OSError, match="always fail"):
+            await status_handler.write_to_file_async(str(file_path), b"fail")
+    assert [call.args[0] for call in mock_sleep.await_args_list] == [2, 4]
+    assert not file_path.exists()
+
+
 def test_get_wallet_id(context: AdminRequestContext):
     wallet_id = status_handler.get_wallet_id(context)
     assert wallet_id == "base"
@@ -159,6 +197,40 @@ async def test_generate_random_index(context: AdminRequestContext, seed_db):
     assert definition.list_index == 0
 
 
+@pytest.mark.asyncio
+async def test_reserve_status_list_entries(context: AdminRequestContext, seed_db):
+    async with context.profile.session() as session:
+        definition = await StatusListDef.retrieve_by_id(session, "definition_msg_id")
+        list_index = definition.list_index
+
+    entries = await status_handler.reserve_status_list_entries(
+        context, "definition_msg_id", 10
+    )
+    assert len(entries) == 10
+    assert all(entry["assigned"] for entry in entries)
+    assert len({(e["list_number"], e["list_index"]) for e in entries}) == 10
+
+    async with context.profile.session() as session:
+        definition = await StatusListDef.retrieve_by_id(session, "definition_msg_id")
+        for entry in entries:
+            shard_number = entry["list_index"] // definition.shard_size
+            shard_index = entry["list_index"] % definition.shard_size
+            shard = await StatusListShard.retrieve_by_tag_filter(
+                session,
+                {
+                    "definition_id": "definition_msg_id",
+                    "list_number": entry["list_number"],
+                    "shard_number": str(shard_number),
+                },
+            )
+            assert not shard.mask_bits[shard_index]
+
+    assert definition.list_index != list_index
+
+    with pytest.raises(StatusListError):
+        await status_handler.reserve_status_list_entries(context, "definition_msg_id", 0)
+
+
 @pytest.mark.asyncio
 async def test_assign_status_entries(context: AdminRequestContext, seed_db):
     status_list = await status_handler.assign_status_entries(
@@ -197,3 +269,348 @@ async def test_get_status_list_token(context: AdminRequestContext, seed_db):
     token = await status_handler.get_status_list_token(context, "1")
 
     assert token
+
+    # Test token is served from cache until invalidated
+    cached = await status_handler.get_cached_status_list_token(context, "1")
+    assert cached.token == token
+    assert cached.etag
+    assert 0 < cached.max_age <= status_handler.STATUS_LIST_TTL
+
+    status_handler.invalidate_status_list_tokens(cached.definition_id, "1")
+    assert (cached.definition_id, "1") not in status_handler.STATUS_LIST_TOKENS
+
+    # Test shard saves that leave the status bits unchanged keep the token
+    cached = await status_handler.get_cached_status_list_token(context, "1")
+    async with context.profile.session() as session:
+        shards = await StatusListShard.query(
+            session, {"definition_id": cached.definition_id, "list_number": "1"}
+        )
+        await shards[0].save(session)
+    assert await status_handler.get_cached_status_list_token(context, "1") is cached
+
+    # Test a status change not invalidating the cache, as by another agent
+    async with context.profile.session() as session:
+        await status_handler.bump_status_list_version(session, cached.definition_id, "1")
+    refreshed = await status_handler.get_cached_status_list_token(context, "1")
+    assert refreshed.status_version != cached.status_version
+    assert await status_handler.get_cached_status_list_token(context, "1") is refreshed
+
+
+@pytest.mark.asyncio
+async def test_publish_status_lists_caches_token(
+    context: AdminRequestContext, seed_db, plugin_config, monkeypatch, tmp_path
+):
+    config = replace(plugin_config, file_path=str(tmp_path / "{list_number}"))
+    monkeypatch.setattr(
+        "status_list.v1_0.status_handler.Config",
+        SimpleNamespace(from_settings=lambda _: config),
+    )
+    monkeypatch.setattr(status_handler, "PUBLISHED_LISTS", {})
+    async with context.profile.session() as session:
+        definition = await StatusListDef.retrieve_by_id(session, "definition_id")
+        entry = await status_handler.update_status_list_entry(
+            session, "definition_id", "credential_id", "1"
+        )
+
+    # the token signed when publishing is served until the status changes
+    with patch.object(
+        status_handler, "sign_status_list", wraps=status_handler.sign_status_list
+    ) as mock_sign:
+        await status_handler.publish_status_lists(
+            context, definition, list_numbers=[entry["list"]]
+        )
+        mock_sign.assert_awaited_once()
+        await status_handler.get_cached_status_list_token(
+            context, entry["list"], definition
+        )
+        mock_sign.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_publish_status_lists(context: AdminRequestContext, seed_db):
+    async with context.profile.session() as session:
+        definition = await StatusListDef.retrieve_by_id(session, "definition_id")
+
+    await status_handler.publish_status_lists(context, definition)
+    assert await status_handler.publish_status_lists(context, definition) == []
+
+    async with context.profile.session() as session:
+        entry = await status_handler.get_status_list_entry(
+            session, "definition_id", "credential_id"
+        )
+        bitstring = "0" if entry["status"] == "1" else "1"
+        await status_handler.update_status_list_entry(
+            session, "definition_id", "credential_id", bitstring
+        )
+        dirty = await StatusListShard.query(
+            session, {"definition_id": "definition_id", "dirty": "true"}
+        )
+        assert len(dirty) == 1
+
+    published = await status_handler.publish_status_lists(context, definition)
+    assert len(published) == 1
+
+    async with context.profile.session() as session:
+        dirty = await StatusListShard.query(
+            session, {"definition_id": "definition_id", "dirty": "true"}
+        )
+        assert not dirty
+
+
+@pytest.mark.asyncio
+async def test_update_status_list_entries(context: AdminRequestContext, seed_db):
+    result = await status_handler.update_status_list_entries(
+        context, "definition_id", {"credential_id": "1", "unknown_id": "1"}
+    )
+    assert [entry["status"] for entry in result["updated"]] == ["1"]
+    assert result["not_found"] == ["unknown_id"]
+
+    async with context.profile.session() as session:
+        entry = await status_handler.get_status_list_entry(
+            session, "definition_id", "credential_id"
+        )
+        assert entry["status"] == "1"
+
+    with pytest.raises(StatusListError):
+        await status_handler.update_status_list_entries(
+            context, "definition_id", {"credential_id": "10"}
+        )
+
+
+@pytest.mark.asyncio
+async def test_encode_status_list(context: AdminRequestContext, seed_db):
+    for definition_id in ("definition_id", "definition_msg_id"):
+        async with context.profile.session() as session:
+            definition = await StatusListDef.retrieve_by_id(session, definition_id)
+            shards = await StatusListShard.query(
+                session,
+                {"definition_id": definition_id, "list_number": definition.list_number},
+            )
+        expected = bitarray()
+        for shard in sorted(shards, key=lambda s: int(s.shard_number)):
+            expected.extend(shard.status_bits)
+
+        encoded_list = await status_handler.encode_status_list(
+            context, definition, definition.list_number
+        )
+        decoded_list = gzip.decompress(b64_to_bytes(pad(encoded_list), True))
+        assert decoded_list == expected.tobytes()
+
+
+@pytest.mark.asyncio
+async def test_provision_spare_list(context: AdminRequestContext, seed_db):
+    async with context.profile.transaction() as txn:
+        definition = await StatusListDef.retrieve_by_id(
+            txn, "definition_id", for_update=True
+        )
+        definition.list_number = definition.next_list_number
+        await definition.save(txn)
+        await txn.commit()
+
+    wallet_id = status_handler.get_wallet_id(context)
+    await status_handler.provision_spare_list(context.profile, wallet_id, "definition_id")
+
+    async with context.profile.session() as session:
+        definition = await StatusListDef.retrieve_by_id(session, "definition_id")
+        assert definition.next_list_number != definition.list_number
+        assert definition.next_list_number in definition.list_numbers
+        shards = await StatusListShard.query(
+            session,
+            {
+                "definition_id": "definition_id",
+                "list_number": definition.next_list_number,
+            },
+        )
+        assert len(shards) == definition.list_size // definition.shard_size
+
+    # Spare list already exists, nothing to provision
+    await status_handler.provision_spare_list(context.profile, wallet_id, "definition_id")
+    async with context.profile.session() as session:
+        unchanged = await StatusListDef.retrieve_by_id(session, "definition_id")
+        assert unchanged.list_numbers == definition.list_numbers
+
+
+@pytest.mark.asyncio
+async def test_assign_random_entry_with_lease(
+    context: AdminRequestContext, seed_db, plugin_config, monkeypatch
+):
+    config = replace(plugin_config, lease_size=4, worker_id="worker")
+    monkeypatch.setattr(
+        "status_list.v1_0.status_handler.Config",
+        SimpleNamespace(from_settings=lambda _: config),
+    )
+    monkeypatch.setattr(status_handler, "INDEX_LEASES", {})
+
+    async with context.profile.session() as session:
+        definition = await StatusListDef.retrieve_by_id(session, "definition_id")
+        list_index = definition.list_index
+
+    entries = [
+        await status_handler.assign_random_entry(context, "definition_id")
+        for _ in range(5)
+    ]
+    assert all(entry["assigned"] for entry in entries)
+    assert len({(e["list_number"], e["list_index"]) for e in entries}) == 5
+
+    # Two leases of four entries were taken in one update each
+    async with context.profile.session() as session:
+        definition = await StatusListDef.retrieve_by_id(session, "definition_id")
+        leases = await StatusListLease.query(session, {"definition_id": "definition_id"})
+    assert definition.list_index != list_index
+    assert len(leases) == 1
+    assert len(status_handler.INDEX_LEASES["definition_id"].entries) == 3
+
+    # A restarted worker reclaims its lease without the assigned entries
+    monkeypatch.setattr(status_handler, "INDEX_LEASES", {})
+    lease = await status_handler.acquire_index_lease(context, "definition_id")
+    assert lease.record_id == leases[0].id
+    assert len(lease.entries) == 3
+
+
+@pytest.mark.asyncio
+async def test_migrate_status_list_shards(context: AdminRequestContext, seed_db):
+    result = await status_handler.migrate_status_list_shards(context, "definition_msg_id")
+    assert result["format_version"] == SHARD_FORMAT
+
+    async with context.profile.session() as session:
+        shards = await StatusListShard.query(
+            session, {"definition_id": "definition_msg_id"}
+        )
+    assert all(shard.format_version == SHARD_FORMAT for shard in shards)
+
+    # Nothing left to migrate
+    result = await status_handler.migrate_status_list_shards(context, "definition_msg_id")
+    assert result["migrated"] == 0
+
+
+@pytest.mark.asyncio
+async def test_credential_index(context: AdminRequestContext, seed_db):
+    status_handler.CREDENTIAL_INDEX.clear()
+
+    async with context.profile.session() as session:
+        entry = await status_handler.get_status_list_entry(
+            session, "definition_id", "credential_id"
+        )
+    location = status_handler.CREDENTIAL_INDEX.get("definition_id", "credential_id")
+    assert location.list_index == entry["index"] == 57608
+    assert location.shard_number == 57608 // 1024
+    assert location.shard_index == 57608 % 1024
+
+    # Indexed credentials are located without a credential or definition read
+    with (
+        patch.object(StatusListCred, "retrieve_by_tag_filter") as mock_cred,
+        patch.object(StatusListDef, "retrieve_by_id") as mock_def,
+    ):
+        async with context.profile.session() as session:
+            updated = await status_handler.update_status_list_entry(
+                session, "definition_id", "credential_id", "1"
+            )
+            entry = await status_handler.get_status_list_entry(
+                session, "definition_id", "credential_id"
+            )
+        mock_cred.assert_not_called()
+        mock_def.assert_not_called()
+    assert updated["status"] == entry["status"] == "1"
+
+    status_handler.CREDENTIAL_INDEX.forget("definition_id")
+    assert status_handler.CREDENTIAL_INDEX.get("definition_id", "credential_id") is None
+
+
+@pytest.mark.asyncio
+async def test_assign_status_entries_concurrently(context: AdminRequestContext, seed_db):
+    with patch.object(
+        status_handler,
+        "assign_status_list_entry",
+        wraps=status_handler.assign_status_list_entry,
+    ) as mock_assign:
+        status_list = await status_handler.assign_status_entries(
+            context, "supported_cred_id", "multi_credential_id"
+        )
+    assert len(status_list) == 2
+    assert mock_assign.await_count == 2
+
+    async with context.profile.session() as session:
+        records = await StatusListCred.query(
+            session, {"credential_id": "multi_credential_id"}
+        )
+    assert {record.definition_id for record in records} == {
+        "definition_id",
+        "definition_msg_id",
+    }
+    assert status_handler.CREDENTIAL_INDEX.get("definition_id", "multi_credential_id")
+
+
+@pytest.mark.asyncio
+async def test_get_status_list_file_path(
+    context: AdminRequestContext, plugin_config, monkeypatch, tmp_path
+):
+    assert status_handler.get_status_list_file_path(context, "1") is None
+
+    config = replace(
+        plugin_config,
+        serve_files=True,
+        file_path=str(tmp_path / "{tenant_id}" / "{list_number}"),
+    )
+    monkeypatch.setattr(
+        "status_list.v1_0.status_handler.Config",
+        SimpleNamespace(from_settings=lambda _: config),
+    )
+    assert status_handler.get_status_list_file_path(context, "1") is None
+
+    status_handler.write_file_atomic(str(tmp_path / "base" / "1"), b"token")
+    assert (
+        status_handler.get_status_list_file_path(context, "1") == tmp_path / "base" / "1"
+    )
+    assert status_handler.get_status_list_file_path(context, "..") is None
+
+
+@pytest.mark.asyncio
+async def test_transition_status_list_entries(context: AdminRequestContext, seed_db):
+    entries = await status_handler.reserve_status_list_entries(
+        context, "definition_msg_id", 5
+    )
+    assigned = {(e["list_number"], e["list_index"]) for e in entries}
+
+    result = await status_handler.transition_status_list_entries(
+        context, "definition_msg_id", "10"
+    )
+    assert result["updated_entries"] >= 5
+    assert result["not_found"] == []
+
+    async with context.profile.session() as session:
+        shards = await StatusListShard.query(
+            session, {"definition_id": "definition_msg_id"}
+        )
+    for shard in shards:
+        for shard_index in range(shard.shard_size):
+            list_index = int(shard.shard_number) * shard.shard_size + shard_index
+            status = shard.status_bits[shard_index * 2 : shard_index * 2 + 2].to01()
+            if (shard.list_number, list_index) in assigned:
+                assert status == "10"
+            elif shard.mask_bits[shard_index]:
+                assert status == "00"
+
+    # Unselected lists are left untouched
+    result = await status_handler.transition_status_list_entries(
+        context, "definition_msg_id", "01", list_numbers=["unknown"]
+    )
+    assert result["updated_entries"] == result["updated_shards"] == 0
+
+    # Only the shards of the selected lists are loaded
+    list_number = entries[0]["list_number"]
+    with patch.object(
+        StatusListShard, "query", wraps=StatusListShard.query
+    ) as mock_query:
+        result = await status_handler.transition_status_list_entries(
+            context, "definition_msg_id", "10", list_numbers=[list_number]
+        )
+    assert result["updated_entries"] >= 1
+    assert mock_query.call_args.args[1] == {
+        "definition_id": "definition_msg_id",
+        "list_number": {"$in": [list_number]},
+    }
+
+    with pytest.raises(StatusListError):
+        await status_handler.transition_status_list_entries(
+            context, "definition_msg_id", "1"
+        )